@@ -0,0 +1,120 @@
+"""
+Per-call cost of logging on the hot path, against print().
+
+Times each kind of log call on a RingLogger whose writer discards its output,
+then logs and prints a burst of lines into a pipe whose reader stalls for a
+while, the way a slow terminal or journald does, and reports the slowest
+single call of each. Fails when a log call costs more than its budget or
+ever blocks on the stalled pipe.
+
+Usage, from the repository root:
+    python -m benchmarks.bench_logging
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+import timeit
+
+from mouse_mover import log
+
+BUDGET_NS = 2000  # a log call must stay within a couple of microseconds
+BLOCKING_S = 0.01  # no log call may take this long, whatever the output does
+
+
+def per_call_ns(call, number=100000):
+    baseline = min(timeit.repeat(lambda: None, number=number, repeat=5)) / number
+    per_call = min(timeit.repeat(call, number=number, repeat=5)) / number
+    # Subtract the cost of calling an empty lambda from the timing loop
+    return max(0.0, per_call - baseline) * 1e9
+
+
+def stalled_pipe(write_lines, lines, stall):
+    """
+    Run write_lines(stream, lines) into a pipe nobody reads for `stall`
+    seconds; returns the slowest single call in seconds.
+    """
+    read_fd, write_fd = os.pipe()
+    stream = os.fdopen(write_fd, "w")
+
+    def drain():
+        time.sleep(stall)
+        with os.fdopen(read_fd, "rb") as reader:
+            while reader.read(65536):
+                pass
+
+    reader = threading.Thread(target=drain, daemon=True)
+    reader.start()
+    try:
+        return write_lines(stream, lines)
+    finally:
+        stream.close()
+        reader.join()
+
+
+def slowest_print(stream, lines):
+    worst = 0.0
+    for i in range(lines):
+        start = time.perf_counter()
+        print("Performing aggressive zigzag...", i, file=stream, flush=True)
+        worst = max(worst, time.perf_counter() - start)
+    return worst
+
+
+def slowest_log(stream, lines):
+    logger = log.RingLogger(capacity=lines, stream=stream)
+    worst = 0.0
+    for i in range(lines):
+        start = time.perf_counter()
+        logger.info("Performing %s... %d", "aggressive zigzag", i)
+        worst = max(worst, time.perf_counter() - start)
+    logger.stop()
+    return worst
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the cost of a log call.")
+    parser.add_argument("--lines", type=int, default=20000, help="lines written into the stalled pipe")
+    parser.add_argument("--stall", type=float, default=0.5, help="seconds the pipe's reader stalls")
+    args = parser.parse_args(argv)
+
+    with open(os.devnull, "w") as devnull:
+        # The writers stay asleep: this times the caller's side only, which
+        # is all a movement waits for
+        logger = log.RingLogger(stream=devnull, interval=3600)
+        filtered = log.RingLogger(capture=log.INFO, stream=devnull, interval=3600)
+        json_logger = log.RingLogger(json_output=True, stream=devnull, interval=3600)
+        cases = {
+            "info(message)": lambda: logger.info("Performing zigzag pattern..."),
+            "info(message, args)": lambda: logger.info("%s for %.2f seconds", "Taking a break", 4.2),
+            "info(..., fields) json": lambda: json_logger.info("Performing %s...", "zigzag", movement="zigzag"),
+            "debug() kept for dumps": lambda: logger.debug("Performing zigzag pattern..."),
+            "debug() below capture": lambda: filtered.debug("Performing zigzag pattern..."),
+            "log.info() module": lambda: log.info("Performing zigzag pattern..."),
+            "print() to /dev/null": lambda: print("Performing zigzag pattern...", file=devnull, flush=True),
+        }
+        log.set_logger(log.RingLogger(stream=devnull, interval=3600))
+
+        failed = False
+        for name, call in cases.items():
+            ns = per_call_ns(call)
+            checked = not name.startswith("print")
+            status = "" if not checked else "ok" if ns < BUDGET_NS else "OVER BUDGET"
+            failed |= checked and ns >= BUDGET_NS
+            print(f"{name:<28}{ns:>8.0f} ns  {status}")
+        for stopped in (logger, filtered, json_logger, log.default_logger):
+            stopped.stop()
+
+    print(f"\nSlowest call while the output pipe stalls for {args.stall:g} s ({args.lines} lines):")
+    worst_print = stalled_pipe(slowest_print, args.lines, args.stall)
+    worst_log = stalled_pipe(slowest_log, args.lines, args.stall)
+    blocked = worst_log >= BLOCKING_S
+    failed |= blocked
+    print(f"{'print()':<28}{worst_print * 1000:>8.2f} ms")
+    print(f"{'RingLogger.info()':<28}{worst_log * 1000:>8.2f} ms  {'BLOCKED' if blocked else 'ok'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
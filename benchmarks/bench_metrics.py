@@ -0,0 +1,42 @@
+"""
+Per-call cost of recording runtime metrics on the hot path.
+
+Usage, from the repository root:
+    python -m benchmarks.bench_metrics
+"""
+import sys
+import timeit
+
+from mouse_mover import metrics
+
+BUDGET_NS = 1000  # recording a metric must stay well under a microsecond
+
+
+def main():
+    registry = metrics.Registry()
+    counter = registry.counter("bench_counter", "Counter")
+    labelled = registry.counter("bench_labelled", "Labelled counter", ("movement",))
+    histogram = registry.histogram("bench_histogram", "Histogram")
+    gauge = registry.gauge("bench_gauge", "Gauge")
+
+    cases = {
+        "counter.inc()": counter.inc,
+        "counter.labels(x).inc()": lambda: labelled.labels("zigzag_pattern").inc(),
+        "histogram.observe()": lambda: histogram.observe(0.0032),
+        "gauge.set()": lambda: gauge.set(1.5),
+    }
+    baseline = min(timeit.repeat(lambda: None, number=200000, repeat=5)) / 200000
+
+    failed = False
+    for name, call in cases.items():
+        per_call = min(timeit.repeat(call, number=200000, repeat=5)) / 200000
+        # Subtract the cost of calling an empty lambda from the timing loop
+        ns = max(0.0, per_call - baseline) * 1e9
+        status = "ok" if ns < BUDGET_NS else "OVER BUDGET"
+        failed |= ns >= BUDGET_NS
+        print(f"{name:<28}{ns:>8.0f} ns  {status}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""
+Headless benchmark for the movement library.
+
+Every movement in movements.PATHS is generated with a fixed seed and replayed
+through trajectory.replay() into a backends.RecordingBackend, which can also
+forward to a real backend (--backend xtest/pyautogui, e.g. under xvfb-run).
+For each movement it reports:
+
+- events per second actually injected, and the peak in any one second
+- path points coalesced into frames (see trajectory.align_to_frames())
+- achieved vs target duration
+- lateness of each event against its frame deadline (p50/p95/p99)
+- CPU time spent generating and replaying
+- Python allocations (peak, from a separate tracemalloc pass)
+
+followed by the pacer's wake-up error and spin time over the whole run.
+--spin and --cpu-budget configure the pacer (--spin 0 sleeps only), --rate
+and --cap the emission rate and the global event cap.
+
+--mood replays that mood's movements back to back, drawn by weight and
+without the pauses between them, and fails if any second scheduled more
+events than the cap allows.
+
+Results can be saved as a baseline and later runs compared against it.
+
+Usage, from the repository root:
+    python -m benchmarks.bench_movements
+    python -m benchmarks.bench_movements --save-baseline
+    python -m benchmarks.bench_movements --check --threshold 0.25
+    python -m benchmarks.bench_movements --spin 0          # compare with plain sleeps
+    python -m benchmarks.bench_movements --mood hyperactive --cap 120
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from mouse_mover import backends
+from mouse_mover import moods
+from mouse_mover import movements
+from mouse_mover import pacing
+from mouse_mover import trajectory
+
+BOUNDS = (100, 100, 1820, 980)  # 1920x1080 screen with the app's 100 px margin
+START = (960, 540)
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Metrics compared against the baseline, and whether higher is better
+CHECKED_METRICS = {
+    "events_per_sec": True,
+    "duration_error_ms": False,
+    "lateness_p99_ms": False,
+    "cpu_ms": False,
+    "alloc_peak_kib": False,
+}
+ABSOLUTE_SLACK = 1.0  # ignore regressions smaller than this many units
+
+
+def make_path(path_function, seed):
+    """Generate a movement's path with fixed random state."""
+    random.seed(seed)
+    np.random.seed(seed)
+    return path_function(*BOUNDS, START)
+
+
+def lateness(events, deadlines):
+    """Lateness in seconds of each injected event against the deadline it was injected for."""
+    return np.array([stamp for stamp, _, _ in events]) - np.asarray(deadlines)
+
+
+def peak_per_second(stamps):
+    """Most of the given (sorted) times that fall within any one second."""
+    if not len(stamps):
+        return 0
+    stamps = np.asarray(stamps)
+    return int((np.searchsorted(stamps, stamps + (1.0 - 1e-9)) - np.arange(len(stamps))).max())
+
+
+def bench_movement(name, path_function, seed, forward=None):
+    """Run one movement once and return its metrics."""
+    cpu_start = time.process_time()
+    path = make_path(path_function, seed)
+    generation_cpu = time.process_time() - cpu_start
+
+    recorder = backends.RecordingBackend(START, forward)
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    elapsed = trajectory.replay(path, backend=recorder, label=name)
+    replay_cpu = time.process_time() - cpu_start
+
+    deadlines = trajectory.emission.last_deadlines
+    target = trajectory.duration(path)
+    # The last frame deadline, not the path's own end, is when replay should finish
+    scheduled = deadlines[-1] - start if deadlines else 0.0
+    late_ms = lateness(recorder.events, deadlines) * 1000
+    return {
+        "points": len(path),
+        "events": len(recorder.events),
+        "coalesced": len(path) - len(recorder.events),
+        "peak_per_sec": peak_per_second(deadlines),
+        "target_s": target,
+        "achieved_s": elapsed,
+        "duration_error_ms": abs(elapsed - scheduled) * 1000,
+        "events_per_sec": len(recorder.events) / elapsed if elapsed else 0.0,
+        "lateness_p50_ms": float(np.percentile(late_ms, 50)),
+        "lateness_p95_ms": float(np.percentile(late_ms, 95)),
+        "lateness_p99_ms": float(np.percentile(late_ms, 99)),
+        "generation_cpu_ms": generation_cpu * 1000,
+        "cpu_ms": (generation_cpu + replay_cpu) * 1000,
+    }
+
+
+def measure_allocations(path_function, seed):
+    """Peak Python allocation (KiB) for generating a path and replaying it."""
+    path = make_path(path_function, seed)
+    # Replay instantly: only allocations matter here, not timing
+    path[:, 0] = 0.0
+    recorder = backends.RecordingBackend(START)
+    tracemalloc.start()
+    try:
+        make_path(path_function, seed)
+        trajectory.replay(path, backend=recorder)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def warm_up():
+    """Touch every code path once so imports and caches don't count as CPU time."""
+    for path_function in movements.PATHS.values():
+        path = make_path(path_function, 0)
+        path[:, 0] = 0.0
+        trajectory.replay(path, backend=backends.NullBackend(START))
+
+
+def run(selected, repeat, seed, forward=None):
+    """Benchmark the selected movements; returns {name: median metrics}."""
+    results = {}
+    warm_up()
+    for movement, path_function in movements.PATHS.items():
+        name = movement.__name__
+        if selected and name not in selected:
+            continue
+        runs = [bench_movement(name, path_function, seed + i, forward) for i in range(repeat)]
+        metrics = {key: float(np.median([r[key] for r in runs])) for key in runs[0]}
+        metrics["alloc_peak_kib"] = measure_allocations(path_function, seed)
+        results[name] = metrics
+        print_row(name, metrics)
+    return results
+
+
+def run_mood(mood, count, seed, forward=None):
+    """
+    Replay `count` movements of a mood back to back, drawn by weight, and
+    return (scheduled peak per second, actual peak per second, events).
+    Per-movement counts accumulate in trajectory.emission.
+    """
+    config = moods.MOODS[mood]["movements"]
+    choices = [movement for movement in config if movement in movements.PATHS]
+    weights = [config[movement] for movement in choices]
+    rng = random.Random(seed)
+    recorder = backends.RecordingBackend(START, forward)
+    deadlines = []
+    for i in range(count):
+        movement = rng.choices(choices, weights)[0]
+        path = make_path(movements.PATHS[movement], seed + i)
+        trajectory.replay(path, backend=recorder, label=movement.__name__)
+        deadlines += trajectory.emission.last_deadlines
+    stamps = [stamp for stamp, _, _ in recorder.events]
+    return peak_per_second(deadlines), peak_per_second(stamps), len(stamps)
+
+
+def print_emission(cap):
+    """Per-movement emission counts since startup; returns movements over the cap."""
+    print(f"\n{'movement':<24}{'replays':>8}{'points':>8}{'events':>8}{'coalesced':>10}{'peak/s':>8}")
+    over = []
+    for name, stats in sorted(trajectory.emission.movements.items()):
+        print(f"{name:<24}{stats['replays']:>8}{stats['points']:>8}{stats['events']:>8}"
+              f"{stats['points'] - stats['events']:>10}{stats['peak_per_second']:>8}")
+        if cap and stats["peak_per_second"] > cap:
+            over.append(name)
+    return over
+
+
+def print_header():
+    print(f"{'movement':<24}{'events':>7}{'merged':>7}{'ev/s':>8}{'peak/s':>7}{'target s':>10}{'error ms':>10}"
+          f"{'p50 ms':>8}{'p95 ms':>8}{'p99 ms':>8}{'cpu ms':>8}{'KiB':>8}")
+
+
+def print_row(name, m):
+    print(f"{name:<24}{m['events']:>7.0f}{m['coalesced']:>7.0f}{m['events_per_sec']:>8.1f}"
+          f"{m['peak_per_sec']:>7.0f}{m['target_s']:>10.2f}"
+          f"{m['duration_error_ms']:>10.2f}{m['lateness_p50_ms']:>8.2f}{m['lateness_p95_ms']:>8.2f}"
+          f"{m['lateness_p99_ms']:>8.2f}{m['cpu_ms']:>8.1f}{m['alloc_peak_kib']:>8.1f}")
+
+
+def check_regressions(results, baseline, threshold):
+    """Return a list of human-readable regressions against the baseline."""
+    failures = []
+    for name, metrics in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for key, higher_is_better in CHECKED_METRICS.items():
+            old, new = base[key], metrics[key]
+            if higher_is_better:
+                regressed = new < old * (1 - threshold) - ABSOLUTE_SLACK
+            else:
+                regressed = new > old * (1 + threshold) + ABSOLUTE_SLACK
+            if regressed:
+                failures.append(f"{name}.{key}: {old:.2f} -> {new:.2f}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark movement timing and throughput.")
+    parser.add_argument("--movements", nargs="*", help="only these movements (function names)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per movement (median reported)")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--backend", choices=["recording", "xtest", "uinput", "pyautogui"],
+                        default="recording", help="also inject for real, e.g. under xvfb-run")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="fail on regressions against the baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative regression before --check fails")
+    parser.add_argument("--json", help="also write results to this JSON file")
+    parser.add_argument("--spin", type=float, default=pacing.default_pacer.spin,
+                        help="seconds the pacer spins before each deadline (0 to only sleep)")
+    parser.add_argument("--cpu-budget", type=float, default=pacing.default_pacer.cpu_budget,
+                        help="share of a core the pacer may spend spinning")
+    parser.add_argument("--rate", type=float, default=trajectory.SAMPLE_RATE,
+                        help="emission rate in events per second while moving")
+    parser.add_argument("--cap", type=int, default=120, help="global events per second cap (0 for no cap)")
+    parser.add_argument("--mood", choices=sorted(moods.MOODS),
+                        help="replay this mood's movements back to back and check the cap")
+    parser.add_argument("--count", type=int, default=20, help="movements replayed for --mood")
+    args = parser.parse_args(argv)
+    pacing.set_pacer(pacing.Pacer(spin=args.spin, cpu_budget=args.cpu_budget))
+    trajectory.set_emission_rate(args.rate, args.cap or None)
+
+    forward = None
+    if args.backend != "recording":
+        forward = backends.create_backend(args.backend, (0, 0, 1920, 1080))
+    if args.mood:
+        warm_up()
+        trajectory.emission.movements.clear()
+        print(f"Replaying {args.count} {args.mood} movements back to back at {trajectory.frame_rate():g} Hz, "
+              f"cap {args.cap or 'none'}/s")
+        scheduled, actual, events = run_mood(args.mood, args.count, args.seed, forward)
+        over = print_emission(args.cap)
+        print(f"\n{events} events; peak {scheduled}/s scheduled, {actual}/s injected (wake-up jitter included)")
+        if args.cap and (over or scheduled > args.cap):
+            print(f"OVER CAP {', '.join(over) or 'across movements'}: more than {args.cap} events in one second")
+            return 1
+        print("Cap held" if args.cap else "No cap set")
+        return 0
+
+    print_header()
+    results = run(args.movements, args.repeat, args.seed, forward)
+    pacer = pacing.get_pacer().summary()
+    print(f"\npacer: {pacer['waits']} waits, wake-up error mean {pacer['mean_us']:.0f} us, "
+          f"p50 {pacer['p50_us']:.0f} us, p99 {pacer['p99_us']:.0f} us, worst {pacer['worst_us']:.0f} us; "
+          f"spun {pacer['spun_s'] * 1000:.0f} ms, {pacer['unspun']} waits over budget")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+    if args.check:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failures = check_regressions(results, baseline, args.threshold)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if failures:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
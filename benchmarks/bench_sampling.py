@@ -0,0 +1,71 @@
+"""
+Events per movement with adaptive sampling, against one event per frame.
+
+Every movement in movements.PATHS is built a number of times with a fixed
+seed and aligned to frames at each --rate; for each it reports the mean
+events per run when every frame is emitted and when frames are thinned to
+each --error (see trajectory.thin()), with the saving. The shown pointer is
+checked against every frame it skipped, and the benchmark fails if it was
+ever further off than the error allows.
+
+Usage, from the repository root:
+    python -m benchmarks.bench_sampling
+    python -m benchmarks.bench_sampling --rate 60 144 --error 1 3 8
+"""
+import argparse
+import random
+import sys
+
+import numpy as np
+
+from mouse_mover import movements
+from mouse_mover import trajectory
+
+BOUNDS = (100, 100, 1820, 980)  # 1920x1080 screen with the app's 100 px margin
+START = (960, 540)
+
+
+def worst_error(frames, kept):
+    """Furthest any frame is from the last kept point at or before it, in pixels."""
+    shown = np.searchsorted(kept[:, 0], frames[:, 0], side="right") - 1
+    return float(np.hypot(*(frames[:, 1:] - kept[shown, 1:]).T).max())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare event counts of adaptive and per-frame sampling.")
+    parser.add_argument("--rate", type=float, nargs="+", default=[60, 144], help="frame rates to compare at")
+    parser.add_argument("--error", type=float, nargs="+", default=[1, 3, 8], help="max errors in pixels")
+    parser.add_argument("--runs", type=int, default=20, help="paths built per movement")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for rate in args.rate:
+        trajectory.set_emission_rate(rate)
+        random.seed(args.seed)
+        np.random.seed(args.seed)
+        print(f"\nEvents per run at {rate:g} Hz")
+        print(f"{'movement':<26}{'frames':>8}" + "".join(f"{f'{e:g} px':>16}" for e in args.error))
+        totals = np.zeros(1 + len(args.error))
+        for movement, path_function in movements.PATHS.items():
+            counts = np.zeros(1 + len(args.error))
+            for _ in range(args.runs):
+                frames = trajectory.align_to_frames(path_function(*BOUNDS, START), 0.0, error=0)
+                counts[0] += len(frames)
+                for i, error in enumerate(args.error, 1):
+                    kept = trajectory.thin(frames, error, rate)
+                    counts[i] += len(kept)
+                    if len(frames) and worst_error(frames, kept) > error:
+                        print(f"  {movement.__name__}: pointer off by more than {error:g} px")
+                        failed = True
+            totals += counts
+            counts /= args.runs
+            print(f"{movement.__name__:<26}{counts[0]:>8.0f}"
+                  + "".join(f"{n:>8.0f} ({1 - n / counts[0]:>4.0%})" for n in counts[1:]))
+        print(f"{'all movements':<26}{totals[0] / args.runs:>8.0f}"
+              + "".join(f"{n / args.runs:>8.0f} ({1 - n / totals[0]:>4.0%})" for n in totals[1:]))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Startup cost of the command line entry points.
+
+Runs each entry point in a fresh interpreter under `python -X importtime`
+and reports the cumulative import time of the package, the slowest imports
+and the wall time compared with a bare interpreter. Fails when
+`mouse-mover --list-moods` exceeds its import budget or pulls in a heavy
+module it has no use for.
+
+Usage, from the repository root:
+    python -m benchmarks.bench_startup
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Package import time allowed for informational commands
+IMPORT_BUDGET_MS = 50
+# Modules informational commands must never load
+HEAVY_MODULES = ("numpy", "pyautogui", "screeninfo", "Xlib", "evdev", "asyncio", "http.server", "multiprocessing")
+
+COMMANDS = {
+    "--list-moods": ["-m", "mouse_mover", "--list-moods"],
+    "import app": ["-c", "import mouse_mover.app"],
+    "import traces": ["-c", "import mouse_mover.traces"],
+    "import fleet": ["-c", "import mouse_mover.fleet"],
+}
+
+
+def parse_importtime(stderr):
+    """{module: (self µs, cumulative µs)} from -X importtime output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def run(args, importtime=False):
+    """Run the interpreter with args; returns (wall seconds, stderr)."""
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + args
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            text=True, check=True)
+    return time.perf_counter() - start, result.stderr
+
+
+def best_wall(args, repeat):
+    return min(run(args)[0] for _ in range(repeat))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark command line startup time.")
+    parser.add_argument("--repeat", type=int, default=5, help="wall-time runs per command (best reported)")
+    parser.add_argument("--top", type=int, default=5, help="slowest imports to list per command")
+    args = parser.parse_args(argv)
+
+    bare = best_wall(["-c", "pass"], args.repeat)
+    print(f"bare interpreter: {bare * 1000:.1f} ms\n")
+    failures = []
+    for name, command in COMMANDS.items():
+        wall = best_wall(command, args.repeat)
+        modules = parse_importtime(run(command, importtime=True)[1])
+        # The outermost package module's cumulative time covers all the others
+        top_level = max((cumulative for module, (_, cumulative) in modules.items()
+                         if module.startswith("mouse_mover")), default=0) / 1000
+        heavy = [module for module in HEAVY_MODULES if module in modules]
+        print(f"{name:<16}wall {wall * 1000:7.1f} ms (+{(wall - bare) * 1000:.1f} over bare), "
+              f"package imports {top_level:.1f} ms")
+        slowest = sorted(modules.items(), key=lambda item: -item[1][0])[:args.top]
+        for module, (self_us, _) in slowest:
+            print(f"    {module:<36}{self_us / 1000:7.2f} ms")
+        if heavy:
+            print(f"    loads: {', '.join(heavy)}")
+
+        if name == "--list-moods":
+            if top_level > IMPORT_BUDGET_MS:
+                failures.append(f"{name} imports take {top_level:.1f} ms (budget {IMPORT_BUDGET_MS} ms)")
+            if heavy:
+                failures.append(f"{name} loads {', '.join(heavy)}")
+
+    for failure in failures:
+        print(f"OVER BUDGET {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Generation rate of the motion synthesis engine.
+
+Builds batches of reach() and windmouse() paths between random points on a
+1920x1080 screen and reports paths and points generated per second, plus the
+cost of filtering a batch by bounds and of one reach_path() call as the
+movements use it.
+
+Usage, from the repository root:
+    python -m benchmarks.bench_synthesis
+    python -m benchmarks.bench_synthesis --batch-sizes 1 100 10000
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from mouse_mover import synthesis
+
+BOUNDS = (100, 100, 1820, 980)
+
+
+def random_endpoints(size, rng):
+    min_x, min_y, max_x, max_y = BOUNDS
+    starts = rng.uniform((min_x, min_y), (max_x, max_y), (size, 2))
+    ends = rng.uniform((min_x, min_y), (max_x, max_y), (size, 2))
+    return starts, ends, rng.uniform(0.3, 2.0, size)
+
+
+def best_of(repeat, call):
+    """Fastest of `repeat` runs of call(), in seconds, with its last result."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = call()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark motion synthesis throughput.")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args(argv)
+    rng = np.random.default_rng(args.seed)
+
+    print(f"{'generator':<12}{'batch':>8}{'ms':>10}{'paths/s':>12}{'points/s':>14}{'filter ms':>11}{'in bounds':>11}")
+    for name, generate in (("reach", synthesis.reach), ("windmouse", synthesis.windmouse)):
+        for size in args.batch_sizes:
+            starts, ends, durations = random_endpoints(size, rng)
+            seconds, batch = best_of(args.repeat, lambda: generate(starts, ends, durations, rng=rng))
+            filter_seconds, mask = best_of(args.repeat, lambda: batch.within(*BOUNDS))
+            points = int(batch.lengths.sum())
+            print(f"{name:<12}{size:>8}{seconds * 1000:>10.2f}{size / seconds:>12.0f}"
+                  f"{points / seconds:>14.0f}{filter_seconds * 1000:>11.2f}{mask.mean():>11.1%}")
+
+    starts, ends, durations = random_endpoints(1, rng)
+    seconds, _ = best_of(args.repeat * 100, lambda: synthesis.reach_path(
+        starts[0], ends[0], durations[0], BOUNDS, rng=rng))
+    print(f"\nreach_path() with 8 candidates: {seconds * 1e6:.0f} us per path")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
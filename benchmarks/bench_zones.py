@@ -0,0 +1,100 @@
+"""
+Per-point cost of exclusion zones, with hundreds of them.
+
+Scatters random zones over a 3840x2160 desktop and times a scalar point
+check, a batched check of a whole path and rerouting that path, all per
+point, along with the cost of building a movement path and what the zones
+add to it end to end ("build +": clamping, the batched checks and up to
+four reroute passes). Fails when a batched check or what the zones add to a
+build costs more than its budget per point, or the scalar check grows with
+the number of zones like a linear scan would. Timings are the best of
+several runs, and the budgets leave about twice the cost measured on a
+1-vCPU VM, so a noisy run doesn't fail.
+
+Zones are not free when building paths: with 100-300 zones they add about
+1-2.5 us per path point to the 0.3-0.5 us a build costs without them, and
+3-5 us at 1000 zones covering most of the desktop. Most of that is a
+fixed cost per numpy call, paid once per path when it is built: a 10 s
+movement at 60 Hz gains 1-3 ms before it starts, never while it plays.
+
+Usage, from the repository root:
+    python -m benchmarks.bench_zones
+    python -m benchmarks.bench_zones --zones 100 500 2000
+"""
+import argparse
+import random
+import sys
+import timeit
+
+import numpy as np
+
+from mouse_mover import geometry, movements, zones
+
+WIDTH, HEIGHT = 3840, 2160
+BUDGET_NS = 400  # batched check per path point
+BUILD_BUDGET_NS = 10000  # what the zones add to building a path, per point
+PATH_POINTS = 600  # a 10 s movement at 60 Hz
+
+
+def random_zones(count, rng):
+    """`count` zones from 16 to 160 pixels a side (buttons to panels), anywhere on the desktop."""
+    rects = []
+    for _ in range(count):
+        w, h = rng.randint(16, 160), rng.randint(16, 160)
+        x, y = rng.randint(0, WIDTH - w), rng.randint(0, HEIGHT - h)
+        rects.append((x, y, x + w - 1, y + h - 1))
+    return rects
+
+
+def per_call_s(call, number, repeat=5):
+    return min(timeit.repeat(call, number=number, repeat=repeat)) / number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark exclusion zone checks.")
+    parser.add_argument("--zones", type=int, nargs="+", default=[0, 100, 300, 1000], help="zone counts to time")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    xs = np.array([rng.randint(0, WIDTH - 1) for _ in range(PATH_POINTS)], dtype=float)
+    ys = np.array([rng.randint(0, HEIGHT - 1) for _ in range(PATH_POINTS)], dtype=float)
+    points = list(zip(xs.tolist(), ys.tolist()))
+    path = np.column_stack((np.arange(PATH_POINTS) / 60, xs, ys))
+    bounds = (100, 100, WIDTH - 101, HEIGHT - 101)
+
+    print(f"{'zones':>6}{'blocked':>9}{'scalar':>10}{'batched':>10}{'reroute':>10}{'build':>10}{'build +':>10}")
+    failed = False
+    scalar_costs = []
+    for count in args.zones:
+        index = zones.ExclusionZones(random_zones(count, rng))
+        scalar = per_call_s(lambda: [index.contains(x, y) for x, y in points], 20) / PATH_POINTS
+        batched = per_call_s(lambda: index.blocked(xs, ys), 200) / PATH_POINTS
+        reroute = per_call_s(lambda: index.reroute(path.copy()), 50) / PATH_POINTS
+
+        # What the zones add to building a real movement path, per point
+        geometry.exclusions = zones.ExclusionZones([])
+        plain = per_call_s(lambda: movements.zigzag_path(*bounds, (1920, 1080)), 50, repeat=9)
+        geometry.exclusions = index
+        zoned = per_call_s(lambda: movements.zigzag_path(*bounds, (1920, 1080)), 50, repeat=9)
+        geometry.exclusions = zones.ExclusionZones([])
+        built = len(movements.zigzag_path(*bounds, (1920, 1080)))
+        added = max(0.0, zoned - plain) / built
+
+        over = batched * 1e9 >= BUDGET_NS or added * 1e9 >= BUILD_BUDGET_NS
+        failed |= over
+        if count:
+            scalar_costs.append(scalar)
+        print(f"{count:>6}{index.blocked(xs, ys).mean():>8.1%}{scalar * 1e9:>8.0f}ns{batched * 1e9:>8.0f}ns"
+              f"{reroute * 1e9:>8.0f}ns{plain / built * 1e9:>8.0f}ns{added * 1e9:>8.0f}ns"
+              f"{'  OVER BUDGET' if over else ''}")
+
+    # A linear scan would cost ~10x more at 1000 zones than at 100; the grid barely changes
+    if len(scalar_costs) > 1 and scalar_costs[-1] > 3 * max(scalar_costs[0], 1e-7):
+        print("Scalar checks grow with the number of zones")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
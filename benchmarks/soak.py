@@ -0,0 +1,276 @@
+"""
+Soak test: days of moods on an accelerated clock, watching memory and CPU.
+
+Runs the scheduler's endless mood loop (MoodScheduler.run(), what app.py
+runs) on a VirtualClockEventLoop against a stand-in backend that only
+counts events, with simulated user movements interrupting it. Waits take
+no real time, so days of mood cycles pass in minutes while every movement
+is still generated, thinned, emitted and logged like in a real run.
+
+Every --sample-every simulated hours it records the process RSS, the
+Python heap traced by tracemalloc and the CPU time used. After a warm-up
+(caches and the log ring filling, lazy imports, estimates settling) it fails if:
+
+- RSS or the traced heap grew by more than its budget over the run, taken
+  from a least-squares fit so a single noisy sample doesn't decide it
+- the mover used more CPU per hour of moods than --cpu-budget allows.
+  Waiting costs nothing on the virtual clock, so this is the work a real
+  run does per hour, overstated by tracemalloc's own overhead; the pacer's
+  spinning (bounded by pacer_cpu_budget) comes on top.
+
+The report lists the samples, the verdicts and the source lines whose heap
+grew most, as Markdown for release notes (--report) and JSON (--json).
+
+Usage, from the repository root:
+    python -m benchmarks.soak                          # 72 simulated hours
+    python -m benchmarks.soak --hours 168 --report soak-report.md --json soak.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from mouse_mover import cursor, log, metrics, scheduler, simulation
+from mouse_mover.fleet import current_rss
+from mouse_mover.moods import MOODS, MOOD_TRANSITIONS
+
+BOUNDS = (100, 100, 1819, 979)  # 1920x1080 screen with the app's 100 px margin
+
+
+class SoakBackend:
+    """Stand-in backend keeping nothing per event: a count and the position."""
+    name = "soak"
+
+    def __init__(self, start):
+        self.x, self.y = start
+        self.events = 0
+
+    def position(self):
+        return self.x, self.y
+
+    def move(self, x, y):
+        self.events += 1
+        self.x, self.y = x, y
+
+    def move_path(self, times, xs, ys):
+        self.events += len(times)
+        self.x, self.y = int(xs[-1]), int(ys[-1])
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def sample(loop, backend, started_cpu):
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        "hours": float(loop.time()) / 3600,
+        "rss_mib": current_rss() / 2**20,
+        "heap_kib": current / 1024,
+        "heap_peak_kib": peak / 1024,
+        "cpu_s": time.process_time() - started_cpu,
+        "events": backend.events,
+        "movements": metrics.MOVEMENTS.total(),
+        "interruptions": metrics.INTERRUPTIONS.value,
+    }
+
+
+def growth(samples, key, warmup):
+    """Fitted growth of samples[key] from the end of the warm-up to the last sample."""
+    settled = [s for s in samples if s["hours"] >= warmup]
+    if len(settled) < 3:
+        return 0.0
+    hours = np.array([s["hours"] for s in settled])
+    slope = np.polyfit(hours, [s[key] for s in settled], 1)[0]
+    return float(slope * (hours[-1] - hours[0]))
+
+
+def soak(hours, sample_every=1.0, user_moves_per_hour=12, seed=1, warmup=4.0, top=10):
+    """Run the mood loop for `hours` of virtual time; returns the samples and heap growth by line after `warmup`."""
+    random.seed(seed)
+    np.random.seed(seed)
+    loop = scheduler.VirtualClockEventLoop()
+    start = ((BOUNDS[0] + BOUNDS[2]) // 2, (BOUNDS[1] + BOUNDS[3]) // 2)
+    backend = SoakBackend(start)
+    tracker = cursor.CursorTracker(backend, clock=loop.time)
+    mover = scheduler.MoodScheduler(MOODS, BOUNDS, transitions=MOOD_TRANSITIONS, backend=tracker,
+                                    replay=simulation.replay_virtual)
+    samples = []
+    snapshots = {}
+
+    async def user():
+        while True:
+            await asyncio.sleep(random.expovariate(user_moves_per_hour / 3600))
+            tracker.observe(None)
+            mover.notify_user_activity()
+
+    async def sampler():
+        while True:
+            samples.append(sample(loop, backend, started_cpu))
+            if "warm" not in snapshots and loop.time() >= warmup * 3600:
+                snapshots["warm"] = tracemalloc.take_snapshot()
+            await asyncio.sleep(sample_every * 3600)
+
+    async def main():
+        tasks = [asyncio.ensure_future(sampler())]
+        if user_moves_per_hour:
+            tasks.append(asyncio.ensure_future(user()))
+        try:
+            await asyncio.wait_for(mover.run(), hours * 3600)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    logger = log.get_logger()
+    level, logger.level = logger.level, log.ERROR + 1  # keep the records, skip the output
+    tracemalloc.start()
+    started_cpu = time.process_time()
+    try:
+        loop.run_until_complete(main())
+        if samples[-1]["hours"] < hours:
+            samples.append(sample(loop, backend, started_cpu))
+        last = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+        logger.flush()
+        logger.level = level
+        loop.close()
+
+    grown = []
+    if "warm" in snapshots:
+        for stat in last.compare_to(snapshots["warm"], "lineno")[:top]:
+            frame = stat.traceback[0]
+            grown.append({"line": f"{frame.filename}:{frame.lineno}", "kib": stat.size_diff / 1024,
+                          "blocks": stat.count_diff})
+    return samples, grown
+
+
+def verdicts(samples, args):
+    """(name, measured, budget) for every budget; a check passes when measured <= budget."""
+    rss = growth(samples, "rss_mib", args.warmup)
+    heap = growth(samples, "heap_kib", args.warmup)
+    cpu_per_hour = samples[-1]["cpu_s"] / max(samples[-1]["hours"], 1e-9)
+    # Runs shorter than a sample interval have no full hour; the whole run stands in for it
+    worst_hour = max(((b["cpu_s"] - a["cpu_s"]) / (b["hours"] - a["hours"])
+                      for a, b in zip(samples, samples[1:]) if b["hours"] - a["hours"] >= args.sample_every / 2),
+                     default=cpu_per_hour)
+    return [
+        ("RSS growth after warm-up (MiB)", rss, args.rss_budget),
+        ("Heap growth after warm-up (KiB)", heap, args.heap_budget),
+        ("CPU per simulated hour (s)", cpu_per_hour, args.cpu_budget),
+        ("CPU in the busiest hour (s)", worst_hour, args.cpu_budget),
+    ]
+
+
+def _revision():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True,
+                              timeout=5).stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def markdown_report(result):
+    """The soak result as Markdown."""
+    final = result["samples"][-1]
+    lines = [
+        f"# Soak test: {result['hours']:g} simulated hours",
+        "",
+        f"- Revision: `{result['revision']}`, Python {result['python']} on {result['platform']}",
+        f"- Seed {result['seed']}, {result['user_moves_per_hour']:g} user movements per hour, "
+        f"warm-up {result['warmup']:g} h, finished in {result['wall_s']:.0f} s",
+        f"- {final['movements']:,} movements, {final['events']:,} events, "
+        f"{final['interruptions']:,} interruptions",
+        f"- Result: **{'PASS' if result['passed'] else 'FAIL'}**",
+        "",
+        "| Budget | Measured | Limit | |",
+        "|---|---:|---:|---|",
+    ]
+    for v in result["verdicts"]:
+        lines.append(f"| {v['check']} | {v['measured']:.2f} | {v['budget']:g} | {'ok' if v['passed'] else '**over**'} |")
+    lines += ["", "| Hours | RSS (MiB) | Heap (KiB) | CPU (s) | Movements | Events | Interruptions |",
+              "|---:|---:|---:|---:|---:|---:|---:|"]
+    for s in result["samples"]:
+        lines.append(f"| {s['hours']:.1f} | {s['rss_mib']:.1f} | {s['heap_kib']:.0f} | {s['cpu_s']:.1f} "
+                     f"| {s['movements']:,} | {s['events']:,} | {s['interruptions']:,} |")
+    if result["heap_growth"]:
+        lines += ["", "Heap growth by source line since the warm-up:", "",
+                  "| Line | KiB | Blocks |", "|---|---:|---:|"]
+        for g in result["heap_growth"]:
+            lines.append(f"| `{g['line']}` | {g['kib']:+.1f} | {g['blocks']:+,} |")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soak-test the mood loop for memory growth and CPU use.")
+    parser.add_argument("--hours", type=float, default=72, help="simulated hours to run")
+    parser.add_argument("--sample-every", type=float, default=1.0, metavar="HOURS",
+                        help="simulated hours between samples")
+    parser.add_argument("--warmup", type=float, default=4.0, metavar="HOURS",
+                        help="simulated hours left out of the growth fits")
+    parser.add_argument("--user-moves", type=float, default=12, metavar="PER_HOUR",
+                        help="simulated user movements per hour")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--rss-budget", type=float, default=8.0, metavar="MIB",
+                        help="allowed RSS growth after the warm-up")
+    parser.add_argument("--heap-budget", type=float, default=512.0, metavar="KIB",
+                        help="allowed traced heap growth after the warm-up")
+    parser.add_argument("--cpu-budget", type=float, default=36.0, metavar="SECONDS",
+                        help="CPU seconds per simulated hour (36 is 1%% of a core)")
+    parser.add_argument("--report", help="write a Markdown report here")
+    parser.add_argument("--json", help="write the samples and verdicts as JSON here")
+    args = parser.parse_args(argv)
+    if args.hours <= 0 or args.sample_every <= 0:
+        parser.error("--hours and --sample-every must be positive")
+
+    print(f"Soaking for {args.hours:g} simulated hours...")
+    wall = time.perf_counter()
+    samples, heap_growth = soak(args.hours, args.sample_every, args.user_moves, args.seed, args.warmup)
+    checks = verdicts(samples, args)
+    if args.hours < args.warmup + 2 * args.sample_every:
+        print(f"Note: growth needs {args.warmup + 2 * args.sample_every:g} h or more to be measured; "
+              f"only CPU use is checked")
+    result = {
+        "hours": args.hours,
+        "warmup": args.warmup,
+        "seed": args.seed,
+        "user_moves_per_hour": args.user_moves,
+        "revision": _revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "wall_s": time.perf_counter() - wall,
+        "passed": all(measured <= budget for _, measured, budget in checks),
+        "verdicts": [{"check": name, "measured": measured, "budget": budget, "passed": measured <= budget}
+                     for name, measured, budget in checks],
+        "samples": samples,
+        "heap_growth": heap_growth,
+    }
+
+    for name, measured, budget in checks:
+        print(f"{name:<36}{measured:>10.2f}  (limit {budget:g})  {'ok' if measured <= budget else 'OVER BUDGET'}")
+    final = samples[-1]
+    print(f"{final['movements']:,} movements, {final['events']:,} events, {final['interruptions']:,} "
+          f"interruptions in {result['wall_s']:.0f} s")
+    if args.report:
+        with open(args.report, "w") as f:
+            f.write(markdown_report(result))
+        print(f"Report written to {args.report}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+    return 0 if result["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+"""
+Mood-based mouse mover that keeps a session active while mimicking natural
+human pointer behaviour.
+
+Importing the package (or any of its modules) has no side effects and does
+not load pyautogui, screeninfo or Xlib; see mouse_mover.app.main() for the
+command line entry point.
+"""
+__version__ = "0.2.0"
@@ -0,0 +1,6 @@
+"""Allow `python -m mouse_mover`."""
+import sys
+
+from .app import main
+
+sys.exit(main())
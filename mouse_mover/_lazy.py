@@ -0,0 +1,20 @@
+"""Deferred imports for modules that are expensive to load."""
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """
+    The module `name`, loaded on first attribute access rather than now.
+    Keeps numpy out of startup for commands that never touch a path.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
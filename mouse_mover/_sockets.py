@@ -0,0 +1,42 @@
+"""Unix socket paths shared by the metrics and control servers."""
+import errno
+import os
+import socket
+import stat
+
+
+def remove_stale_socket(path):
+    """
+    Delete a socket left behind by a process that died, so a server can
+    bind `path`. Anything else at `path` is left alone: raises
+    FileExistsError if it isn't a socket, or OSError (EADDRINUSE) if a
+    server is still listening on it.
+    """
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(errno.EEXIST, "exists and is not a socket", path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except ConnectionRefusedError:
+            os.unlink(path)
+            return
+    raise OSError(errno.EADDRINUSE, "another process is listening on it", path)
+
+
+def socket_id(path):
+    """What identifies the socket at path, to tell later whether it is still ours."""
+    info = os.lstat(path)
+    return info.st_dev, info.st_ino
+
+
+def remove_socket(path, identity):
+    """Delete the socket at path if it is still the one socket_id() identified."""
+    try:
+        if socket_id(path) == identity:
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
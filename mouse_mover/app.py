@@ -0,0 +1,247 @@
+"""
+Single-desktop mover: the `mouse-mover` command.
+
+Importing this module has no side effects; main() parses the command line,
+sets everything up and runs the moods. Heavy modules (screeninfo,
+pyautogui, Xlib, asyncio runtime) are only imported once a run actually
+starts, so informational subcommands like --list-moods return in
+milliseconds.
+"""
+import argparse
+import os
+import sys
+
+# Mouse movement detection settings
+movement_detection_tolerance = 5  # pixels tolerance for recognising our own injected events
+
+# Pointer injection backend: "xtest", "uinput" or "pyautogui"; None picks the
+# fastest available ($MOUSE_MOVER_BACKEND also works)
+injection_backend = None
+
+# Point deadlines: sleep until this many seconds before each one, then spin
+# for the rest, using at most pacer_cpu_budget of a core (0 only sleeps)
+pacer_spin = 0.0005
+pacer_cpu_budget = 0.05
+
+# Pointer events are emitted on frame boundaries, at most one per frame;
+# None uses the monitors' refresh rate (60 Hz when it can't be read)
+emission_rate = None
+max_events_per_second = 120  # global cap across all movements; None for no cap
+# Frames are thinned to those keeping the pointer within this many pixels of
+# the path: slow moves send far fewer events (0 sends every frame)
+max_visual_error = 3.0
+
+# The pointer position is tracked locally from what we inject and from user
+# pointer events, and only asked of the X server this often (seconds)
+position_reconcile_interval = 30.0
+
+# Each mood's actions are packed to end within this many seconds of its
+# length; the budget caps pointer events in any minute (None for no budget)
+mood_window_tolerance = 0.5
+event_budget_per_minute = None
+
+# Safe area of every monitor, with margins to avoid PyAutoGUI fail-safe
+# triggers at screen corners/edges
+margin = 100  # 100 pixels margin from edges
+monitor_margins = {}  # per-monitor overrides, by name or position, e.g. {"HDMI-1": 200}
+
+# Screen regions movements stay out of, as inclusive (x0, y0, x1, y1) pixel
+# rectangles, e.g. a taskbar or video-call controls: [(0, 1040, 1919, 1079)]
+exclusion_zones = []
+
+# Economy mode: instead of moving nonstop, only move shortly before the
+# session would go idle (needs the X screen saver extension)
+economy_mode = False
+idle_threshold = 240  # seconds of idle time to stay below, e.g. under a 5 minute lock
+idle_lead = 20  # move this many seconds before the threshold
+
+# Base paths of the parametric movements are cached here as memory-mapped
+# .npy files, shared across restarts and fleet workers; None keeps them in memory
+trajectory_cache_dir = "~/.cache/mouse-mover/trajectories"
+
+# Directory of recorded .mmtrace files replayed by the recorded_trace movement
+# (record with `mouse-mover-traces record`); None falls back to natural drift
+trace_library = None
+
+# Runtime metrics, in Prometheus text format and as a periodic JSON snapshot
+metrics_port = 9464  # served on 127.0.0.1; None to disable
+metrics_unix_socket = None  # e.g. "/tmp/mouse-mover-metrics.sock", used instead of the port
+metrics_snapshot_path = None  # e.g. "/tmp/mouse-mover-metrics.json"
+metrics_snapshot_interval = 60  # seconds
+
+# Daemon mode: accept pause/resume/mood/tolerance/state/stats commands as
+# JSON lines on a Unix socket (see control.py); None uses
+# $XDG_RUNTIME_DIR/mouse-mover.sock
+daemon_mode = False
+control_socket = None
+
+# Console output goes through an in-memory ring buffer that a background
+# thread writes out; SIGUSR1 dumps the recent history, debug included, to stderr
+log_level = "info"  # "debug", "info", "warning" or "error"
+log_json = False  # one JSON object per line instead of plain messages
+log_buffer = 4096  # records kept in memory
+
+
+def list_moods(trace_dir=trace_library):
+    """Print every mood with its movement weights and transitions."""
+    from .moods import MOODS, MOOD_TRANSITIONS, use_recorded_traces
+    if trace_dir is not None:
+        from . import traces
+        use_recorded_traces(traces.set_library(trace_dir))
+    for name, config in MOODS.items():
+        total = sum(config["movements"].values())
+        print(f"{config['name']} ({name})")
+        for movement, weight in sorted(config["movements"].items(), key=lambda item: -item[1]):
+            print(f"  {movement.__name__:<26}{weight:>4}  {100 * weight / total:5.1f}%")
+        if name in MOOD_TRANSITIONS:
+            following = ", ".join(f"{mood} {weight}" for mood, weight in MOOD_TRANSITIONS[name].items())
+            print(f"  next mood: {following}")
+
+
+def run(economy=economy_mode, backend_name=injection_backend, trace_dir=trace_library,
+        port=metrics_port, unix_socket=metrics_unix_socket, rate=emission_rate, max_events=max_events_per_second,
+        max_error=max_visual_error, daemon=daemon_mode, control_path=control_socket,
+        event_budget=event_budget_per_minute, exclude=exclusion_zones):
+    """
+    Set up the screen, backend, detection and metrics, then run the moods;
+    as a daemon, with the control socket open.
+    """
+    import asyncio
+    from screeninfo import get_monitors
+    from . import (backends, control, cursor, detection, geometry, idle, log, metrics, pacing, pathcache,
+                   scheduler, traces, trajectory)
+    from .moods import MOODS, MOOD_TRANSITIONS, use_recorded_traces
+
+    log.info("Starting multi-monitor mouse mover. Press Ctrl+C to stop.")
+
+    # Movements target and clamp to every monitor's safe rectangle rather
+    # than one bounding box, and the index is rebuilt when monitors are
+    # plugged in or rearranged
+    screen = geometry.MonitorWatcher(margin, monitor_margins, get_monitors=get_monitors).start()
+    virtual_screen = geometry.virtual_screen(get_monitors())
+    log.info("Using %d monitor(s), safe area %s", len(screen.index), screen.index.bounds)
+    geometry.set_exclusions(exclude)
+
+    pacing.set_pacer(pacing.Pacer(spin=pacer_spin, cpu_budget=pacer_cpu_budget))
+    trajectory.set_emission_rate(rate or geometry.refresh_rate() or trajectory.SAMPLE_RATE, max_events)
+    trajectory.set_max_error(max_error)
+    log.info("Emitting pointer events at %g Hz (cap: %s/s, within %g px)", trajectory.frame_rate(),
+             max_events or "none", max_error or 0)
+    pathcache.set_directory(trajectory_cache_dir)
+    use_recorded_traces(traces.set_library(trace_dir))
+
+    # Direct injection backend; pyautogui remains the fallback
+    if backend_name is not None:
+        os.environ["MOUSE_MOVER_BACKEND"] = backend_name
+    # Positions are read from memory rather than the X server between syncs
+    tracker = cursor.CursorTracker(backends.default_backend(virtual_screen), position_reconcile_interval)
+    trajectory.set_backend(tracker)
+    log.info("Injecting pointer events with the %s backend", tracker.name)
+
+    # Start listening for pointer events from the user
+    activity_monitor = detection.UserActivityMonitor(detection.open_event_source(),
+                                                     tolerance=movement_detection_tolerance).start()
+    activity_monitor.subscribe(tracker.observe)
+    log.info("Mouse movement detection enabled (tolerance: %s pixels)", movement_detection_tolerance)
+
+    # Expose runtime metrics; moving matters more than being observed
+    try:
+        if unix_socket is not None:
+            metrics.serve_prometheus(unix_socket=unix_socket)
+            log.info("Metrics available on %s", unix_socket)
+        elif port is not None:
+            metrics.serve_prometheus(port=port)
+            log.info("Metrics available at http://127.0.0.1:%s/metrics", port)
+    except OSError as e:
+        log.warning("Metrics endpoint unavailable (%s), running without it", e)
+    if metrics_snapshot_path is not None:
+        metrics.start_snapshots(metrics_snapshot_path, metrics_snapshot_interval)
+
+    # Moods, pauses and interruptions all run as coroutines on one event loop
+    mood_scheduler = scheduler.MoodScheduler(MOODS, screen.index.bounds, monitor=activity_monitor,
+                                             transitions=MOOD_TRANSITIONS, screen=screen,
+                                             window_tolerance=mood_window_tolerance, event_budget=event_budget)
+
+    idle_source = idle.open_idle_source() if economy else None
+    if economy and idle_source is None:
+        log.warning("Economy mode needs system idle time; moving continuously instead")
+
+    if idle_source is not None:
+        runner = mood_scheduler.run_economy(idle_source, idle_threshold, idle_lead)
+    else:
+        runner = mood_scheduler.run()
+    if daemon:
+        runner = control.serve(mood_scheduler, runner, control_path)
+    asyncio.run(runner)
+
+
+def _rect(text):
+    """X0,Y0,X1,Y1 on the command line as a tuple of ints."""
+    try:
+        rect = tuple(int(v) for v in text.split(","))
+    except ValueError:
+        rect = ()
+    if len(rect) != 4:
+        raise argparse.ArgumentTypeError(f"expected X0,Y0,X1,Y1, got {text!r}")
+    return rect
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="mouse-mover",
+                                     description="Mood-based mouse mover that keeps the session active.")
+    parser.add_argument("--list-moods", action="store_true", help="show the moods and their movements, then exit")
+    parser.add_argument("--backend", default=injection_backend,
+                        choices=["xtest", "uinput", "pyautogui", "null"], help="pointer injection backend")
+    parser.add_argument("--economy", action="store_true", default=economy_mode,
+                        help="only move shortly before the session would go idle")
+    parser.add_argument("--trace-library", default=trace_library, help="directory of recorded .mmtrace files")
+    parser.add_argument("--metrics-port", type=int, default=metrics_port, help="Prometheus port (0 to disable)")
+    parser.add_argument("--metrics-socket", default=metrics_unix_socket, help="serve metrics on this Unix socket")
+    parser.add_argument("--daemon", action="store_true", default=daemon_mode,
+                        help="accept commands on a control socket (see mouse-mover-ctl)")
+    parser.add_argument("--control-socket", default=control_socket, help="control socket path for --daemon")
+    parser.add_argument("--log-level", default=log_level, choices=["debug", "info", "warning", "error"])
+    parser.add_argument("--log-json", action="store_true", default=log_json, help="log JSON lines")
+    parser.add_argument("--rate", type=float, default=emission_rate,
+                        help="pointer events per second while moving (default: monitor refresh rate)")
+    parser.add_argument("--max-events", type=int, default=max_events_per_second,
+                        help="cap on pointer events per second across all movements (0 for no cap)")
+    parser.add_argument("--max-error", type=float, default=max_visual_error, metavar="PIXELS",
+                        help="pixels the pointer may lag a path by to save events (0 emits every frame)")
+    parser.add_argument("--event-budget", type=int, default=event_budget_per_minute, metavar="PER_MINUTE",
+                        help="most pointer events to inject in any minute")
+    parser.add_argument("--exclude", action="append", type=_rect, default=list(exclusion_zones),
+                        metavar="X0,Y0,X1,Y1", help="keep out of this screen rectangle (repeatable)")
+    parser.add_argument("--simulate", type=float, metavar="HOURS",
+                        help="run the moods offline on a virtual clock and print summary statistics")
+    parser.add_argument("--seed", type=int, help="random seed for --simulate")
+    parser.add_argument("--user-moves", type=float, default=0, metavar="PER_HOUR",
+                        help="simulated user movements per hour for --simulate")
+    args = parser.parse_args(argv)
+
+    if args.list_moods:
+        list_moods(args.trace_library)
+        return 0
+    if args.simulate is not None:
+        from .simulation import simulate, format_summary
+        from .trajectory import set_max_error
+        set_max_error(args.max_error)
+        print(format_summary(simulate(args.simulate, args.seed, margin=margin,
+                                      user_moves_per_hour=args.user_moves, event_budget=args.event_budget,
+                                      exclusions=args.exclude)))
+        return 0
+
+    from . import log
+    log.configure(args.log_level, args.log_json, log_buffer)
+    log.install_dump_signal()
+    try:
+        run(args.economy, args.backend, args.trace_library, args.metrics_port or None, args.metrics_socket,
+            args.rate, args.max_events or None, args.max_error, args.daemon, args.control_socket,
+            args.event_budget, args.exclude)
+    except KeyboardInterrupt:
+        log.info("\n🛑 Script stopped by user.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+Pointer injection backends.
+
+The trajectory engine talks to a backend instead of calling pyautogui
+directly. move() queues a pointer move and flush() sends everything queued
+since the last flush, which the replay loop does once per frame.
+
+- XTestBackend: XTest fake motion over an open Xlib connection. Moves sit in
+  Xlib's output buffer until flush(), so there is one write per frame and
+  no fail-safe check, tweening or PAUSE sleep per call.
+- UInputBackend: a virtual absolute pointer via /dev/uinput (python-evdev);
+  works under Wayland and on the console. Needs write access to /dev/uinput.
+- PyAutoGUIBackend: the portable fallback (macOS, Windows).
+- NullBackend / RecordingBackend: no real pointer, for tests and benchmarks.
+
+Note that pyautogui's corner fail-safe only applies to PyAutoGUIBackend; the
+others rely on the app's screen margins and on user movement detection.
+"""
+import os
+import sys
+import time
+
+from . import log
+
+# Name of our uinput device, so detection can ignore its events
+UINPUT_DEVICE_NAME = "mouse-mover virtual pointer"
+
+
+class NullBackend:
+    """Discards every move but remembers where the pointer would be."""
+    name = "null"
+
+    def __init__(self, start=(0, 0)):
+        self.x, self.y = start
+
+    def position(self):
+        return self.x, self.y
+
+    def move(self, x, y):
+        self.x, self.y = x, y
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class RecordingBackend(NullBackend):
+    """
+    Records every move as (perf_counter time, x, y) and counts flushes.
+    With forward set, moves are also passed on to that backend.
+    """
+    name = "recording"
+
+    def __init__(self, start=(0, 0), forward=None):
+        super().__init__(start)
+        self.forward = forward
+        self.events = []
+        self.flushes = 0
+
+    def position(self):
+        if self.forward is not None:
+            return self.forward.position()
+        return super().position()
+
+    def move(self, x, y):
+        self.events.append((time.perf_counter(), x, y))
+        super().move(x, y)
+        if self.forward is not None:
+            self.forward.move(x, y)
+
+    def flush(self):
+        self.flushes += 1
+        if self.forward is not None:
+            self.forward.flush()
+
+
+class PyAutoGUIBackend:
+    """Injects through pyautogui, without its per-call PAUSE sleep."""
+    name = "pyautogui"
+
+    def __init__(self):
+        import pyautogui
+        self._pyautogui = pyautogui
+
+    def position(self):
+        x, y = self._pyautogui.position()
+        return x, y
+
+    def move(self, x, y):
+        self._pyautogui.moveTo(x, y, _pause=False)
+
+    def flush(self):
+        pass  # pyautogui sends every move immediately
+
+    def close(self):
+        pass
+
+
+class XTestBackend:
+    """Injects XTest motion events, batched in the Xlib output buffer."""
+    name = "xtest"
+
+    def __init__(self, display_name=None):
+        from Xlib import X, display
+        from Xlib.ext import xtest
+        self.display = display.Display(display_name)
+        if not self.display.has_extension("XTEST"):
+            raise OSError("X server has no XTEST extension")
+        self._root = self.display.screen().root
+        self._motion = X.MotionNotify
+        self._fake_input = xtest.fake_input
+
+    def position(self):
+        pointer = self._root.query_pointer()
+        return pointer.root_x, pointer.root_y
+
+    def move(self, x, y):
+        self._fake_input(self.display, self._motion, x=x, y=y)
+
+    def flush(self):
+        self.display.flush()
+
+    def close(self):
+        self.display.close()
+
+
+class UInputBackend:
+    """
+    Injects through a virtual absolute pointer created with /dev/uinput.
+    The device reports positions in the given virtual screen bounds.
+    """
+    name = "uinput"
+
+    def __init__(self, screen_bounds):
+        from evdev import AbsInfo, UInput, ecodes
+        self._ecodes = ecodes
+        min_x, min_y, max_x, max_y = screen_bounds
+        capabilities = {
+            ecodes.EV_KEY: [ecodes.BTN_LEFT],  # Needed for the device to count as a pointer
+            ecodes.EV_ABS: [
+                (ecodes.ABS_X, AbsInfo(0, min_x, max_x, 0, 0, 0)),
+                (ecodes.ABS_Y, AbsInfo(0, min_y, max_y, 0, 0, 0)),
+            ],
+        }
+        self.device = UInput(capabilities, name=UINPUT_DEVICE_NAME)
+        # uinput cannot be queried, so the position is the last one we sent
+        self.x, self.y = (min_x + max_x) // 2, (min_y + max_y) // 2
+        self._queued = False
+
+    def position(self):
+        return self.x, self.y
+
+    def move(self, x, y):
+        ecodes = self._ecodes
+        self.device.write(ecodes.EV_ABS, ecodes.ABS_X, x)
+        self.device.write(ecodes.EV_ABS, ecodes.ABS_Y, y)
+        self.x, self.y = x, y
+        self._queued = True
+
+    def flush(self):
+        # One SYN_REPORT per frame delivers all queued axis updates together
+        if self._queued:
+            self.device.syn()
+            self._queued = False
+
+    def close(self):
+        self.device.close()
+
+
+def create_backend(name, screen_bounds=None):
+    """Create a backend by name: xtest, uinput, pyautogui, null or recording."""
+    if name == "xtest":
+        return XTestBackend()
+    if name == "uinput":
+        if screen_bounds is None:
+            raise ValueError("the uinput backend needs the virtual screen bounds")
+        return UInputBackend(screen_bounds)
+    if name == "pyautogui":
+        return PyAutoGUIBackend()
+    if name == "null":
+        return NullBackend()
+    if name == "recording":
+        return RecordingBackend()
+    raise ValueError(f"unknown backend {name!r}")
+
+
+def default_backend(screen_bounds=None):
+    """
+    Pick a backend: $MOUSE_MOVER_BACKEND if set, XTest on X11, otherwise
+    pyautogui.
+    """
+    name = os.environ.get("MOUSE_MOVER_BACKEND")
+    if name:
+        return create_backend(name, screen_bounds)
+    if sys.platform.startswith("linux") and os.environ.get("DISPLAY"):
+        try:
+            return XTestBackend()
+        except Exception as e:
+            log.warning("XTest unavailable (%s), falling back to pyautogui", e)
+    return PyAutoGUIBackend()
@@ -0,0 +1,210 @@
+"""
+Control socket for a running mover (daemon mode).
+
+ControlServer listens on a Unix socket on the scheduler's own event loop and
+reads one JSON object per line, answering each with one JSON line:
+
+    {"cmd": "pause"}                      stop moving until resumed
+    {"cmd": "resume"}
+    {"cmd": "mood", "mood": "drowsy"}     switch now and stay; null follows the transitions again
+    {"cmd": "tolerance", "pixels": 8}     detection tolerance, when detection goes by position
+    {"cmd": "state"}                      mood, movement, pause and detection state
+    {"cmd": "stats"}                      metrics snapshot, per-movement emission counts and estimates
+
+Replies are {"ok": true, ...} or {"ok": false, "error": "..."}. Commands are
+handled between two points of the running movement, and pause or a mood
+switch preempt it, so they take effect before the next point is injected.
+The socket is only accessible to its owner.
+
+Usage:
+    mouse-mover --daemon
+    mouse-mover-ctl pause
+    mouse-mover-ctl mood hyperactive
+    mouse-mover-ctl state
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+
+from . import log
+from . import metrics
+from ._sockets import remove_socket, remove_stale_socket, socket_id
+from . import movements
+from . import trajectory
+
+
+def default_socket_path():
+    """$XDG_RUNTIME_DIR/mouse-mover.sock, or a per-user path in /tmp."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "mouse-mover.sock")
+    return f"/tmp/mouse-mover-{os.getuid()}.sock"
+
+
+class ControlError(Exception):
+    """A command that can't be carried out; its message goes back to the client."""
+
+
+class ControlServer:
+    """JSON-lines control socket for a scheduler.MoodScheduler."""
+
+    def __init__(self, mover, path=None):
+        self.mover = mover
+        self.path = path or default_socket_path()
+        self.started = None  # loop time the server started
+        self._server = None
+        self._socket_id = None  # of the socket we bound, so close() only removes our own
+
+    async def start(self):
+        import asyncio
+        remove_stale_socket(self.path)
+        self._server = await asyncio.start_unix_server(self._serve, path=self.path)
+        self._socket_id = socket_id(self.path)
+        os.chmod(self.path, 0o600)
+        self.started = asyncio.get_running_loop().time()
+        return self
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+        remove_socket(self.path, self._socket_id)
+
+    async def _serve(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write(json.dumps(self.handle(line)).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def handle(self, line):
+        """Carry out one request line and return the reply."""
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict) or request.get("cmd") not in COMMANDS:
+                raise ControlError(f"expected a \"cmd\" of {', '.join(COMMANDS)}")
+            reply = getattr(self, f"_{request['cmd']}")(request)
+        except (ValueError, KeyError, TypeError) as e:
+            return {"ok": False, "error": f"bad request: {e}"}
+        except ControlError as e:
+            return {"ok": False, "error": str(e)}
+        metrics.CONTROL_COMMANDS.labels(request["cmd"]).inc()
+        return {"ok": True, **reply}
+
+    def _pause(self, request):
+        self.mover.pause()
+        return self._state(request)
+
+    def _resume(self, request):
+        self.mover.resume()
+        return self._state(request)
+
+    def _mood(self, request):
+        mood = request.get("mood")
+        if mood is not None and not isinstance(mood, str):
+            raise ControlError("mood must be a mood name or null")
+        if mood is not None and mood not in self.mover.moods.configs:
+            raise ControlError(f"unknown mood {mood!r}; expected one of {', '.join(self.mover.moods.names)}")
+        self.mover.force_mood(mood)
+        return self._state(request)
+
+    def _tolerance(self, request):
+        monitor = self.mover.monitor
+        if monitor is None:
+            raise ControlError("no user activity monitor to configure")
+        if not monitor.uses_tolerance:
+            raise ControlError(f"{type(monitor.source).__name__} tells injected events apart by device; "
+                               f"the tolerance only applies to position polling")
+        pixels = request["pixels"]
+        if isinstance(pixels, bool) or not isinstance(pixels, (int, float)) or pixels < 0:
+            raise ControlError("pixels must be a non-negative number")
+        monitor.tags.tolerance = pixels
+        return self._state(request)
+
+    def _state(self, request):
+        mover = self.mover
+        now = mover._loop.time()
+        return {
+            "paused": mover.paused,
+            "mood": mover.mood,
+            "forced_mood": mover.forced_mood,
+            "movement": mover.movement,
+            "moods": list(mover.moods.names),
+            # None when detection doesn't go by position (see UserActivityMonitor.uses_tolerance)
+            "tolerance": mover.monitor.tags.tolerance if mover.monitor is not None and mover.monitor.uses_tolerance
+            else None,
+            "user_active": mover.user_active.is_set(),
+            "idle_s": now - mover.last_activity if mover.last_activity is not None else None,
+            "uptime_s": now - self.started,
+        }
+
+    def _stats(self, request):
+        return {
+            "metrics": metrics.REGISTRY.snapshot()["metrics"],
+            "emission": trajectory.emission.movements,
+            "preemption": trajectory.preemption_latency.summary(),
+            "movements": movements.REGISTRY.summary(),
+            "cursor": self.mover.backend.summary() if hasattr(self.mover.backend, "summary") else None,
+        }
+
+
+COMMANDS = ("pause", "resume", "mood", "tolerance", "state", "stats")
+
+
+async def serve(mover, runner, path=None):
+    """Run the `runner` coroutine (e.g. mover.run()) with a control socket open."""
+    server = await ControlServer(mover, path).start()
+    log.info("Control socket listening on %s", server.path)
+    try:
+        return await runner
+    finally:
+        await server.close()
+
+
+def send(request, path=None, timeout=5):
+    """Send one request dict to a running mover and return its reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(timeout)
+        connection.connect(path or default_socket_path())
+        connection.sendall(json.dumps(request).encode() + b"\n")
+        with connection.makefile("rb") as replies:
+            return json.loads(replies.readline())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="mouse-mover-ctl", description="Control a mover started with --daemon.")
+    parser.add_argument("--socket", help=f"control socket (default: {default_socket_path()})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("pause", help="stop moving until resumed")
+    commands.add_parser("resume", help="start moving again")
+    mood_parser = commands.add_parser("mood", help="switch to a mood and stay in it")
+    mood_parser.add_argument("mood", nargs="?", help="mood name; omit to follow the transitions again")
+    tolerance_parser = commands.add_parser("tolerance", help="set the movement detection tolerance")
+    tolerance_parser.add_argument("pixels", type=float)
+    commands.add_parser("state", help="show mood, movement and pause state")
+    commands.add_parser("stats", help="show metrics and per-movement emission counts")
+    args = parser.parse_args(argv)
+
+    request = {"cmd": args.command}
+    if args.command == "mood":
+        request["mood"] = args.mood
+    elif args.command == "tolerance":
+        request["pixels"] = args.pixels
+    try:
+        reply = send(request, args.socket)
+    except OSError as e:
+        print(f"Can't reach the mover on {args.socket or default_socket_path()}: {e}")
+        return 1
+    print(json.dumps(reply, indent=2, ensure_ascii=False))
+    return 0 if reply.get("ok") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
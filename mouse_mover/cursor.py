@@ -0,0 +1,97 @@
+"""
+Pointer position kept locally instead of asked of the server.
+
+Asking XTest or pyautogui where the pointer is costs a round trip to the
+X server, and the mover used to ask before every movement. CursorTracker
+wraps an injection backend and remembers the last point injected through
+it, so position() is a memory read. It only asks the backend again when:
+
+- a user pointer event without coordinates arrived (see observe()), or
+- `reconcile_interval` seconds passed since the last sync, in case the
+  pointer moved without us hearing of it.
+
+User events with coordinates (position polling) update it directly. Every
+read counts towards mouse_mover_position_reads_total by where the answer
+came from, so the round trips saved show in the metrics.
+"""
+import time
+
+from . import metrics
+
+
+class CursorTracker:
+    """
+    Injection backend wrapper answering position() from memory.
+    reconcile_interval: most seconds between two real position queries
+    (None: only after user events)
+    """
+
+    def __init__(self, backend, reconcile_interval=30.0, clock=time.monotonic):
+        self.backend = backend
+        self.name = backend.name
+        self.reconcile_interval = reconcile_interval
+        self.clock = clock
+        self.local_reads = 0
+        self.round_trips = 0
+        self.started = clock()
+        self._position = None  # last known (x, y), as one tuple so threads see it whole
+        self._synced_at = float("-inf")
+        self._stale = True
+        self._local_reads = metrics.POSITION_READS.labels("local")
+        self._backend_reads = metrics.POSITION_READS.labels("backend")
+
+    def __getattr__(self, name):
+        # Anything else (move_path(), recorded events) is the backend's
+        return getattr(self.backend, name)
+
+    def position(self):
+        if (self._stale or self.reconcile_interval is not None
+                and self.clock() - self._synced_at >= self.reconcile_interval):
+            return self.sync()
+        self.local_reads += 1
+        self._local_reads.inc()
+        return self._position
+
+    def sync(self):
+        """Ask the backend where the pointer really is, one round trip."""
+        self._stale = False
+        self._position = self.backend.position()
+        self._synced_at = self.clock()
+        self.round_trips += 1
+        self._backend_reads.inc()
+        return self._position
+
+    def move(self, x, y):
+        self.backend.move(x, y)
+        self._position = (x, y)
+
+    def move_path(self, times, xs, ys):
+        """For backends taking whole paths at once (simulation.SimulatedBackend)."""
+        self.backend.move_path(times, xs, ys)
+        self._position = (int(xs[-1]), int(ys[-1]))
+
+    def flush(self):
+        self.backend.flush()
+
+    def close(self):
+        self.backend.close()
+
+    def observe(self, event):
+        """
+        Take note of a user pointer event (a UserActivityMonitor subscriber,
+        called from its thread): its position if it has one, otherwise
+        that the pointer has moved somewhere we don't know.
+        """
+        if event is not None and event.x is not None:
+            self._position = (event.x, event.y)
+            self._synced_at = self.clock()
+        else:
+            self._stale = True
+
+    def summary(self):
+        hours = max(self.clock() - self.started, 1e-9) / 3600
+        return {
+            "local_reads": self.local_reads,
+            "round_trips": self.round_trips,
+            "round_trips_saved_per_hour": self.local_reads / hours,
+        }
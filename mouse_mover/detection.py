@@ -0,0 +1,299 @@
+"""
+Event-driven detection of external (user) mouse movement.
+
+A listener thread blocks on a pointer event source and sets a "user active"
+signal as soon as an event arrives that we did not inject ourselves. Nothing
+polls: the thread sleeps in the kernel until the source has data.
+
+Sources:
+- XInput2Source: XI2 raw motion events; our XTest and uinput injections are
+  told apart by their source device.
+- EvdevSource: physical pointer devices under /dev/input; these never see
+  XTest injections and our uinput device is skipped, so every event is a
+  user event.
+- FakeEventSource: events pushed by hand, for tests.
+- PollingSource: pyautogui position polling, the fallback for platforms
+  without an event source (macOS, Windows).
+
+Sources that only report positions are filtered through InjectionTags, which
+remembers the points trajectory.inject() recently sent.
+"""
+import os
+import queue
+import select
+import threading
+import time
+from collections import deque, namedtuple
+
+from . import backends
+from . import log
+from . import metrics
+from . import trajectory
+
+# injected is True/False when the source knows who produced the event, or
+# None when it has to be decided from the position against InjectionTags
+PointerEvent = namedtuple("PointerEvent", "timestamp x y injected")
+
+
+class InjectionTags:
+    """Remembers recently injected points so their echoes can be recognised."""
+
+    def __init__(self, tolerance=5, window=0.5):
+        self.tolerance = tolerance
+        self.window = window  # seconds an injected point stays recognisable
+        self._points = deque(maxlen=256)
+        self._lock = threading.Lock()
+
+    def tag(self, x, y):
+        """Record a point we are about to inject."""
+        with self._lock:
+            self._points.append((time.monotonic(), x, y))
+
+    def matches(self, x, y):
+        """True if (x, y) is within tolerance of a recently injected point."""
+        cutoff = time.monotonic() - self.window
+        with self._lock:
+            while self._points and self._points[0][0] < cutoff:
+                self._points.popleft()
+            for _, tx, ty in reversed(self._points):
+                if abs(tx - x) <= self.tolerance and abs(ty - y) <= self.tolerance:
+                    return True
+        return False
+
+
+class FakeEventSource:
+    """Event source fed by push(), for tests and headless runs."""
+    reports_positions = True  # push(x, y, injected=None) is matched against InjectionTags
+
+    def __init__(self):
+        self._queue = queue.Queue()
+
+    def push(self, x=None, y=None, injected=False):
+        """Queue a pointer event as if it came from the device."""
+        self._queue.put(PointerEvent(time.monotonic(), x, y, injected))
+
+    def read(self):
+        return self._queue.get()
+
+    def close(self):
+        self._queue.put(None)
+
+
+class _WakeupMixin:
+    """Self-pipe so close() can wake a thread blocked in select()."""
+
+    def _init_wakeup(self):
+        self._wake_r, self._wake_w = os.pipe()
+        self._pending = deque()
+
+    def close(self):
+        os.write(self._wake_w, b"x")
+
+
+class EvdevSource(_WakeupMixin):
+    """Reads relative/absolute motion from physical pointer devices via python-evdev."""
+
+    def __init__(self, exclude_names=(backends.UINPUT_DEVICE_NAME,)):
+        import evdev
+        self._ecodes = evdev.ecodes
+        self.devices = []
+        for path in evdev.list_devices():
+            device = evdev.InputDevice(path)
+            # Skip virtual devices we create ourselves for injection
+            if device.name in exclude_names or not self._is_pointer(device):
+                device.close()
+                continue
+            self.devices.append(device)
+        if not self.devices:
+            raise OSError("no readable pointer devices under /dev/input")
+        self._init_wakeup()
+
+    def _is_pointer(self, device):
+        caps = device.capabilities()
+        ecodes = self._ecodes
+        return (ecodes.REL_X in caps.get(ecodes.EV_REL, ())
+                or ecodes.ABS_X in [code for code, _ in caps.get(ecodes.EV_ABS, ())])
+
+    def read(self):
+        ecodes = self._ecodes
+        while not self._pending:
+            ready, _, _ = select.select(self.devices + [self._wake_r], [], [])
+            if self._wake_r in ready:
+                return None
+            for device in ready:
+                for event in device.read():
+                    if event.type in (ecodes.EV_REL, ecodes.EV_ABS):
+                        # Kernel timestamps are wall-clock; convert to monotonic
+                        age = time.time() - event.timestamp()
+                        self._pending.append(PointerEvent(time.monotonic() - age, None, None, False))
+        return self._pending.popleft()
+
+    def close(self):
+        super().close()
+        for device in self.devices:
+            device.close()
+
+
+class XInput2Source(_WakeupMixin):
+    """Reads XI2 raw motion from the X server via python-xlib."""
+
+    def __init__(self, display_name=None, injecting_names=("XTEST", backends.UINPUT_DEVICE_NAME)):
+        from Xlib import X, display
+        from Xlib.ext import xinput
+        self._X = X
+        self._xinput = xinput
+        self.display = display.Display(display_name)
+        if not self.display.has_extension("XInputExtension"):
+            raise OSError("X server has no XInput2 extension")
+        self._opcode = self.display.query_extension("XInputExtension").major_opcode
+
+        # Injections arrive from the XTEST slave pointer, or from our uinput
+        # device once X has picked it up as a slave of its own
+        self.injecting_names = injecting_names
+        self._injected_ids = set()
+        self._refresh_injected_ids()
+
+        root = self.display.screen().root
+        root.xinput_select_events([(xinput.AllMasterDevices, xinput.RawMotionMask),
+                                   (xinput.AllDevices, xinput.HierarchyChangedMask)])
+        self.display.flush()
+        self._init_wakeup()
+
+    def _refresh_injected_ids(self):
+        """Look up the devices our injections come from; they come and go with hot-plugging."""
+        ids = set()
+        for device in self.display.xinput_query_device(self._xinput.AllDevices).devices:
+            name = device.name.decode() if isinstance(device.name, bytes) else device.name
+            if any(injecting in name for injecting in self.injecting_names):
+                ids.add(device.deviceid)
+        self._injected_ids = ids
+
+    def read(self):
+        while not self._pending:
+            if not self.display.pending_events():
+                ready, _, _ = select.select([self.display.fileno(), self._wake_r], [], [])
+                if self._wake_r in ready:
+                    return None
+            for _ in range(self.display.pending_events()):
+                event = self.display.next_event()
+                if event.type != self._X.GenericEvent or event.extension != self._opcode:
+                    continue
+                if event.evtype == self._xinput.HierarchyChanged:
+                    self._refresh_injected_ids()
+                elif event.evtype == self._xinput.RawMotion:
+                    injected = event.data.sourceid in self._injected_ids
+                    self._pending.append(PointerEvent(time.monotonic(), None, None, injected))
+        return self._pending.popleft()
+
+    def close(self):
+        super().close()
+        self.display.close()
+
+
+class PollingSource:
+    """Fallback source that polls the pointer position and reports changes."""
+    reports_positions = True
+
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self._closed = threading.Event()
+        self._last = None
+
+    def read(self):
+        while not self._closed.wait(self.interval):
+            # The real position, which also keeps a CursorTracker in sync
+            x, y = trajectory.sync_position()
+            if (x, y) != self._last:
+                first = self._last is None
+                self._last = (x, y)
+                if not first:
+                    return PointerEvent(time.monotonic(), x, y, None)
+        return None
+
+    def close(self):
+        self._closed.set()
+
+
+def open_event_source():
+    """Pick the best available pointer event source for this platform."""
+    if os.environ.get("DISPLAY"):
+        try:
+            return XInput2Source()
+        except Exception as e:
+            log.warning("XInput2 unavailable (%s), trying evdev...", e)
+    try:
+        return EvdevSource()
+    except Exception as e:
+        log.warning("evdev unavailable (%s), falling back to position polling", e)
+    return PollingSource()
+
+
+class UserActivityMonitor:
+    """
+    Background listener that publishes a "user active" signal.
+    Events we injected are ignored; any other pointer event sets user_active
+    and notifies subscribers from the listener thread.
+    """
+
+    def __init__(self, source, tolerance=5):
+        self.source = source
+        self.tags = InjectionTags(tolerance=tolerance)
+        self.user_active = threading.Event()
+        self.last_activity = None  # monotonic time of the last user event
+        self.last_latency = None   # seconds from event timestamp to publish
+        self._subscribers = []
+        self._thread = threading.Thread(target=self._run, name="user-activity", daemon=True)
+
+    def start(self):
+        """Start listening and tag everything trajectory injects from now on."""
+        trajectory.injection_hooks.append(self.tags.tag)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self.tags.tag in trajectory.injection_hooks:
+            trajectory.injection_hooks.remove(self.tags.tag)
+        self.source.close()
+        self._thread.join(timeout=1)
+
+    @property
+    def uses_tolerance(self):
+        """
+        True if injected events are recognised by position, within
+        tags.tolerance; device-level sources (XInput2, evdev) know who sent
+        each event and never look at it.
+        """
+        return getattr(self.source, "reports_positions", False)
+
+    def subscribe(self, callback):
+        """Call callback(event) from the listener thread on every user event."""
+        self._subscribers.append(callback)
+
+    def is_user_event(self, event):
+        if event.injected is not None:
+            return not event.injected
+        if event.x is None:
+            return True
+        return not self.tags.matches(event.x, event.y)
+
+    def _run(self):
+        while True:
+            event = self.source.read()
+            if event is None:
+                return
+            if not self.is_user_event(event):
+                continue
+            self.last_activity = event.timestamp
+            self.user_active.set()
+            self.last_latency = time.monotonic() - event.timestamp
+            metrics.DETECTION_LATENCY.observe(self.last_latency)
+            for callback in self._subscribers:
+                callback(event)
+
+    def wait(self, timeout=None):
+        """Block until the user is active or timeout passes; returns the signal state."""
+        return self.user_active.wait(timeout)
+
+    def clear(self):
+        """Acknowledge the current activity so the next user event sets the signal again."""
+        self.user_active.clear()
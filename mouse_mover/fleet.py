@@ -0,0 +1,296 @@
+"""
+Fleet mode: drive many X displays from one supervisor.
+
+Instead of one mouse-mover per desktop, the supervisor compiles MOODS once and
+forks a pool of worker processes, one per display. Workers inherit the
+compiled tables copy-on-write, discover their own display's geometry with
+screeninfo, inject through XTest on that display, and start staggered so
+their injection bursts don't line up. Every worker reports stats over a
+queue; the supervisor restarts workers that die and prints aggregated
+health, including memory and CPU per desktop for host sizing.
+
+Usage:
+    mouse-mover-fleet --displays :1 :2 :3
+    mouse-mover-fleet --xvfb 4            # start Xvfb :99..:102 locally
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import queue
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import time
+
+from . import backends
+from . import cursor
+from . import detection
+from . import geometry
+from . import log
+from . import metrics
+from . import pacing
+from . import pathcache
+from . import sampling
+from . import scheduler
+from . import traces
+from . import trajectory
+from .moods import MOODS, MOOD_TRANSITIONS, use_recorded_traces
+from ._lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+def current_rss():
+    """Resident set size of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Peak rather than current, but the best we have off Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def worker_stats(display, started):
+    """Stats a worker reports to the supervisor."""
+    return {
+        "display": display,
+        "pid": os.getpid(),
+        "time": time.time(),
+        "uptime": time.time() - started,
+        "cpu_seconds": time.process_time(),
+        "rss_bytes": current_rss(),
+        "movements": metrics.MOVEMENTS.total(),
+        "injected_events": metrics.INJECTED_EVENTS.value,
+        "interruptions": metrics.INTERRUPTIONS.value,
+        "position_round_trips_saved": metrics.POSITION_READS.labels("local").value,
+    }
+
+
+def worker_main(display, tables, stagger, stats_queue, stats_interval, log_path):
+    """Entry point of a forked worker driving one display."""
+    started = time.time()
+    os.environ["DISPLAY"] = display
+    # Forked workers share the parent's random state; give each its own
+    random.seed()
+    np.random.seed()
+    sys.stdout = open(log_path, "a", buffering=1) if log_path else open(os.devnull, "w")
+
+    screen = geometry.MonitorWatcher().start(display)
+    backend = cursor.CursorTracker(backends.XTestBackend(display))
+    try:
+        monitor = detection.UserActivityMonitor(detection.XInput2Source(display)).start()
+        monitor.subscribe(backend.observe)
+    except Exception as e:
+        log.warning("User detection unavailable on %s: %s", display, e)
+        monitor = None
+    mood_scheduler = scheduler.MoodScheduler(tables, screen.index.bounds, monitor=monitor, backend=backend,
+                                             screen=screen)
+
+    async def report():
+        while True:
+            stats_queue.put(worker_stats(display, started))
+            await asyncio.sleep(stats_interval)
+
+    async def run():
+        reporter = asyncio.create_task(report())
+        await asyncio.sleep(stagger)
+        try:
+            await mood_scheduler.run()
+        finally:
+            reporter.cancel()
+
+    asyncio.run(run())
+
+
+class FleetSupervisor:
+    """Runs one worker process per display and aggregates their stats."""
+
+    def __init__(self, displays, moods=MOODS, transitions=MOOD_TRANSITIONS,
+                 stagger=None, stats_interval=10, log_dir=None):
+        self.displays = list(displays)
+        if not self.displays:
+            raise ValueError("a fleet needs at least one display")
+        # Compiled once here and shared with every worker through fork
+        self.tables = sampling.CompiledMoods(moods, transitions)
+        # Spread starts across one mood window unless told otherwise
+        self.stagger = 60 / len(self.displays) if stagger is None else stagger
+        self.stats_interval = stats_interval
+        self.log_dir = log_dir
+        self.context = multiprocessing.get_context("fork")
+        self.stats_queue = self.context.Queue()
+        self.workers = {}  # display -> Process
+        self.stats = {}    # display -> latest stats dict
+        self.restarts = {display: 0 for display in self.displays}
+
+    def _start_worker(self, display, stagger):
+        log_path = None
+        if self.log_dir:
+            log_path = os.path.join(self.log_dir, f"display-{display.lstrip(':')}.log")
+        process = self.context.Process(
+            target=worker_main, name=f"mover-{display}", daemon=True,
+            args=(display, self.tables, stagger, self.stats_queue, self.stats_interval, log_path))
+        process.start()
+        self.workers[display] = process
+
+    def start(self):
+        if self.log_dir:
+            os.makedirs(self.log_dir, exist_ok=True)
+        for index, display in enumerate(self.displays):
+            self._start_worker(display, index * self.stagger)
+
+    def stop(self):
+        for process in self.workers.values():
+            process.terminate()
+        for process in self.workers.values():
+            process.join(timeout=5)
+
+    def check_workers(self):
+        """Restart any worker that has exited."""
+        for display in self.displays:
+            process = self.workers[display]
+            if not process.is_alive():
+                print(f"⚠️  Worker for {display} exited with code {process.exitcode}, restarting")
+                self.restarts[display] += 1
+                self._start_worker(display, self.stagger)
+
+    def drain_stats(self, timeout):
+        """Collect stats reports for up to `timeout` seconds."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                report = self.stats_queue.get(timeout=remaining)
+            except queue.Empty:
+                return
+            self.stats[report["display"]] = report
+
+    def health(self):
+        """Per-display health rows plus fleet totals."""
+        now = time.time()
+        rows = []
+        for display in self.displays:
+            report = self.stats.get(display)
+            alive = self.workers[display].is_alive()
+            if report is None:
+                rows.append({"display": display, "alive": alive, "healthy": False,
+                             "restarts": self.restarts[display]})
+                continue
+            age = now - report["time"]
+            rows.append(dict(report, alive=alive, restarts=self.restarts[display],
+                             report_age=age,
+                             healthy=alive and age < 3 * self.stats_interval,
+                             cpu_percent=100 * report["cpu_seconds"] / max(report["uptime"], 1e-9)))
+        reported = [r for r in rows if "rss_bytes" in r]
+        totals = {
+            "desktops": len(rows),
+            "healthy": sum(r["healthy"] for r in rows),
+            "rss_bytes": sum(r["rss_bytes"] for r in reported),
+            "cpu_percent": sum(r["cpu_percent"] for r in reported),
+            "injected_events": sum(r["injected_events"] for r in reported),
+            "supervisor_rss_bytes": current_rss(),
+        }
+        if reported:
+            totals["rss_bytes_per_desktop"] = totals["rss_bytes"] / len(reported)
+            totals["cpu_percent_per_desktop"] = totals["cpu_percent"] / len(reported)
+        return rows, totals
+
+    def print_health(self):
+        rows, totals = self.health()
+        print(f"\n{'display':<10}{'pid':>8}{'ok':>4}{'restarts':>10}{'moves':>8}"
+              f"{'events':>10}{'interrupts':>12}{'cpu %':>8}{'rss MB':>9}")
+        for r in rows:
+            if "rss_bytes" not in r:
+                print(f"{r['display']:<10}{'-':>8}{'no':>4}{r['restarts']:>10}  (no report yet)")
+                continue
+            print(f"{r['display']:<10}{r['pid']:>8}{'yes' if r['healthy'] else 'no':>4}"
+                  f"{r['restarts']:>10}{r['movements']:>8}{r['injected_events']:>10}"
+                  f"{r['interruptions']:>12}{r['cpu_percent']:>8.2f}{r['rss_bytes'] / 2**20:>9.1f}")
+        line = f"{totals['healthy']}/{totals['desktops']} healthy"
+        if "rss_bytes_per_desktop" in totals:
+            line += (f", per desktop: {totals['rss_bytes_per_desktop'] / 2**20:.1f} MB RSS, "
+                     f"{totals['cpu_percent_per_desktop']:.2f}% CPU")
+        line += f", supervisor {totals['supervisor_rss_bytes'] / 2**20:.1f} MB RSS"
+        print(line)
+
+    def run(self, report_interval=30):
+        """Supervise until interrupted."""
+        self.start()
+        try:
+            while True:
+                self.drain_stats(report_interval)
+                self.check_workers()
+                self.print_health()
+        finally:
+            self.stop()
+
+
+def start_xvfb(count, first=99, geometry="1920x1080x24"):
+    """Start `count` local Xvfb displays; returns (display names, processes)."""
+    if shutil.which("Xvfb") is None:
+        raise SystemExit("Xvfb not found; install it or pass --displays")
+    displays, processes = [], []
+    for number in range(first, first + count):
+        display = f":{number}"
+        processes.append(subprocess.Popen(
+            ["Xvfb", display, "-screen", "0", geometry, "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+        displays.append(display)
+    time.sleep(1)  # Give the servers a moment to accept connections
+    return displays, processes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="mouse-mover-fleet", description="Drive many X displays from one supervisor.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--displays", nargs="+", help="existing X displays, e.g. :1 :2")
+    target.add_argument("--xvfb", type=int, metavar="N", help="start N local Xvfb displays")
+    parser.add_argument("--xvfb-first", type=int, default=99, help="first Xvfb display number")
+    parser.add_argument("--stagger", type=float, help="seconds between worker starts (default: 60 / N)")
+    parser.add_argument("--stats-interval", type=float, default=10, help="seconds between worker reports")
+    parser.add_argument("--report-interval", type=float, default=30, help="seconds between health prints")
+    parser.add_argument("--log-dir", help="write each worker's output to a log file here")
+    parser.add_argument("--cache-dir", default="~/.cache/mouse-mover/trajectories",
+                        help="shared on-disk trajectory cache ('' to disable)")
+    parser.add_argument("--trace-library", help="directory of recorded .mmtrace files to replay")
+    parser.add_argument("--rate", type=float, default=trajectory.SAMPLE_RATE,
+                        help="pointer events per second while moving (Xvfb has no real refresh rate)")
+    parser.add_argument("--max-events", type=int, default=120,
+                        help="cap on pointer events per second per desktop (0 for no cap)")
+    parser.add_argument("--max-error", type=float, default=3.0,
+                        help="pixels the pointer may lag a path by to save events (0 emits every frame)")
+    parser.add_argument("--spin", type=float, default=0.0,
+                        help="seconds each worker spins before a point deadline (default: only sleep)")
+    args = parser.parse_args(argv)
+    if args.xvfb is not None and args.xvfb < 1:
+        parser.error("--xvfb needs at least 1 display")
+
+    xvfb = []
+    displays = args.displays
+    if args.xvfb is not None:
+        displays, xvfb = start_xvfb(args.xvfb, args.xvfb_first)
+
+    pathcache.set_directory(args.cache_dir)  # inherited by every forked worker
+    # Spinning costs CPU per desktop, so fleets only sleep unless asked
+    pacing.set_pacer(pacing.Pacer(spin=args.spin))
+    trajectory.set_emission_rate(args.rate, args.max_events or None)
+    trajectory.set_max_error(args.max_error)
+    use_recorded_traces(traces.set_library(args.trace_library))
+    print(f"Starting fleet of {len(displays)} desktop(s): {' '.join(displays)}. Press Ctrl+C to stop.")
+    supervisor = FleetSupervisor(displays, stagger=args.stagger, stats_interval=args.stats_interval,
+                                 log_dir=args.log_dir)
+    try:
+        supervisor.run(args.report_interval)
+    except KeyboardInterrupt:
+        print("\n🛑 Fleet stopped by user.")
+    finally:
+        for process in xvfb:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()
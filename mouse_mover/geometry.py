@@ -0,0 +1,272 @@
+"""
+Screen geometry built from screeninfo monitors.
+
+MonitorIndex keeps one safe rectangle per monitor (the monitor shrunk by its
+margin) instead of a single bounding box, so targets never land in dead
+zones between mismatched or offset monitors. It answers point-in-monitor
+lookups, clamps points and whole paths to the nearest valid point, and
+samples random points area-weighted across monitors.
+
+MonitorWatcher rebuilds the index when the monitor layout changes: on RandR
+events when python-xlib is available, otherwise with a cheap periodic
+check. The current index is published as the module's active index, which
+path generation uses for sampling and clamping.
+
+Exclusion zones (see zones.py) set with set_exclusions() apply on top:
+sampled points avoid them and clamped paths are rerouted around them.
+
+refresh_rate() reads the monitors' refresh rate, which movements are
+emitted at.
+"""
+import random
+import threading
+import time
+from bisect import bisect_right
+
+from . import log
+from . import zones
+from ._lazy import lazy_import
+
+np = lazy_import("numpy")
+
+active = None  # MonitorIndex used by random_point() and clamp_path()
+exclusions = zones.ExclusionZones([])  # Regions random_point() and clamp_path() keep out of
+
+
+def virtual_screen(monitors):
+    """Bounding box (min_x, min_y, max_x, max_y) of all monitors."""
+    return (min(m.x for m in monitors),
+            min(m.y for m in monitors),
+            max(m.x + m.width for m in monitors),
+            max(m.y + m.height for m in monitors))
+
+
+def layout_signature(monitors):
+    """Hashable description of a monitor layout, for change detection."""
+    return tuple((m.x, m.y, m.width, m.height) for m in monitors)
+
+
+class MonitorIndex:
+    """
+    Safe rectangles of every monitor, with point lookup and clamping.
+    margins maps a monitor's name (or its position in the list) to its own
+    margin; other monitors use `margin`.
+    """
+
+    def __init__(self, monitors, margin=100, margins=None):
+        margins = margins or {}
+        rects = []
+        for i, m in enumerate(monitors):
+            edge = margins.get(getattr(m, "name", None), margins.get(i, margin))
+            # Inclusive pixel bounds of the area movements may use
+            rect = (m.x + edge, m.y + edge, m.x + m.width - edge - 1, m.y + m.height - edge - 1)
+            if rect[2] >= rect[0] and rect[3] >= rect[1]:
+                rects.append(rect)
+        if not rects:
+            raise ValueError("no monitor is larger than its margins")
+
+        self.signature = layout_signature(monitors)
+        self.rects = np.asarray(rects, dtype=float)
+        self.rects.flags.writeable = False
+        self._rects = rects  # Plain tuples for fast scalar lookups
+        # Bounding box of the safe area, as (min_x, min_y, max_x, max_y)
+        self.bounds = (min(r[0] for r in rects), min(r[1] for r in rects),
+                       max(r[2] for r in rects), max(r[3] for r in rects))
+
+        areas = [(r[2] - r[0] + 1) * (r[3] - r[1] + 1) for r in rects]
+        self._cumulative_area = list(np.cumsum(areas))
+
+    def __len__(self):
+        return len(self._rects)
+
+    def monitor_at(self, x, y):
+        """Index of the monitor whose safe area contains (x, y), or -1."""
+        for i, (x0, y0, x1, y1) in enumerate(self._rects):
+            if x0 <= x <= x1 and y0 <= y <= y1:
+                return i
+        return -1
+
+    def contains(self, x, y):
+        return self.monitor_at(x, y) >= 0
+
+    def contains_points(self, xs, ys):
+        """Boolean mask of the points inside any safe area, for coordinate arrays."""
+        inside = np.zeros(len(xs), dtype=bool)
+        for x0, y0, x1, y1 in self._rects:
+            inside |= (x0 <= xs) & (xs <= x1) & (y0 <= ys) & (ys <= y1)
+        return inside
+
+    def clamp(self, x, y):
+        """Nearest point to (x, y) inside any monitor's safe area."""
+        best = None
+        best_distance = None
+        for x0, y0, x1, y1 in self._rects:
+            cx = min(max(x, x0), x1)
+            cy = min(max(y, y0), y1)
+            distance = (cx - x) ** 2 + (cy - y) ** 2
+            if distance == 0:
+                return cx, cy
+            if best_distance is None or distance < best_distance:
+                best, best_distance = (cx, cy), distance
+        return best
+
+    def clamp_points(self, xs, ys):
+        """Vectorized clamp of coordinate arrays to the nearest safe area."""
+        x0, y0, x1, y1 = self.rects.T
+        # Candidate point on every monitor for every input point: shape (N, M)
+        cx = np.clip(xs[:, None], x0, x1)
+        cy = np.clip(ys[:, None], y0, y1)
+        nearest = ((cx - xs[:, None]) ** 2 + (cy - ys[:, None]) ** 2).argmin(axis=1)
+        rows = np.arange(len(xs))
+        return cx[rows, nearest], cy[rows, nearest]
+
+    def clamp_path(self, path):
+        """Clamp the x/y columns of a (t, x, y) path in place."""
+        if len(path) and len(self._rects) > 1:
+            path[:, 1], path[:, 2] = self.clamp_points(path[:, 1], path[:, 2])
+        elif len(path):
+            x0, y0, x1, y1 = self._rects[0]
+            np.clip(path[:, 1], x0, x1, out=path[:, 1])
+            np.clip(path[:, 2], y0, y1, out=path[:, 2])
+        return path
+
+    def random_point(self, rng=random):
+        """Uniformly random point over the safe areas of all monitors."""
+        total = self._cumulative_area[-1]
+        i = min(bisect_right(self._cumulative_area, rng.random() * total), len(self._rects) - 1)
+        x0, y0, x1, y1 = self._rects[i]
+        return rng.randint(x0, x1), rng.randint(y0, y1)
+
+
+def set_active(index):
+    """Publish the index used for sampling and clamping paths."""
+    global active
+    active = index
+
+
+def set_exclusions(rects, cell=16):
+    """Keep movements out of these (x0, y0, x1, y1) rectangles, inclusive; [] for none."""
+    global exclusions
+    exclusions = zones.ExclusionZones(rects, cell)
+    if rects:
+        log.info("🚧 Keeping out of %d exclusion zone(s)", len(exclusions))
+    return exclusions
+
+
+def random_point(min_x, min_y, max_x, max_y):
+    """Random target point: on a real monitor when an index is active, and outside exclusion zones."""
+    if active is not None:
+        sample = active.random_point
+    else:
+        def sample():
+            return random.randint(min_x, max_x - 1), random.randint(min_y, max_y - 1)
+    if not exclusions.rects:
+        return sample()
+    return exclusions.free_point(sample)
+
+
+def clamp_path(path, bounds=None):
+    """
+    Clamp a path to real monitors when an index is active, and reroute it
+    around exclusion zones without leaving the monitors (or `bounds`).
+    """
+    if active is not None:
+        active.clamp_path(path)
+    if exclusions.rects:
+        if active is not None:
+            allowed = active.contains_points
+        elif bounds is not None:
+            min_x, min_y, max_x, max_y = bounds
+
+            def allowed(xs, ys):
+                return (min_x <= xs) & (xs <= max_x) & (min_y <= ys) & (ys <= max_y)
+        else:
+            allowed = None
+        exclusions.reroute(path, allowed)
+    return path
+
+
+def refresh_rate(display_name=None):
+    """
+    Highest refresh rate in Hz among the active outputs, from their current
+    RandR modes, or None when it can't be read (no python-xlib or X server).
+    """
+    try:
+        from Xlib import display
+        connection = display.Display(display_name)
+    except Exception:
+        return None
+    try:
+        resources = connection.screen().root.xrandr_get_screen_resources()
+        modes = {mode.id: mode for mode in resources.modes}
+        rates = []
+        for crtc in resources.crtcs:
+            mode = modes.get(connection.xrandr_get_crtc_info(crtc, resources.config_timestamp).mode)
+            if mode is not None and mode.h_total and mode.v_total:
+                rates.append(mode.dot_clock / (mode.h_total * mode.v_total))
+        return round(max(rates)) if rates else None
+    except Exception:
+        return None
+    finally:
+        connection.close()
+
+
+class MonitorWatcher:
+    """
+    Keeps the active MonitorIndex in step with the monitor layout.
+    With python-xlib, a listener thread rebuilds the index on RandR screen
+    change events; otherwise maybe_refresh() re-reads the layout at most
+    once every `check_interval` seconds.
+    """
+
+    def __init__(self, margin=100, margins=None, check_interval=30, get_monitors=None):
+        if get_monitors is None:
+            from screeninfo import get_monitors
+        self._get_monitors = get_monitors
+        self.margin = margin
+        self.margins = margins
+        self.check_interval = check_interval
+        self.listening = False
+        self._last_check = time.monotonic()
+        self.index = MonitorIndex(get_monitors(), margin, margins)
+        set_active(self.index)
+
+    def start(self, display_name=None):
+        """Listen for RandR changes if possible; returns self."""
+        try:
+            from Xlib import display
+            from Xlib.ext import randr
+            connection = display.Display(display_name)
+            if not connection.has_extension("RANDR"):
+                raise OSError("X server has no RandR extension")
+            connection.screen().root.xrandr_select_input(randr.RRScreenChangeNotifyMask)
+            connection.flush()
+        except Exception as e:
+            log.warning("RandR events unavailable (%s), checking monitors every %ss", e, self.check_interval)
+            return self
+
+        def listen():
+            while True:
+                connection.next_event()  # Only RandR events are selected
+                self.refresh()
+
+        threading.Thread(target=listen, name="randr-watcher", daemon=True).start()
+        self.listening = True
+        return self
+
+    def refresh(self):
+        """Re-read the monitor layout; rebuild the index if it changed."""
+        self._last_check = time.monotonic()
+        monitors = self._get_monitors()
+        if layout_signature(monitors) == self.index.signature:
+            return False
+        self.index = MonitorIndex(monitors, self.margin, self.margins)
+        set_active(self.index)
+        log.info("🖥️  Monitor layout changed: %d monitor(s), bounds %s", len(self.index), self.index.bounds)
+        return True
+
+    def maybe_refresh(self):
+        """Cheap check for callers without RandR events; call between movements."""
+        if self.listening or time.monotonic() - self._last_check < self.check_interval:
+            return False
+        return self.refresh()
@@ -0,0 +1,69 @@
+"""
+System idle time sources for economy mode.
+
+Economy mode only moves the pointer when the session is about to go idle,
+so it needs to know how long the system has been idle:
+
+- XScreenSaverIdle: the X server's own idle counter (MIT-SCREEN-SAVER
+  extension via python-xlib), reset by any input including our injections.
+- StubIdleSource: idle time since the last reset() on a given clock, for
+  tests and headless runs. start() makes our own injections reset it, like
+  they reset the real counter.
+"""
+import time
+
+from . import log
+from . import trajectory
+
+
+class XScreenSaverIdle:
+    """Idle time reported by the X server's screen saver extension."""
+
+    def __init__(self, display_name=None):
+        from Xlib import display
+        self.display = display.Display(display_name)
+        if not self.display.has_extension("MIT-SCREEN-SAVER"):
+            raise OSError("X server has no MIT-SCREEN-SAVER extension")
+        self._root = self.display.screen().root
+
+    def idle_seconds(self):
+        return self._root.screensaver_query_info().idle / 1000
+
+    def close(self):
+        self.display.close()
+
+
+class StubIdleSource:
+    """
+    Idle time measured from the last reset() on `clock` (seconds).
+    Pass the event loop's time for virtual-clock runs.
+    """
+
+    def __init__(self, clock=time.monotonic, idle=0.0):
+        self.clock = clock
+        self._last_input = clock() - idle
+
+    def idle_seconds(self):
+        return self.clock() - self._last_input
+
+    def reset(self, x=None, y=None):
+        """Record input now; also usable as a trajectory injection hook."""
+        self._last_input = self.clock()
+
+    def start(self):
+        """Count our own injected points as input; returns self."""
+        trajectory.injection_hooks.append(self.reset)
+        return self
+
+    def close(self):
+        if self.reset in trajectory.injection_hooks:
+            trajectory.injection_hooks.remove(self.reset)
+
+
+def open_idle_source(display_name=None):
+    """XScreenSaver idle time where available, else None."""
+    try:
+        return XScreenSaverIdle(display_name)
+    except Exception as e:
+        log.warning("System idle time unavailable (%s)", e)
+        return None
@@ -0,0 +1,251 @@
+"""
+Non-blocking logging for the mover.
+
+A log call only stores a record in a preallocated ring buffer; a background
+writer thread formats and writes the records out a few times a second, so a
+slow stdout (a full pipe, journald) stalls the writer and never a movement.
+Messages are %-formatted by the writer too: pass arguments instead of
+building an f-string on hot paths.
+
+    log.info("Performing %s...", name, movement=name)
+
+Keyword fields only show in JSON output, one object per line with the time,
+level and message. Text output is the bare message, as print() gave.
+
+The ring keeps the latest records at every level, including those below the
+output level, and dump() writes them all to stderr; install_dump_signal()
+does that on SIGUSR1. Should the writer fall a whole ring behind, the oldest
+records are lost and a line says how many.
+"""
+import atexit
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR}
+LEVEL_NAMES = {level: name for name, level in LEVELS.items()}
+
+_now = time.time
+
+
+class RingLogger:
+    """
+    Log records kept in a ring of `capacity` slots and written by a thread.
+    level: lowest level written out
+    capture: lowest level kept in the ring (for dumps)
+    json_output: write JSON lines instead of bare messages
+    stream: file to write to; None looks up sys.stdout at every write
+    interval: seconds between the writer's passes
+    """
+
+    def __init__(self, capacity=4096, level=INFO, capture=DEBUG, json_output=False, stream=None,
+                 interval=0.1):
+        self.capacity = capacity
+        self.level = level
+        self.capture = capture
+        self.json_output = json_output
+        self.stream = stream
+        self.interval = interval
+        self.dropped = 0  # records overwritten before the writer got to them
+        self._ring = [None] * capacity
+        self._sequence = itertools.count()  # next() is atomic, so producers need no lock
+        self._next = 0  # sequence number the writer writes next
+        self._thread = None
+        self._reset_threading()
+
+    def _reset_threading(self):
+        """Fresh writer state, also for a forked child where the thread is gone."""
+        self._thread = None
+        self._drain_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._dump_requested = False
+
+    def _store(self, level, message, args, fields):
+        """Put a record in the ring; formatting and output happen on the writer thread."""
+        if level < self.capture:
+            return
+        sequence = next(self._sequence)
+        self._ring[sequence % self.capacity] = (sequence, _now(), level, message, args, fields)
+        if self._thread is None:
+            self.start()
+
+    def log(self, level, message, *args, **fields):
+        self._store(level, message, args, fields)
+
+    def debug(self, message, *args, **fields):
+        self._store(DEBUG, message, args, fields)
+
+    def info(self, message, *args, **fields):
+        self._store(INFO, message, args, fields)
+
+    def warning(self, message, *args, **fields):
+        self._store(WARNING, message, args, fields)
+
+    def error(self, message, *args, **fields):
+        self._store(ERROR, message, args, fields)
+
+    def start(self):
+        """Start the writer thread (the first log call does this too)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Write out what is left and stop the writer thread."""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._stopping = True
+            self._wake.set()
+            thread.join(timeout=1)
+        self.flush()
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+            if self._dump_requested:
+                self._dump_requested = False
+                self.dump()
+
+    def _pending(self):
+        """Records not written yet, oldest first, counting any that were overwritten."""
+        records = []
+        while True:
+            record = self._ring[self._next % self.capacity]
+            if record is None or record[0] < self._next:
+                # Not stored yet: that and anything after it waits for the next pass
+                return records
+            if record[0] > self._next:
+                # Lapped: carry on from the oldest record still in the ring
+                oldest = min(r[0] for r in list(self._ring) if r is not None and r[0] >= self._next)
+                self.dropped += oldest - self._next
+                records.append((oldest, record[1], WARNING, "⚠️  %d log record(s) dropped",
+                                (oldest - self._next,), {}))
+                self._next = oldest
+                continue
+            records.append(record)
+            self._next += 1
+
+    def flush(self):
+        """Write out every record stored so far; safe from any thread."""
+        with self._drain_lock:
+            lines = [self.format(record) for record in self._pending() if record[2] >= self.level]
+            if lines:
+                stream = self.stream or sys.stdout
+                try:
+                    stream.write("\n".join(lines) + "\n")
+                    stream.flush()
+                except (OSError, ValueError):
+                    pass  # Closed or broken output; the ring still has the records
+
+    def format(self, record, text_prefix=False):
+        """One output line for a record."""
+        _, stamp, level, message, args, fields = record
+        if args:
+            try:
+                message = message % args
+            except (TypeError, ValueError):
+                message = f"{message} {args!r}"
+        if self.json_output:
+            return json.dumps({"time": stamp, "level": LEVEL_NAMES.get(level, level), "message": message,
+                               **fields}, ensure_ascii=False, default=str)
+        if text_prefix:
+            clock = time.strftime("%H:%M:%S", time.localtime(stamp))
+            return f"{clock}.{int(stamp * 1000) % 1000:03d} {LEVEL_NAMES.get(level, level):<7} {message}"
+        return message
+
+    def recent(self):
+        """Every record still in the ring, oldest first."""
+        return sorted(record for record in list(self._ring) if record is not None)
+
+    def dump(self, stream=None):
+        """Write the whole ring, at every level, to stream (default stderr)."""
+        stream = stream or sys.stderr
+        records = self.recent()
+        lines = [f"---- last {len(records)} log record(s) ----"]
+        lines += [self.format(record, text_prefix=True) for record in records]
+        lines.append("---- end of log dump ----")
+        try:
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
+        except (OSError, ValueError):
+            pass
+
+    def request_dump(self):
+        """Have the writer dump the ring on its next pass; safe in a signal handler."""
+        self._dump_requested = True
+        if self._thread is None:
+            self.start()
+
+
+default_logger = RingLogger()
+
+
+def set_logger(logger):
+    """Send all logging to this logger, flushing the old one first."""
+    global default_logger
+    default_logger.stop()
+    default_logger = logger
+
+
+def get_logger():
+    return default_logger
+
+
+def configure(level="info", json_output=False, capacity=None):
+    """Replace the default logger with one at this level name, writing JSON lines or text."""
+    set_logger(RingLogger(capacity or default_logger.capacity, LEVELS[level], json_output=json_output))
+
+
+def debug(message, *args, **fields):
+    default_logger._store(DEBUG, message, args, fields)
+
+
+def info(message, *args, **fields):
+    default_logger._store(INFO, message, args, fields)
+
+
+def warning(message, *args, **fields):
+    default_logger._store(WARNING, message, args, fields)
+
+
+def error(message, *args, **fields):
+    default_logger._store(ERROR, message, args, fields)
+
+
+def flush():
+    """Write out everything logged so far, e.g. before printing directly."""
+    default_logger.flush()
+
+
+def install_dump_signal(signum=None):
+    """Dump the recent history on a signal (SIGUSR1 by default; not on Windows)."""
+    import signal
+    signum = signum or getattr(signal, "SIGUSR1", None)
+    if signum is not None:
+        signal.signal(signum, lambda number, frame: default_logger.request_dump())
+    return signum
+
+
+atexit.register(lambda: default_logger.stop())
+
+
+def _after_fork():
+    # The writer thread doesn't survive a fork and the parent already wrote
+    # what was pending, so the child starts afresh
+    default_logger._reset_threading()
+    default_logger._pending()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=flush, after_in_child=_after_fork)
@@ -0,0 +1,276 @@
+"""
+Runtime metrics for the mover process.
+
+A small registry of counters, gauges and histograms, cheap enough to update
+on the hot path: recording is a list index or attribute add with no locks,
+well under a microsecond. Updates come almost entirely from a single thread,
+so the rare lost increment from a concurrent update is accepted.
+
+The registry renders as Prometheus text (served on a localhost port or a
+Unix socket) and as a JSON snapshot that can be written periodically.
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# Seconds; covers sub-millisecond detection up to multi-second overruns
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+
+    def labels(self, *values):
+        """Child metric for these label values; cache it on hot paths."""
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _series(self):
+        """(label values, metric) pairs to render."""
+        if self.labelnames:
+            return list(self._children.items())
+        return [((), self)]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for values, metric in self._series():
+            lines.extend(metric._render_samples(self.name, self.labelnames, values))
+        return lines
+
+    def snapshot(self):
+        if self.labelnames:
+            return {",".join(values): metric._value_snapshot() for values, metric in self._series()}
+        return self._value_snapshot()
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        super().__init__(name, help, labelnames)
+        self.value = 0
+
+    def _new_child(self):
+        return Counter(self.name, self.help)
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def total(self):
+        """Sum over every label combination, or the value when unlabelled."""
+        if self.labelnames:
+            return sum(child.value for child in self._children.values())
+        return self.value
+
+    def _render_samples(self, name, labelnames, values):
+        return [f"{name}{_format_labels(labelnames, values)} {self.value}"]
+
+    def _value_snapshot(self):
+        return self.value
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, optionally read from a callback."""
+    kind = "gauge"
+
+    def __init__(self, name, help, labelnames=(), function=None):
+        super().__init__(name, help, labelnames)
+        self.value = 0.0
+        self.function = function
+
+    def _new_child(self):
+        return Gauge(self.name, self.help)
+
+    def set(self, value):
+        self.value = value
+
+    def get(self):
+        return self.function() if self.function is not None else self.value
+
+    def _render_samples(self, name, labelnames, values):
+        return [f"{name}{_format_labels(labelnames, values)} {self.get()}"]
+
+    def _value_snapshot(self):
+        return self.get()
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed upper-bound buckets."""
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+
+    def _new_child(self):
+        return Histogram(self.name, self.help, buckets=self.buckets)
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def _render_samples(self, name, labelnames, values):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f"{name}_bucket{_format_labels(labelnames, values, [('le', le)])} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labelnames, values)} {self.sum}")
+        lines.append(f"{name}_count{_format_labels(labelnames, values)} {cumulative}")
+        return lines
+
+    def _value_snapshot(self):
+        return {"count": self.count, "sum": self.sum,
+                "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], self.counts))}
+
+
+class Registry:
+    """Named collection of metrics."""
+
+    def __init__(self):
+        self.metrics = {}
+
+    def _add(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"metric {metric.name} already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self._add(Counter(name, help, labelnames))
+
+    def gauge(self, name, help, labelnames=(), function=None):
+        return self._add(Gauge(name, help, labelnames, function))
+
+    def histogram(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def render_prometheus(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """All metrics as a JSON-serialisable dict."""
+        return {"timestamp": time.time(),
+                "metrics": {name: metric.snapshot() for name, metric in self.metrics.items()}}
+
+
+REGISTRY = Registry()
+
+# Metrics recorded by the mover itself
+MOVEMENTS = REGISTRY.counter("mouse_mover_movements_total", "Movements and breaks performed", ("movement",))
+MOOD_SECONDS = REGISTRY.counter("mouse_mover_mood_seconds_total", "Time spent in each mood", ("mood",))
+MOOD_WINDOW_ERROR = REGISTRY.histogram("mouse_mover_mood_window_error_seconds",
+                                       "How far a mood's time differed from its planned length")
+INJECTED_EVENTS = REGISTRY.counter("mouse_mover_injected_events_total", "Pointer events injected")
+INTERRUPTIONS = REGISTRY.counter("mouse_mover_interruptions_total", "User movements that interrupted the mover")
+DETECTION_LATENCY = REGISTRY.histogram("mouse_mover_detection_latency_seconds",
+                                       "Delay from a user pointer event to the user-active signal")
+PREEMPTION_LATENCY = REGISTRY.histogram("mouse_mover_preemption_latency_seconds",
+                                        "Delay from a cancel request to a movement giving up the pointer")
+SLEEP_OVERSHOOT = REGISTRY.histogram("mouse_mover_sleep_overshoot_seconds",
+                                     "How late the pacer woke up for a deadline")
+PACER_SPIN_SECONDS = REGISTRY.counter("mouse_mover_pacer_spin_seconds_total",
+                                      "CPU time spent spinning for exact deadlines")
+PATH_CACHE = REGISTRY.counter("mouse_mover_path_cache_total",
+                              "Base trajectory lookups, by where the path came from", ("source",))
+POSITION_READS = REGISTRY.counter("mouse_mover_position_reads_total",
+                                  "Pointer position reads, by where the answer came from", ("source",))
+COALESCED_POINTS = REGISTRY.counter("mouse_mover_coalesced_points_total",
+                                    "Path points not injected: merged into a frame, thinned or skipped as overdue")
+PEAK_EVENT_RATE = REGISTRY.gauge("mouse_mover_peak_events_per_second",
+                                 "Most events injected within one second, by movement", ("movement",))
+CONTROL_COMMANDS = REGISTRY.counter("mouse_mover_control_commands_total",
+                                    "Commands carried out from the control socket", ("command",))
+ECONOMY_SAVED_EVENTS = REGISTRY.gauge("mouse_mover_economy_saved_events",
+                                      "Estimated injected events economy mode saved over continuous mode")
+LOOP_CPU = REGISTRY.gauge("mouse_mover_cpu_seconds", "Process CPU time used", function=time.process_time)
+
+
+def _respond_http(handler):
+    body = handler.registry.render_prometheus().encode()
+    handler.send_response(200)
+    handler.send_header("Content-Type", "text/plain; version=0.0.4")
+    handler.send_header("Content-Length", str(len(body)))
+    handler.end_headers()
+    handler.wfile.write(body)
+
+
+def _respond_unix(handler):
+    try:
+        handler.wfile.write(handler.registry.render_prometheus().encode())
+    except ConnectionError:
+        pass  # hung up without reading, e.g. another mover checking the socket is live
+
+
+def serve_prometheus(port=9464, host="127.0.0.1", unix_socket=None, registry=REGISTRY):
+    """
+    Serve the registry from a daemon thread: over HTTP on host:port, or as
+    plain text to anyone connecting to unix_socket. Returns the server.
+    Raises OSError if the port or socket path is taken.
+    """
+    # Imported here so the server modules stay out of startup
+    import socketserver
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    if unix_socket is not None:
+        from ._sockets import remove_stale_socket
+        remove_stale_socket(unix_socket)
+        handler = type("Handler", (socketserver.StreamRequestHandler,),
+                       {"registry": registry, "handle": _respond_unix})
+        server = socketserver.ThreadingUnixStreamServer(unix_socket, handler)
+    else:
+        handler = type("Handler", (BaseHTTPRequestHandler,),
+                       {"registry": registry, "do_GET": _respond_http,
+                        "log_message": lambda self, format, *args: None})  # Keep scrapes out of the console
+        server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+
+def write_snapshot(path, registry=REGISTRY):
+    """Atomically write a JSON snapshot of the registry to path."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(registry.snapshot(), f)
+    os.replace(tmp, path)
+
+
+def start_snapshots(path, interval=60, registry=REGISTRY):
+    """Write a JSON snapshot every `interval` seconds from a daemon thread."""
+    stop = threading.Event()
+
+    def loop():
+        while not stop.wait(interval):
+            write_snapshot(path, registry)
+
+    threading.Thread(target=loop, name="metrics-snapshots", daemon=True).start()
+    return stop
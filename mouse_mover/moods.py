@@ -0,0 +1,69 @@
+"""Mood definitions shared by the single-desktop app and fleet workers."""
+from . import movements
+
+# Mood definitions with weighted movement selections
+MOODS = {
+    "hyperactive": {
+        "name": "🚀 HYPERACTIVE",
+        "movements": {
+            movements.frantic_corner_search: 20,
+            movements.aggressive_zigzag: 18,
+            movements.big_fast_sweeping: 15,
+            movements.angry_shaking: 12,
+            movements.upward_jabbing: 10,
+            movements.frustrated_scribbling: 10,
+            movements.short_fast_jiggle: 8,
+            movements.zigzag_pattern: 5,
+            movements.quick_short_break: 2
+        }
+    },
+    "normal": {
+        "name": "😌 NORMAL",
+        "movements": {
+            movements.s_curve_movement: 15,
+            movements.circular_movement: 15,
+            movements.natural_drift_movement: 15,
+            movements.random_point_movement: 12,
+            movements.figure8_movement: 10,
+            movements.big_slow_move: 10,
+            movements.zigzag_pattern: 8,
+            movements.short_fast_jiggle: 8,
+            movements.take_a_break: 7
+        }
+    },
+    "drowsy": {
+        "name": "😴 DROWSY",
+        "movements": {
+            movements.big_slow_move: 25,
+            movements.s_curve_movement: 20,
+            movements.natural_drift_movement: 15,
+            movements.take_a_break: 15,
+            movements.long_lazy_break: 10,
+            movements.circular_movement: 8,
+            movements.random_point_movement: 5,
+            movements.figure8_movement: 2
+        }
+    }
+}
+
+# Weight of the recorded_trace movement per mood; it only joins these moods
+# once a trace library with something to replay is loaded (use_recorded_traces())
+RECORDED_TRACE_WEIGHTS = {"normal": 10, "drowsy": 10}
+
+# Mood-to-mood transition weights, e.g. {"drowsy": {"normal": 3, "drowsy": 1}}.
+# Moods left out here switch to any mood with equal probability.
+MOOD_TRANSITIONS = {}
+
+
+def use_recorded_traces(library):
+    """
+    Add recorded_trace to the moods in RECORDED_TRACE_WEIGHTS if library
+    (traces.set_library()'s result) has traces to replay; otherwise leave
+    it out, so the moods keep their hand-made mix.
+    """
+    for name, weight in RECORDED_TRACE_WEIGHTS.items():
+        table = MOODS[name]["movements"]
+        if library is not None and library.files:
+            table[movements.recorded_trace] = weight
+        else:
+            table.pop(movements.recorded_trace, None)
@@ -0,0 +1,549 @@
+import random
+import math
+from . import geometry
+from . import log
+from . import pacing
+from . import pathcache
+from . import registry
+from . import synthesis
+from . import traces
+from . import trajectory
+from ._lazy import lazy_import
+
+np = lazy_import("numpy")
+
+# Each movement is split in two: a *_path generator that builds the whole
+# (t, x, y) path up front, and the movement itself, which replays it through
+# the trajectory engine. Coordinates passed should already have margins
+# applied to avoid PyAutoGUI fail-safe. Random targets come from
+# geometry.random_point() and every built path is clamped onto a real monitor,
+# so nothing lands in the gaps between mismatched monitors.
+#
+# The parametric movements (S-curve, circle, figure-8, sweeps) build their
+# base shape once per screen layout through pathcache and randomise each
+# call with cheap transforms of the cached path. Point-to-point movements
+# (drift, jiggles, random and slow moves) ask synthesis for human-like reaches
+# with minimum-jerk timing, curvature, overshoot and tremor.
+#
+# Every movement and break takes an optional trajectory.CancelToken; when it
+# is cancelled the movement stops before its next point and raises
+# trajectory.MovementInterrupted.
+
+def _randomized(base, start, approach_duration, pause, reshape=True):
+    """
+    Cached base path with a random tempo (and, with reshape, a random size
+    and position), reached from `start` and begun after `pause` seconds.
+    """
+    offset, scale = (0.0, 0.0), 1.0
+    if reshape:
+        offset = (random.uniform(-20, 20), random.uniform(-20, 20))
+        scale = random.uniform(0.9, 1.1)
+    shape = pathcache.transform(base, offset, scale, time_scale=random.uniform(0.85, 1.15),
+                                warp=random.uniform(0.85, 1.15), delay=pause)
+    return pathcache.concat([pathcache.approach(start, shape[0, 1:], approach_duration), shape])
+
+def _through(waypoints, durations, pauses):
+    """Unclamped base path starting on the first waypoint and moving through the rest."""
+    path = trajectory.PathBuilder(waypoints[0])
+    for (x, y), duration, pause in zip(waypoints[1:], durations, pauses):
+        path.move_to(x, y, duration)
+        if pause:
+            path.pause(pause)
+    first = np.array([[0.0, waypoints[0][0], waypoints[0][1]]])
+    return np.vstack((first, path.points()))
+
+def zigzag_path(min_x, min_y, max_x, max_y, start):
+    """Path for zigzag_pattern: 20 left-right passes down the screen in 5 seconds."""
+    # Calculate the step size for moving down
+    screen_height = max_y - min_y
+    step_size = screen_height // 20  # Divide screen into 20 horizontal bands
+
+    target_duration = 5.0  # 5 seconds total
+    iterations = 20
+    iteration_duration = target_duration / (iterations * 2)  # 2 moves per iteration
+
+    path = trajectory.PathBuilder(start)
+    for i in range(iterations):
+        current_y = min(min_y + (i * step_size), max_y - 1)
+        path.move_to(min_x, current_y, iteration_duration)  # Left side
+        path.move_to(max_x, current_y, iteration_duration)  # Right side
+    return path.build(min_x, min_y, max_x, max_y)
+
+def zigzag_pattern(min_x, min_y, max_x, max_y, token=None):
+    """
+    Performs a rapid zigzag movement pattern across the screen.
+    Moves left-right repeatedly while going down the screen.
+    Completes 20 iterations in 5 seconds.
+    """
+    log.info("Performing zigzag pattern...")
+    path = zigzag_path(min_x, min_y, max_x, max_y, trajectory.position())
+    elapsed_time = trajectory.replay(path, token)
+    log.info("Zigzag pattern completed in %.2f seconds", elapsed_time)
+
+# The base paths below are cached on disk: changing what they return needs
+# a bump of pathcache.CACHE_VERSION
+
+def _s_curve_base(min_x, min_y, max_x, max_y):
+    """S-curve waypoints at their mean timing."""
+    # Calculate center point and start/end positions
+    center_y = (min_y + max_y) // 2
+    start_x, start_y = min_x + 50, center_y - 100
+    end_x, end_y = max_x - 50, center_y + 100
+
+    # Create S-curve with multiple waypoints
+    steps = 8
+    progress = np.linspace(0, 1, steps + 1)
+    xs = start_x + (end_x - start_x) * progress
+    y_offset = 80 * (2 * progress - 1) * (1 - progress) * progress  # Creates S shape
+    ys = start_y + (end_y - start_y) * progress + y_offset
+
+    # Vary duration to simulate human acceleration/deceleration
+    durations = [0.15 if i < len(xs) // 2 else 0.25 for i in range(1, len(xs))]  # Speed up, then slow down
+    waypoints = list(zip(xs.astype(int), ys.astype(int)))
+    return _through(waypoints, durations, [0.1] * len(durations))
+
+def s_curve_path(min_x, min_y, max_x, max_y, start):
+    """Path for s_curve_movement."""
+    base = pathcache.default_cache.get(("s_curve", trajectory.frame_rate(), min_x, min_y, max_x, max_y),
+                                       lambda: _s_curve_base(min_x, min_y, max_x, max_y))
+    # Start slow, with a small random pause on each waypoint
+    path = _randomized(base, start, 0.3, random.uniform(0.05, 0.15))
+    return trajectory.fit(path, min_x, min_y, max_x, max_y)
+
+def s_curve_movement(min_x, min_y, max_x, max_y, token=None):
+    """
+    Performs a gentle S-curve movement across the screen with variable speeds.
+    """
+    log.info("Performing S-curve movement...")
+    trajectory.replay(s_curve_path(min_x, min_y, max_x, max_y, trajectory.position()), token)
+
+def _circle_base(min_x, min_y, max_x, max_y):
+    """Circle around the screen center at its mean timing."""
+    # Calculate center point for circular movements
+    center_x = (min_x + max_x) // 2
+    center_y = (min_y + max_y) // 2
+
+    radius = min(200, (max_x - min_x) // 6)  # Adjust radius to screen size
+    circle_steps = 16
+
+    angles = np.arange(circle_steps) / circle_steps * 2 * math.pi
+    xs = center_x + (radius * np.cos(angles)).astype(int)
+    ys = center_y + (radius * np.sin(angles)).astype(int)
+    return _through(list(zip(xs, ys)), [0.175] * (circle_steps - 1), [0.05] * (circle_steps - 1))
+
+def circular_path(min_x, min_y, max_x, max_y, start):
+    """Path for circular_movement."""
+    base = pathcache.default_cache.get(("circular", trajectory.frame_rate(), min_x, min_y, max_x, max_y),
+                                       lambda: _circle_base(min_x, min_y, max_x, max_y))
+    path = _randomized(base, start, random.uniform(0.1, 0.25), random.uniform(0.02, 0.08))
+    # Bounds are enforced for the whole path at once
+    return trajectory.fit(path, min_x, min_y, max_x, max_y)
+
+def circular_movement(min_x, min_y, max_x, max_y, token=None):
+    """
+    Performs smooth circular motion around the center of the screen.
+    """
+    log.info("Performing circular movement...")
+    trajectory.replay(circular_path(min_x, min_y, max_x, max_y, trajectory.position()), token)
+
+def _figure8_base(min_x, min_y, max_x, max_y):
+    """Figure-8 around the screen center at its mean timing."""
+    # Calculate center point
+    center_x = (min_x + max_x) // 2
+    center_y = (min_y + max_y) // 2
+
+    figure8_steps = 20
+    scale = min(150, (max_x - min_x) // 8)
+
+    t = np.arange(figure8_steps) / figure8_steps * 4 * math.pi  # Two complete loops
+    # Figure-8 parametric equations
+    xs = center_x + (scale * np.sin(t)).astype(int)
+    ys = center_y + (scale * np.sin(t) * np.cos(t)).astype(int)
+    return _through(list(zip(xs, ys)), [0.14] * (figure8_steps - 1), [0.03] * (figure8_steps - 1))
+
+def figure8_path(min_x, min_y, max_x, max_y, start):
+    """Path for figure8_movement."""
+    base = pathcache.default_cache.get(("figure8", trajectory.frame_rate(), min_x, min_y, max_x, max_y),
+                                       lambda: _figure8_base(min_x, min_y, max_x, max_y))
+    path = _randomized(base, start, random.uniform(0.08, 0.2), random.uniform(0.01, 0.05))
+    return trajectory.fit(path, min_x, min_y, max_x, max_y)
+
+def figure8_movement(min_x, min_y, max_x, max_y, token=None):
+    """
+    Performs a figure-8 pattern using parametric equations.
+    """
+    log.info("Performing figure-8 movement...")
+    trajectory.replay(figure8_path(min_x, min_y, max_x, max_y, trajectory.position()), token)
+
+def natural_drift_path(min_x, min_y, max_x, max_y, start):
+    """Path for natural_drift_movement."""
+    current_x, current_y = start
+    targets, durations, pauses = [], [], []
+    for _ in range(8):
+        # Small drift movement
+        drift_x = random.randint(-100, 100)
+        drift_y = random.randint(-80, 80)
+
+        # The walk depends on where the previous step was clamped to
+        current_x = max(min_x, min(max_x, current_x + drift_x))
+        current_y = max(min_y, min(max_y, current_y + drift_y))
+
+        # Main movement
+        targets.append((current_x, current_y))
+        durations.append(random.uniform(0.3, 0.8))
+        pauses.append(0.0)
+
+        # Micro-correction (like humans do)
+        micro_x = random.randint(-15, 15)
+        micro_y = random.randint(-15, 15)
+
+        current_x = max(min_x, min(max_x, current_x + micro_x))
+        current_y = max(min_y, min(max_y, current_y + micro_y))
+
+        targets.append((current_x, current_y))
+        durations.append(random.uniform(0.1, 0.3))
+        pauses.append(random.uniform(0.2, 0.6))
+
+    # Every drift and correction synthesized in one batch
+    starts = [start] + targets[:-1]
+    batch = synthesis.reach(starts, targets, durations, overshoot=0.0, tremor=0.5)
+    parts = []
+    for i, pause in enumerate([0.0] + pauses[:-1]):
+        part = batch.path(i)
+        part[:, 0] += pause  # hold the previous point before moving on
+        parts.append(part)
+    path = pathcache.concat(parts)
+    return trajectory.fit(path, min_x, min_y, max_x, max_y)
+
+def natural_drift_movement(min_x, min_y, max_x, max_y, token=None):
+    """
+    Performs random natural drift movements with micro-corrections,
+    simulating natural human hand movement and adjustments.
+    """
+    log.info("Performing natural drift movements...")
+    trajectory.replay(natural_drift_path(min_x, min_y, max_x, max_y, trajectory.position()), token)
+
+def big_slow_path(min_x, min_y, max_x, max_y, start):
+    """Path for big_slow_move."""
+    target = geometry.random_point(min_x, min_y, max_x, max_y)
+    path = synthesis.reach_path(start, target, random.uniform(1.5, 4.0), (min_x, min_y, max_x, max_y))
+    return trajectory.fit(path, min_x, min_y, max_x, max_y)
+
+def big_slow_move(min_x, min_y, max_x, max_y, token=None):
+    """Moves the mouse across a long distance over a few seconds."""
+    log.info("Performing big slow move...")
+    trajectory.replay(big_slow_path(min_x, min_y, max_x, max_y, trajectory.position()), token)
+
+def short_fast_jiggle_path(min_x, min_y, max_x, max_y, start):
+    """Path for short_fast_jiggle."""
+    current_x, current_y = start
+    # Calculate a small jiggle range, ensuring it stays within bounds
+    jiggle_x = max(min_x, min(max_x - 1, random.randint(current_x - 50, current_x + 50)))
+    jiggle_y = max(min_y, min(max_y - 1, random.randint(current_y - 50, current_y + 50)))
+    path = synthesis.reach_path(start, (jiggle_x, jiggle_y), random.uniform(0.1, 0.4),
+                                (min_x, min_y, max_x, max_y), overshoot=0.0)
+    return trajectory.fit(path, min_x, min_y, max_x, max_y)
+
+def short_fast_jiggle(min_x, min_y, max_x, max_y, token=None):
+    """Moves the mouse a short distance very quickly."""
+    log.info("Performing short fast jiggle...")
+    trajectory.replay(short_fast_jiggle_path(min_x, min_y, max_x, max_y, trajectory.position()), token)
+
+def _take_break(break_function, token):
+    """Sleep for a random duration from the break's range in BREAKS."""
+    label, min_seconds, max_seconds = BREAKS[break_function]
+    sleep_time = random.uniform(min_seconds, max_seconds)
+    log.info("%s for %.2f seconds", label, sleep_time)
+    if pacing.get_pacer().sleep(sleep_time, token):
+        raise token.interrupted()
+
+def take_a_break(token=None):
+    """Do nothing for a while."""
+    _take_break(take_a_break, token)
+
+def quick_short_break(token=None):
+    """Take a very short break."""
+    _take_break(quick_short_break, token)
+
+def long_lazy_break(token=None):
+    """Take a longer, lazy break."""
+    _take_break(long_lazy_break, token)
+
+def random_point_path(min_x, min_y, max_x, max_y, start):
+    """Path for random_point_movement."""
+    target = geometry.random_point(min_x, min_y, max_x, max_y)
+    path = synthesis.reach_path(start, target, random.uniform(0.3, 1.2), (min_x, min_y, max_x, max_y))
+    return trajectory.fit(path, min_x, min_y, max_x, max_y)
+
+def random_point_movement(min_x, min_y, max_x, max_y, token=None):
+    """Move to a random point on screen with random duration."""
+    log.info("Moving to random point...")
+    trajectory.replay(random_point_path(min_x, min_y, max_x, max_y, trajectory.position()), token)
+
+def recorded_trace_path(min_x, min_y, max_x, max_y, start):
+    """Path for recorded_trace: a few seconds of a real recorded trace."""
+    if traces.library is None or not traces.library.files:
+        # No recordings to draw from; drift is the closest hand-made motion
+        return natural_drift_path(min_x, min_y, max_x, max_y, start)
+    segment = traces.library.segment(random.uniform(3, 8), (min_x, min_y, max_x, max_y))
+    path = pathcache.concat([pathcache.approach(start, segment[0, 1:], random.uniform(0.2, 0.5)), segment])
+    return trajectory.fit(path, min_x, min_y, max_x, max_y)
+
+def recorded_trace(min_x, min_y, max_x, max_y, token=None):
+    """
+    Replays a stretch of real human pointer motion from the trace library,
+    rescaled to the screen. Falls back to natural drift without a library.
+    """
+    log.info("Replaying recorded trace...")
+    trajectory.replay(recorded_trace_path(min_x, min_y, max_x, max_y, trajectory.position()), token)
+
+# === AGGRESSIVE MOVEMENT FUNCTIONS ===
+
+def _sweep_patterns(min_x, min_y, max_x, max_y):
+    """Waypoints of every sweeping pattern."""
+    return [
+        # Diagonal sweeps
+        [(min_x, min_y), (max_x - 1, max_y - 1)],  # Top-left to bottom-right
+        [(max_x - 1, min_y), (min_x, max_y - 1)],  # Top-right to bottom-left
+        [(min_x, max_y - 1), (max_x - 1, min_y)],  # Bottom-left to top-right
+        [(max_x - 1, max_y - 1), (min_x, min_y)],  # Bottom-right to top-left
+
+        # Horizontal sweeps
+        [(min_x, (min_y + max_y) // 2), (max_x - 1, (min_y + max_y) // 2)],  # Left to right
+        [(max_x - 1, (min_y + max_y) // 2), (min_x, (min_y + max_y) // 2)],  # Right to left
+
+        # Vertical sweeps
+        [((min_x + max_x) // 2, min_y), ((min_x + max_x) // 2, max_y - 1)],  # Top to bottom
+        [((min_x + max_x) // 2, max_y - 1), ((min_x + max_x) // 2, min_y)],  # Bottom to top
+
+        # Arc sweeps
+        [(min_x, min_y), ((min_x + max_x) // 2, max_y - 1), (max_x - 1, min_y)],  # Arc sweep
+        [(max_x - 1, max_y - 1), ((min_x + max_x) // 2, min_y), (min_x, max_y - 1)],  # Reverse arc
+    ]
+
+def _sweep_base(pattern):
+    """One sweep through its pattern at mean timing, with the pause before the next sweep."""
+    moves = len(pattern) - 1
+    # Very fast sweeping motion with very brief pauses between segments
+    pauses = [0.035] * (moves - 1) + [0.15]  # Brief pause between complete sweeps
+    return _through(pattern, [0.115] * moves, pauses)
+
+def big_fast_sweeping_path(min_x, min_y, max_x, max_y, start):
+    """Path for big_fast_sweeping."""
+    patterns = _sweep_patterns(min_x, min_y, max_x, max_y)
+
+    # Perform 3-5 random sweeping movements
+    num_sweeps = random.randint(3, 5)
+
+    parts = []
+    position = start
+    for _ in range(num_sweeps):
+        index = random.randrange(len(patterns))
+        key = ("big_fast_sweeping", trajectory.frame_rate(), min_x, min_y, max_x, max_y, index)
+        base = pathcache.default_cache.get(key, lambda: _sweep_base(patterns[index]))
+        # Move to the first point quickly but not instantly; sweeps keep their full size
+        part = _randomized(base, position, random.uniform(0.15, 0.25), random.uniform(0.02, 0.05),
+                           reshape=False)
+        parts.append(part)
+        position = part[-1, 1:]
+    path = pathcache.concat(parts)
+    return trajectory.fit(path, min_x, min_y, max_x, max_y)
+
+def big_fast_sweeping(min_x, min_y, max_x, max_y, token=None):
+    """
+    Performs large, fast sweeping movements across the entire screen - aggressive and dramatic.
+    """
+    log.info("Performing big fast sweeping movements...")
+    trajectory.replay(big_fast_sweeping_path(min_x, min_y, max_x, max_y, trajectory.position()), token)
+
+def frustrated_scribbling_path(min_x, min_y, max_x, max_y, start):
+    """Path for frustrated_scribbling."""
+    current_x, current_y = start
+
+    # Define a scribble area around current position
+    scribble_size = 150
+    center_x = max(min_x + scribble_size//2, min(max_x - scribble_size//2, current_x))
+    center_y = max(min_y + scribble_size//2, min(max_y - scribble_size//2, current_y))
+
+    # 15 rapid movements to random points within the scribble area
+    half = scribble_size // 2
+    xs = center_x + np.random.randint(-half, half + 1, size=15)
+    ys = center_y + np.random.randint(-half, half + 1, size=15)
+
+    path = trajectory.PathBuilder(start)
+    for x, y in zip(xs, ys):
+        # Very fast, erratic movement
+        path.move_to(x, y, random.uniform(0.03, 0.08))
+        path.pause(random.uniform(0.01, 0.02))
+    return path.build(min_x, min_y, max_x - 1, max_y - 1)
+
+def frustrated_scribbling(min_x, min_y, max_x, max_y, token=None):
+    """
+    Rapid back-and-forth scribbling movements as if frantically searching for the cursor.
+    """
+    log.info("Performing frustrated scribbling...")
+    trajectory.replay(frustrated_scribbling_path(min_x, min_y, max_x, max_y, trajectory.position()), token)
+
+def upward_jabbing_path(min_x, min_y, max_x, max_y, start):
+    """Path for upward_jabbing."""
+    current_x, current_y = start
+
+    # Perform 8-12 jabbing motions
+    num_jabs = random.randint(8, 12)
+
+    path = trajectory.PathBuilder(start)
+    for i in range(num_jabs):
+        # Start from current or slightly varied x position
+        start_x = max(min_x, min(max_x - 1, current_x + random.randint(-30, 30)))
+        start_y = max(min_y + 100, min(max_y - 50, current_y + random.randint(-20, 20)))
+
+        # Jab upward
+        jab_distance = random.randint(40, 80)
+        end_y = max(min_y, start_y - jab_distance)
+
+        # Quick upward movement
+        path.move_to(start_x, start_y, random.uniform(0.05, 0.1))
+        path.move_to(start_x, end_y, random.uniform(0.03, 0.06))
+
+        # Brief pause between jabs
+        path.pause(random.uniform(0.02, 0.05))
+
+        current_x = start_x
+    return path.build(min_x, min_y, max_x, max_y)
+
+def upward_jabbing(min_x, min_y, max_x, max_y, token=None):
+    """
+    Series of rapid upward jabbing movements, like angry pointing or clicking.
+    """
+    log.info("Performing upward jabbing movements...")
+    trajectory.replay(upward_jabbing_path(min_x, min_y, max_x, max_y, trajectory.position()), token)
+
+def angry_shaking_path(min_x, min_y, max_x, max_y, start):
+    """Path for angry_shaking."""
+    current_x, current_y = start
+
+    # Ensure we're in a safe area for shaking
+    shake_x = max(min_x + 50, min(max_x - 50, current_x))
+    shake_y = max(min_y + 50, min(max_y - 50, current_y))
+
+    # 20 rapid shakes, mostly horizontal
+    xs = shake_x + np.random.randint(-40, 41, size=20)
+    ys = shake_y + np.random.randint(-15, 16, size=20)
+
+    path = trajectory.PathBuilder(start)
+    for x, y in zip(xs, ys):
+        # Very fast movement
+        path.move_to(x, y, random.uniform(0.02, 0.05))
+        path.pause(random.uniform(0.01, 0.02))
+    return path.build(min_x, min_y, max_x - 1, max_y - 1)
+
+def angry_shaking(min_x, min_y, max_x, max_y, token=None):
+    """
+    Rapid shaking movement back and forth, like an angry gesture.
+    """
+    log.info("Performing angry shaking...")
+    trajectory.replay(angry_shaking_path(min_x, min_y, max_x, max_y, trajectory.position()), token)
+
+def frantic_corner_search_path(min_x, min_y, max_x, max_y, start):
+    """Path for frantic_corner_search."""
+    # Define corner and edge positions with some margin
+    margin = 50
+    positions = [
+        (min_x + margin, min_y + margin),  # Top-left
+        (max_x - margin, min_y + margin),  # Top-right
+        (min_x + margin, max_y - margin),  # Bottom-left
+        (max_x - margin, max_y - margin),  # Bottom-right
+        ((min_x + max_x) // 2, min_y + margin),  # Top-center
+        ((min_x + max_x) // 2, max_y - margin),  # Bottom-center
+        (min_x + margin, (min_y + max_y) // 2),  # Left-center
+        (max_x - margin, (min_y + max_y) // 2)   # Right-center
+    ]
+
+    # Randomly visit 5-7 positions very quickly
+    num_searches = random.randint(5, 7)
+    selected_positions = random.sample(positions, num_searches)
+
+    path = trajectory.PathBuilder(start)
+    for x, y in selected_positions:
+        # Fast movement to position
+        path.move_to(x, y, random.uniform(0.08, 0.15))
+
+        # Brief pause as if "looking"
+        path.pause(random.uniform(0.05, 0.12))
+    return path.build(min_x, min_y, max_x, max_y)
+
+def frantic_corner_search(min_x, min_y, max_x, max_y, token=None):
+    """
+    Frantically moves to different corners and edges of the screen,
+    like searching for something urgently.
+    """
+    log.info("Performing frantic corner search...")
+    trajectory.replay(frantic_corner_search_path(min_x, min_y, max_x, max_y, trajectory.position()), token)
+
+def aggressive_zigzag_path(min_x, min_y, max_x, max_y, start):
+    """Path for aggressive_zigzag: 8 erratic passes in about 2 seconds."""
+    # Calculate the step size for moving down (larger steps = faster)
+    screen_height = max_y - min_y
+    step_size = screen_height // 8  # Fewer bands = bigger jumps
+
+    target_duration = 3.0  # Faster than normal zigzag
+    iterations = 8  # Fewer iterations but more aggressive
+    iteration_duration = target_duration / (iterations * 2)
+
+    path = trajectory.PathBuilder(start)
+    for i in range(iterations):
+        current_y = min(min_y + (i * step_size), max_y - 1)
+
+        # Add some randomness to x positions for more erratic movement
+        left_x = min_x + random.randint(0, 30)
+        right_x = max_x - random.randint(0, 30)
+
+        # Much faster timing, with variation
+        path.move_to(left_x, current_y, iteration_duration * 0.7)
+        path.move_to(right_x, current_y, iteration_duration * 0.7)
+    return path.build(min_x, min_y, max_x, max_y)
+
+def aggressive_zigzag(min_x, min_y, max_x, max_y, token=None):
+    """
+    Like the normal zigzag but much faster and more erratic - aggressive version.
+    """
+    log.info("Performing aggressive zigzag...")
+    path = aggressive_zigzag_path(min_x, min_y, max_x, max_y, trajectory.position())
+    elapsed_time = trajectory.replay(path, token)
+    log.info("Aggressive zigzag completed in %.2f seconds", elapsed_time)
+
+# === MOVEMENT TABLES ===
+
+# Path generator behind each movement, for runtimes that replay paths themselves
+PATHS = {
+    zigzag_pattern: zigzag_path,
+    s_curve_movement: s_curve_path,
+    circular_movement: circular_path,
+    figure8_movement: figure8_path,
+    natural_drift_movement: natural_drift_path,
+    big_slow_move: big_slow_path,
+    short_fast_jiggle: short_fast_jiggle_path,
+    random_point_movement: random_point_path,
+    recorded_trace: recorded_trace_path,
+    big_fast_sweeping: big_fast_sweeping_path,
+    frustrated_scribbling: frustrated_scribbling_path,
+    upward_jabbing: upward_jabbing_path,
+    angry_shaking: angry_shaking_path,
+    frantic_corner_search: frantic_corner_search_path,
+    aggressive_zigzag: aggressive_zigzag_path,
+}
+
+# Break functions with their log label and duration range in seconds
+BREAKS = {
+    take_a_break: ("Taking a break", 3, 7),
+    quick_short_break: ("Quick break", 0.5, 2.0),
+    long_lazy_break: ("Long lazy break", 5, 12),
+}
+
+# Metadata of every movement and break, learning durations and injection
+# cost as they run; the scheduler plans with this rather than the tables
+REGISTRY = registry.MovementRegistry()
+for _movement, _path in PATHS.items():
+    REGISTRY.register(_movement, path=_path)
+for _movement, (_label, _min_seconds, _max_seconds) in BREAKS.items():
+    REGISTRY.register(_movement, label=_label, duration_range=(_min_seconds, _max_seconds))
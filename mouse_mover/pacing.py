@@ -0,0 +1,185 @@
+"""
+Deadline pacing for everything that injects or samples on a schedule.
+
+A Pacer waits for absolute deadlines on a monotonic clock, so lateness at
+one point never pushes back the ones after it. Each wait sleeps until
+shortly before the deadline and spins for the rest: OS sleeps wake up a
+fraction of a millisecond to several milliseconds late, a spin lands within
+microseconds. Spinning burns CPU, so it draws on an allowance that refills
+at `cpu_budget` seconds per second; with the allowance spent the pacer only
+sleeps.
+
+Drift compensation: the pacer tracks the median lateness of its sleeps and
+starts each sleep that much earlier, so even waits that cannot spin land on
+their deadline instead of consistently late. The median ignores the rare
+wake-up that is milliseconds late because another process had the CPU.
+
+trajectory.replay(), replay_async(), the legacy movement breaks and trace
+recording all go through default_pacer (see set_pacer()).
+"""
+import time
+from collections import deque
+
+from . import metrics
+from ._lazy import lazy_import
+
+np = lazy_import("numpy")
+
+# Step of the running median estimate of sleep overshoot, in seconds
+OVERSHOOT_STEP = 0.00001
+# Never start a sleep more than this much early, whatever the estimate says
+MAX_COMPENSATION = 0.002
+
+
+class Pacer:
+    """
+    Sleep-then-spin waits for absolute deadlines.
+    spin: seconds before each deadline to stop sleeping and spin (0 never spins)
+    cpu_budget: share of one core that spinning may use on average
+    burst: most spin time that can build up while idle, in seconds
+    clock: monotonic clock for sleep_until(); sleep_until_async() uses the
+    loop's clock
+    """
+
+    def __init__(self, spin=0.0005, cpu_budget=0.05, burst=0.05, clock=time.perf_counter, window=1000):
+        self.spin = spin
+        self.cpu_budget = cpu_budget
+        self.burst = burst
+        self.clock = clock
+        self.errors = deque(maxlen=window)  # signed seconds from deadline to wake-up
+        self.waits = 0
+        self.spun = 0.0  # total seconds spent spinning
+        self.unspun = 0  # waits that wanted to spin but had no allowance left
+        # Expected lateness of a plain sleep, learned separately for thread
+        # sleeps and event loop timers
+        self.sleep_overshoot = 0.0
+        self.loop_overshoot = 0.0
+        self._allowance = burst
+        self._refilled = time.perf_counter()
+
+    def _spin_time(self, remaining):
+        """Spin time granted for this wait, out of the refilled allowance."""
+        if not self.spin:
+            return 0.0
+        now = time.perf_counter()
+        self._allowance = min(self.burst, self._allowance + (now - self._refilled) * self.cpu_budget)
+        self._refilled = now
+        wanted = min(self.spin, remaining)
+        if self._allowance < wanted:
+            self.unspun += 1
+            return 0.0
+        return wanted
+
+    def _spend(self, seconds):
+        self._allowance -= seconds
+        self.spun += seconds
+        metrics.PACER_SPIN_SECONDS.inc(seconds)
+
+    def _record(self, error):
+        self.waits += 1
+        self.errors.append(error)
+        metrics.SLEEP_OVERSHOOT.observe(max(0.0, error))
+
+    def sleep_until(self, deadline, token=None):
+        """
+        Block until `deadline` on self.clock. With a trajectory.CancelToken,
+        the sleep wakes on cancel() and the spin checks it; True if cancelled.
+        """
+        clock = self.clock
+        remaining = deadline - clock()
+        if remaining <= 0:
+            return token is not None and token.cancelled
+        spin = self._spin_time(remaining)
+        sleep = remaining - spin - self.sleep_overshoot
+        if sleep > 0:
+            target = clock() + sleep
+            if token is None:
+                time.sleep(sleep)
+            elif token.wait(sleep):
+                return True
+            self.sleep_overshoot = _learn(self.sleep_overshoot, clock() - target)
+        if spin:
+            spun_from = clock()
+            while clock() < deadline:
+                if token is not None and token.cancelled:
+                    self._spend(clock() - spun_from)
+                    return True
+            self._spend(clock() - spun_from)
+        self._record(clock() - deadline)
+        return token is not None and token.cancelled
+
+    async def sleep_until_async(self, deadline, token=None, woken=None):
+        """
+        sleep_until() on the running event loop's clock. The sleep ends
+        early once the `woken` future resolves; True if the token was
+        cancelled. The spin holds the loop, for at most `spin` seconds.
+        Virtual clocks (scheduler.VirtualClockEventLoop) only stand still
+        while we spin, so they always just sleep.
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return token is not None and token.cancelled
+        virtual = hasattr(loop, "jump_to")
+        spin = 0.0 if virtual else self._spin_time(remaining)
+        sleep = remaining - spin - (0.0 if virtual else self.loop_overshoot)
+        if sleep > 0:
+            target = loop.time() + sleep
+            if woken is None:
+                await asyncio.sleep(sleep)
+            else:
+                await asyncio.wait((woken,), timeout=sleep)
+            if token is not None and token.cancelled:
+                return True
+            if not virtual:
+                self.loop_overshoot = _learn(self.loop_overshoot, loop.time() - target)
+        if spin:
+            spun_from = loop.time()
+            while loop.time() < deadline:
+                if token is not None and token.cancelled:
+                    self._spend(loop.time() - spun_from)
+                    return True
+            self._spend(loop.time() - spun_from)
+        self._record(loop.time() - deadline)
+        return token is not None and token.cancelled
+
+    def sleep(self, seconds, token=None):
+        """sleep_until() a deadline `seconds` from now."""
+        return self.sleep_until(self.clock() + seconds, token)
+
+    def summary(self):
+        """Wake-up error percentiles in microseconds plus spin CPU use."""
+        if not self.errors:
+            return {"waits": self.waits}
+        us = np.asarray(self.errors) * 1e6
+        return {
+            "waits": self.waits,
+            "mean_us": float(us.mean()),
+            "p50_us": float(np.percentile(us, 50)),
+            "p99_us": float(np.percentile(us, 99)),
+            "worst_us": float(us.max()),
+            "spun_s": self.spun,
+            "unspun": self.unspun,
+            "sleep_compensation_us": self.sleep_overshoot * 1e6,
+            "loop_compensation_us": self.loop_overshoot * 1e6,
+        }
+
+
+def _learn(estimate, overshoot):
+    """Move the running median estimate one step towards an observed overshoot."""
+    estimate += OVERSHOOT_STEP if overshoot > estimate else -OVERSHOOT_STEP
+    return min(MAX_COMPENSATION, max(0.0, estimate))
+
+
+default_pacer = Pacer()
+
+
+def set_pacer(pacer):
+    """Use this pacer for all movement timing."""
+    global default_pacer
+    default_pacer = pacer
+
+
+def get_pacer():
+    return default_pacer
@@ -0,0 +1,164 @@
+"""
+Memoized base trajectories for the parametric movements.
+
+Circles, figure-8s, S-curves and sweep patterns depend only on the screen
+bounds and a few discrete parameters, so their waypoints and interpolation
+are computed once per (movement, bounds, parameter bucket) and cached:
+
+- in memory, as an LRU of at most `max_entries` base paths
+- optionally on disk, as one .npy file per key that is opened memory-mapped,
+  so restarts and fleet workers reuse (and share the pages of) paths any
+  process has already built
+
+Per-call randomness is applied to a cached base path with cheap vectorized
+transforms instead of rebuilding it: transform() offsets and scales the
+shape and stretches or warps its timing, and approach() adds the short move
+from the current pointer position to the start of the shape.
+"""
+import os
+from collections import OrderedDict
+
+from . import log
+from . import metrics
+from . import trajectory
+from ._lazy import lazy_import
+
+np = lazy_import("numpy")
+
+# Part of every file name on disk. Bump it whenever a base path generator
+# (the _*_base functions in movements.py), the frame sampling or the array
+# layout changes, so files written by older versions are no longer read.
+CACHE_VERSION = 1
+
+
+class TrajectoryCache:
+    """LRU of base paths, optionally persisted to a directory of .npy files."""
+
+    def __init__(self, directory=None, max_entries=128):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._hits = metrics.PATH_CACHE.labels("memory")
+        self._loads = metrics.PATH_CACHE.labels("disk")
+        self._builds = metrics.PATH_CACHE.labels("built")
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _file(self, key):
+        import hashlib
+        digest = hashlib.sha1(repr((CACHE_VERSION, key)).encode()).hexdigest()[:20]
+        return os.path.join(self.directory, f"{key[0]}-v{CACHE_VERSION}-{digest}.npy")
+
+    def get(self, key, build):
+        """
+        Base path for key, a tuple starting with the movement name. Misses
+        call build() and store its (N, 3) array. The result is read-only
+        and must not be modified; transform() returns a fresh copy.
+        """
+        path = self._entries.get(key)
+        if path is not None:
+            self._entries.move_to_end(key)
+            self._hits.inc()
+            return path
+
+        path = self._load(key) if self.directory else None
+        if path is None:
+            path = np.ascontiguousarray(build(), dtype=float)
+            self._builds.inc()
+            if self.directory:
+                path = self._store(key, path)
+        path.flags.writeable = False
+
+        self._entries[key] = path
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return path
+
+    def _load(self, key):
+        try:
+            path = np.load(self._file(key), mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        self._loads.inc()
+        return path
+
+    def _store(self, key, path):
+        """Write atomically, then map the file so its pages are shared."""
+        target = self._file(key)
+        tmp = f"{target}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp, "wb") as f:
+                np.save(f, path)
+            os.replace(tmp, target)
+            return np.load(target, mmap_mode="r")
+        except OSError as e:
+            log.warning("Trajectory cache not writable (%s), keeping paths in memory only", e)
+            self.directory = None
+            return path
+
+    def clear(self):
+        """Forget the in-memory entries (files on disk are kept)."""
+        self._entries.clear()
+
+
+default_cache = TrajectoryCache()
+
+
+def set_directory(directory):
+    """Persist the default cache to directory (None for memory only)."""
+    default_cache.directory = os.path.expanduser(directory) if directory else None
+
+
+def transform(base, offset=(0.0, 0.0), scale=1.0, center=None,
+              time_scale=1.0, warp=1.0, delay=0.0):
+    """
+    Copy of a base path with its shape scaled about `center` (default: the
+    shape's own centre) and shifted by `offset`, its timeline warped by
+    t -> T * (t / T) ** warp and stretched by `time_scale`, and started
+    `delay` seconds late.
+    """
+    path = np.array(base, dtype=float)
+    if not len(path):
+        return path
+    xy = path[:, 1:]
+    if scale != 1.0:
+        if center is None:
+            center = xy.mean(axis=0)
+        xy -= center
+        xy *= scale
+        xy += center
+    xy += offset
+
+    t = path[:, 0]
+    end = t[-1]
+    if warp != 1.0 and end > 0:
+        np.power(t / end, warp, out=t)
+        t *= end
+    t *= time_scale
+    t += delay
+    return path
+
+
+def approach(start, end, duration, rate=None):
+    """Straight move from start to end, as a path starting at t=0, at frame_rate() by default."""
+    steps = max(1, int(np.ceil(duration * (rate or trajectory.frame_rate()))))
+    frac = np.arange(1, steps + 1) / steps
+    return np.column_stack((frac * duration,
+                            start[0] + (end[0] - start[0]) * frac,
+                            start[1] + (end[1] - start[1]) * frac))
+
+
+def concat(parts):
+    """Join paths end to end, shifting each onto the end of the previous."""
+    offset = 0.0
+    shifted = []
+    for part in parts:
+        if not len(part):
+            continue
+        part = part if part.flags.writeable else part.copy()
+        part[:, 0] += offset
+        offset = part[-1, 0]
+        shifted.append(part)
+    return np.concatenate(shifted) if shifted else np.empty((0, 3))
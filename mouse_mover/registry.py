@@ -0,0 +1,156 @@
+"""
+Movement registry: what the scheduler knows about each movement.
+
+Every movement and break in movements.py is registered with its path
+generator or duration range. Entries learn online how long a run takes and
+how many events it injects, so the scheduler can fill a mood window
+without overrunning it and keep within an events-per-minute budget before
+building anything.
+
+Until a movement has run, its estimates come from its break range or, for
+path movements, from one sample path built on first use.
+"""
+import random
+from collections import deque
+
+from . import trajectory
+
+
+class OnlineStats:
+    """Running count, mean, spread and extremes of a value, plus a window of recent samples for quantiles."""
+
+    def __init__(self, window=256):
+        self.count = 0
+        self.mean = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.recent = deque(maxlen=window)
+        self._m2 = 0.0
+
+    def add(self, value):
+        # Welford's update, stable over millions of samples
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.recent.append(value)
+
+    @property
+    def std(self):
+        return (self._m2 / (self.count - 1)) ** 0.5 if self.count > 1 else 0.0
+
+    def quantile(self, q):
+        """q-quantile (0..1) of the recent samples, nearest rank."""
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def summary(self):
+        if not self.count:
+            return {"count": 0}
+        return {"count": self.count, "mean": self.mean, "std": self.std, "min": self.min,
+                "p90": self.quantile(0.9), "max": self.max}
+
+
+class MovementInfo:
+    """
+    Metadata of one movement or break.
+    path: *_path generator taking (min_x, min_y, max_x, max_y, start); movements
+    with one need screen bounds, breaks don't
+    label, duration_range: log label and (min, max) seconds of a break
+    """
+
+    def __init__(self, function, path=None, label=None, duration_range=None):
+        self.function = function
+        self.name = function.__name__
+        self.path = path
+        self.needs_bounds = path is not None
+        self.label = label or self.name.replace("_", " ")
+        self.duration_range = duration_range
+        self.durations = OnlineStats()  # seconds per completed run
+        self.events = OnlineStats()  # pointer events injected per completed run
+
+    def build(self, bounds, start):
+        """A fresh path for this movement from `start` within bounds."""
+        return self.path(*bounds, start)
+
+    def draw_duration(self, rng=random):
+        """Length of one break, uniform over its range."""
+        return rng.uniform(*self.duration_range)
+
+    def record(self, seconds, events):
+        """Learn from one completed run."""
+        self.durations.add(seconds)
+        self.events.add(events)
+
+    def _prime(self, bounds):
+        """Seed the estimates of a movement that has never run from one sample path."""
+        if self.durations.count or not self.needs_bounds:
+            return
+        min_x, min_y, max_x, max_y = bounds
+        path = self.build(bounds, ((min_x + max_x) // 2, (min_y + max_y) // 2))
+        self.record(trajectory.duration(path), trajectory.event_count(path))
+
+    def shortest(self, bounds):
+        """Shortest run seen so far (a break's minimum), in seconds."""
+        if self.duration_range is not None:
+            return self.duration_range[0]
+        self._prime(bounds)
+        return self.durations.min
+
+    def expected_duration(self, bounds):
+        if self.duration_range is not None and not self.durations.count:
+            return sum(self.duration_range) / 2
+        self._prime(bounds)
+        return self.durations.mean
+
+    def expected_events(self, bounds):
+        """Mean events injected per run: the movement's injection cost."""
+        if not self.needs_bounds:
+            return 0.0
+        self._prime(bounds)
+        return self.events.mean
+
+    def reset(self):
+        """Forget everything learned."""
+        self.durations = OnlineStats()
+        self.events = OnlineStats()
+
+    def summary(self):
+        return {
+            "needs_bounds": self.needs_bounds,
+            "duration_s": self.durations.summary(),
+            "events": self.events.summary(),
+            "events_per_second": self.events.mean / self.durations.mean if self.durations.mean else 0.0,
+        }
+
+
+class MovementRegistry:
+    """MovementInfo for every movement function, looked up by the function."""
+
+    def __init__(self):
+        self.entries = {}
+
+    def register(self, function, path=None, label=None, duration_range=None):
+        info = self.entries[function] = MovementInfo(function, path, label, duration_range)
+        return info
+
+    def __getitem__(self, function):
+        return self.entries[function]
+
+    def __contains__(self, function):
+        return function in self.entries
+
+    def __iter__(self):
+        return iter(self.entries.values())
+
+    def reset(self):
+        for info in self:
+            info.reset()
+
+    def summary(self):
+        """{movement name: estimates} for reports."""
+        return {info.name: info.summary() for info in self}
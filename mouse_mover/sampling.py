@@ -0,0 +1,126 @@
+"""
+Compiled sampling tables for the mood system.
+
+MOODS is compiled once into immutable alias tables (Vose's alias method), so
+picking a movement or the next mood is O(1) no matter how many choices there
+are, and N future picks can be drawn in one vectorized NumPy call. Mood
+changes follow a mood-to-mood transition matrix; with no transitions given
+every mood is equally likely, which is the original behaviour.
+"""
+import random
+from types import MappingProxyType
+
+from ._lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+class AliasTable:
+    """Immutable weighted sampler over a fixed set of items."""
+
+    def __init__(self, weights):
+        """weights: mapping of item -> non-negative weight."""
+        self.items = tuple(weights)
+        values = np.asarray([weights[item] for item in self.items], dtype=float)
+        if not len(values) or (values < 0).any() or values.sum() <= 0:
+            raise ValueError("weights must be non-negative with a positive total")
+
+        size = len(values)
+        scaled = values * size / values.sum()
+        prob = np.ones(size)
+        alias = np.arange(size)
+
+        # Pair each under-full column with an over-full one (Vose)
+        small = [i for i in range(size) if scaled[i] < 1]
+        large = [i for i in range(size) if scaled[i] >= 1]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1 - scaled[s]
+            (small if scaled[l] < 1 else large).append(l)
+
+        prob.flags.writeable = False
+        alias.flags.writeable = False
+        self.prob = prob
+        self.alias = alias
+        # Plain lists are faster than NumPy scalars for single draws
+        self._prob = prob.tolist()
+        self._alias = alias.tolist()
+
+    def __len__(self):
+        return len(self.items)
+
+    def sample_index(self, rng=random):
+        """Draw one index in O(1) using a single uniform from rng."""
+        u = rng.random() * len(self._prob)
+        i = int(u)
+        return i if u - i < self._prob[i] else self._alias[i]
+
+    def sample(self, rng=random):
+        """Draw one item in O(1)."""
+        return self.items[self.sample_index(rng)]
+
+    def sample_indices(self, n, rng=None):
+        """Draw n indices in one vectorized call; rng is a numpy Generator."""
+        rng = np.random.default_rng() if rng is None else rng
+        u = rng.random(n) * len(self.prob)
+        i = u.astype(np.intp)
+        return np.where(u - i < self.prob[i], i, self.alias[i])
+
+    def sample_many(self, n, rng=None):
+        """Draw n items in one vectorized call."""
+        return [self.items[i] for i in self.sample_indices(n, rng).tolist()]
+
+
+class CompiledMoods:
+    """
+    MOODS compiled into per-mood movement tables plus a mood transition matrix.
+    transitions maps mood -> {next_mood: weight}; moods missing from it move
+    to any mood (including themselves) with equal probability.
+    """
+
+    def __init__(self, moods, transitions=None):
+        transitions = transitions or {}
+        self.names = tuple(moods)
+        self.configs = MappingProxyType(dict(moods))
+        self.movement_tables = MappingProxyType(
+            {name: AliasTable(config["movements"]) for name, config in moods.items()})
+
+        uniform = {name: 1 for name in self.names}
+        matrix = np.array([[transitions.get(src, uniform).get(dst, 0) for dst in self.names]
+                           for src in self.names], dtype=float)
+        matrix /= matrix.sum(axis=1, keepdims=True)
+        matrix.flags.writeable = False
+        self.transition_matrix = matrix  # rows: current mood, columns: next mood
+        self.transition_tables = MappingProxyType(
+            {src: AliasTable(dict(zip(self.names, row))) for src, row in zip(self.names, matrix)})
+        self.initial_table = AliasTable(uniform)
+
+    def next_mood(self, current=None, rng=random):
+        """Pick the mood that follows `current` (or a first mood when None)."""
+        table = self.initial_table if current is None else self.transition_tables[current]
+        name = table.sample(rng)
+        return name, self.configs[name]
+
+    def choose_movement(self, mood_name, rng=random):
+        """Pick one movement for the mood in O(1)."""
+        return self.movement_tables[mood_name].sample(rng)
+
+    def sample_movements(self, mood_name, n, rng=None):
+        """Draw the mood's next n movements in one vectorized call."""
+        return self.movement_tables[mood_name].sample_many(n, rng)
+
+    def plan(self, num_moods, actions_per_mood, start=None, rng=None):
+        """
+        Draw a whole action plan ahead of time, e.g. an hour of 1-minute moods.
+        Returns a list of (mood_name, [movements]) in the order they would run.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        plan = []
+        current = start
+        for _ in range(num_moods):
+            table = self.initial_table if current is None else self.transition_tables[current]
+            current = table.items[table.sample_indices(1, rng)[0]]
+            plan.append((current, self.sample_movements(current, actions_per_mood, rng)))
+        return plan
@@ -0,0 +1,527 @@
+"""
+asyncio runtime for the mood system.
+
+Movements, pauses, user activity detection and the interruption sequence
+are all coroutines on one event loop, so the process idles in the loop's
+selector between events and any wait can be cut short or extended the
+moment the user moves the mouse.
+
+run_economy() is the low-duty alternative to run(): it reads the system idle
+time and only moves shortly before the session would go idle.
+
+Mood windows are packed by duration: each action is planned first (a
+built path or a drawn break length) and only taken if it ends within the
+window, using movements.REGISTRY to skip movements that can't fit, so a
+mood ends within `window_tolerance` of its length unless the user
+interrupts. An optional events-per-minute budget steers the same choice.
+
+pause(), resume() and force_mood() steer a running scheduler (see
+control.py). They preempt the current movement and wake any pause, so they
+apply before the next point would be injected.
+
+VirtualClockEventLoop runs the same coroutines headless: instead of
+sleeping, its clock jumps straight to the next scheduled timer.
+"""
+import asyncio
+import collections
+import random
+import selectors
+
+from . import log
+from . import metrics
+from . import movements
+from . import sampling
+from . import trajectory
+
+
+class MoodScheduler:
+    """
+    Cycles through moods on the running event loop.
+    moods is the MOODS dict (compiled here, following `transitions`) or an
+    already compiled sampling.CompiledMoods.
+    User activity arrives either from a detection.UserActivityMonitor or
+    from notify_user_activity(), which is safe to call from any thread.
+    replay is the coroutine that plays paths, trajectory.replay_async by
+    default (simulation.replay_virtual for offline runs).
+    Control methods (pause(), resume(), force_mood()) must be called on the
+    event loop's thread.
+    window_tolerance: seconds a mood window may be left unfilled or overrun
+    event_budget: most pointer events to inject in any minute (None: no budget)
+    """
+
+    def __init__(self, moods, bounds, monitor=None, transitions=None, backend=None, screen=None,
+                 replay=None, window_tolerance=0.5, event_budget=None):
+        if not isinstance(moods, sampling.CompiledMoods):
+            moods = sampling.CompiledMoods(moods, transitions)
+        self.moods = moods
+        self.bounds = bounds  # (min_x, min_y, max_x, max_y)
+        self.screen = screen  # geometry.MonitorWatcher; bounds follow its index
+        self.monitor = monitor
+        self.backend = backend or trajectory.get_backend()
+        self.replay = replay or trajectory.replay_async
+        self.window_tolerance = window_tolerance
+        self.event_budget = event_budget
+        self._injections = collections.deque()  # (loop time, events) of the last minute's actions
+        self.user_active = None  # asyncio.Event, created on the running loop
+        self.last_activity = None  # loop time of the last user movement
+        self.token = trajectory.CancelToken()  # preempts the running movement
+        self.paused = False
+        self.forced_mood = None  # held by force_mood() instead of following the transitions
+        self.mood = None  # mood and movement running now
+        self.movement = None
+        self._wake = None  # asyncio.Event: user activity or a control command
+        self._resumed = None  # asyncio.Event, set unless paused
+        self._preempted = False  # the token was cancelled by a control command
+        self._loop = None
+
+    def _attach(self):
+        if self._loop is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self.user_active = asyncio.Event()
+        self._wake = asyncio.Event()
+        self._resumed = asyncio.Event()
+        if not self.paused:
+            self._resumed.set()
+        if self.monitor is not None:
+            self.monitor.subscribe(self.notify_user_activity)
+
+    def notify_user_activity(self, event=None):
+        """Report a user movement; thread-safe."""
+        # Cancel straight from the caller's thread so the replay loop gives
+        # up the pointer without waiting for the event loop to wake
+        self.token.cancel()
+        self._loop.call_soon_threadsafe(self._user_moved)
+
+    def _user_moved(self):
+        self.last_activity = self._loop.time()
+        self.user_active.set()
+        self._wake.set()
+
+    def _acknowledge_activity(self):
+        self.user_active.clear()
+        if self.monitor is not None:
+            self.monitor.clear()
+        # A token a control command cancelled stays cancelled for _apply_controls()
+        if not self._preempted:
+            self._wake.clear()
+            self.token.reset()
+
+    async def run(self, cycles=None):
+        """Run moods forever, or for the given number of mood cycles."""
+        self._attach()
+        completed = 0
+        mood_name = None
+        while cycles is None or completed < cycles:
+            # Pick the next mood from the transition table and run it for 1 minute
+            mood_name, mood_config = self._next_mood(mood_name)
+            await self.run_mood_cycle(mood_name, mood_config, duration_minutes=1)
+            completed += 1
+
+            # Brief pause between mood switches, unless one was forced
+            if self.forced_mood in (None, mood_name):
+                await self._wait_for_user(random.uniform(1, 3))
+
+    def _next_mood(self, current):
+        """The forced mood if there is one, else the next one from the transitions."""
+        if self.forced_mood is not None:
+            return self.forced_mood, self.moods.configs[self.forced_mood]
+        return self.moods.next_mood(current)
+
+    async def run_mood_cycle(self, mood_name, mood_config, duration_minutes=1):
+        """Run a specific mood for the given duration."""
+        self._attach()
+        log.info("\n🎭 Switching to mood: %s for %s minute(s)", mood_config["name"], duration_minutes, mood=mood_name)
+        self.mood = mood_name
+        self._refresh_screen()
+
+        start_time = self._loop.time()
+        duration = duration_minutes * 60
+        end_time = start_time + duration
+
+        while True:
+            await self._apply_controls()
+            if self.forced_mood not in (None, mood_name):
+                break
+            remaining = end_time - self._loop.time()
+            if remaining <= self.window_tolerance:
+                break
+
+            # Check for external mouse movement before each action
+            if self.user_active.is_set():
+                await self.handle_movement_interruption()
+                continue
+
+            # Select a movement based on mood weights that fits the rest of
+            # the window and the event budget, and run it
+            movement, path, seconds = self._plan(mood_name, remaining)
+            if movement is None:
+                # Idle out the window, or until the budget frees up events
+                wait = min(remaining, self._budget_frees())
+                log.info("Nothing fits the next %.1f seconds of the mood, waiting", wait)
+                if await self._wait_for_user(wait):
+                    await self.handle_movement_interruption()
+                continue
+            await self.perform(movement, path, seconds)
+
+            # Small pause between actions, cut short by user movement
+            pause = min(random.uniform(0.1, 0.5), max(0.0, end_time - self._loop.time()))
+            if await self._wait_for_user(pause):
+                await self.handle_movement_interruption()
+
+        elapsed = self._loop.time() - start_time
+        metrics.MOOD_SECONDS.labels(mood_name).inc(elapsed)
+        metrics.MOOD_WINDOW_ERROR.observe(abs(elapsed - duration))
+        log.info("✅ Mood %s completed after %.1f minutes", mood_config["name"], elapsed / 60, mood=mood_name)
+
+    async def run_economy(self, idle_source, threshold, lead=15, duration=None, report_interval=600):
+        """
+        Economy mode: stay still while the system keeps seeing input and
+        perform one short movement from the current mood only when its idle
+        time (from an idle.* source) comes within `lead` seconds of
+        `threshold`. Moods still rotate every minute.
+        Runs forever, or for `duration` seconds, and returns the savings report.
+        """
+        self._attach()
+        continuous_rate = self.continuous_event_rate()
+        start = self._loop.time()
+        injected_before = metrics.INJECTED_EVENTS.value
+        mood_name, mood_config = self._next_mood(None)
+        self.mood = mood_name
+        mood_end = start + 60
+        next_report = start + report_interval
+        log.info("💤 Economy mode: moving only when idle for %.0fs (threshold %.0fs)", threshold - lead, threshold)
+
+        while duration is None or self._loop.time() - start < duration:
+            await self._apply_controls()
+            now = self._loop.time()
+            if now >= mood_end or self.forced_mood not in (None, mood_name):
+                mood_name, mood_config = self._next_mood(mood_name)
+                self.mood = mood_name
+                mood_end = now + 60
+            if now >= next_report:
+                self.economy_report(continuous_rate, now - start,
+                                    metrics.INJECTED_EVENTS.value - injected_before)
+                next_report = now + report_interval
+            if self.user_active.is_set():
+                self._acknowledge_activity()
+
+            # Sleep until idle time could reach the deadline; any input in
+            # the meantime pushes the deadline back when we re-read it. User
+            # activity and control commands wake us early: their flags say
+            # what happened, so _apply_controls() can act on them next. Waits
+            # last at least a millisecond, since a shorter timeout can round
+            # back to "now" and never move a virtual clock on
+            wake = min(now + threshold - lead - idle_source.idle_seconds(), next_report, mood_end)
+            if duration is not None:
+                wake = min(wake, start + duration)
+            if wake > now:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), max(wake - now, 0.001))
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                continue
+
+            self._refresh_screen()
+            await self.perform(self._short_movement(mood_name))
+
+        return self.economy_report(continuous_rate, self._loop.time() - start,
+                                   metrics.INJECTED_EVENTS.value - injected_before)
+
+    def _short_movement(self, mood_name, attempts=10):
+        """A movement (not a break) drawn from the mood, or a jiggle."""
+        for _ in range(attempts):
+            movement = self.moods.choose_movement(mood_name)
+            if movements.REGISTRY[movement].needs_bounds:
+                return movement
+        return movements.short_fast_jiggle
+
+    def _plan(self, mood_name, remaining, attempts=8):
+        """
+        (movement, path, break seconds) for the next action of the mood that
+        ends within `remaining` seconds (plus the tolerance), counting the
+        frame its last point waits for, and stays within the event budget.
+        Movements the registry knows can't fit are redrawn before anything
+        is built; a break is cut to the time left. When nothing fits after
+        `attempts` draws, the movement is None.
+        """
+        limit = remaining + self.window_tolerance
+        events_left = self._events_left()
+        for _ in range(attempts):
+            movement = self.moods.choose_movement(mood_name)
+            info = movements.REGISTRY[movement]
+            if not info.needs_bounds:
+                return movement, None, min(info.draw_duration(), remaining)
+            if info.shortest(self.bounds) > limit:
+                continue
+            if events_left is not None and info.expected_events(self.bounds) > events_left:
+                continue
+            path = info.build(self.bounds, self.backend.position())
+            if trajectory.replay_duration(path, self._loop.time()) <= limit and (
+                    events_left is None or trajectory.event_count(path) <= events_left):
+                return movement, path, None
+        return None, None, None
+
+    def _events_left(self):
+        """Events the budget still allows over the last minute, or None without a budget."""
+        if self.event_budget is None:
+            return None
+        cutoff = self._loop.time() - 60
+        while self._injections and self._injections[0][0] < cutoff:
+            self._injections.popleft()
+        return self.event_budget - sum(events for _, events in self._injections)
+
+    def _budget_frees(self):
+        """Seconds until the oldest events of the last minute leave the budget (inf without one)."""
+        if not self._injections:
+            return float("inf")
+        return max(0.1, self._injections[0][0] + 60 - self._loop.time())
+
+    def continuous_event_rate(self, samples=20):
+        """
+        Injected events per second that run() would average, estimated by
+        building `samples` paths per mood with the usual gaps and breaks.
+        """
+        min_x, min_y, max_x, max_y = self.bounds
+        start = ((min_x + max_x) // 2, (min_y + max_y) // 2)
+        rates = []
+        for name in self.moods.names:
+            events = 0
+            seconds = 0.0
+            for movement in self.moods.sample_movements(name, samples):
+                seconds += 0.3  # mean pause between actions
+                info = movements.REGISTRY[movement]
+                if not info.needs_bounds:
+                    seconds += info.expected_duration(self.bounds)
+                else:
+                    path = info.build(self.bounds, start)
+                    events += trajectory.event_count(path)
+                    seconds += trajectory.duration(path)
+            rates.append(events / seconds)
+        return sum(rates) / len(rates)
+
+    def economy_report(self, continuous_rate, elapsed, injected):
+        """Print and return injection volume against continuous mode."""
+        continuous = continuous_rate * elapsed
+        saved = max(0.0, continuous - injected)
+        metrics.ECONOMY_SAVED_EVENTS.set(saved)
+        percent = 100 * saved / continuous if continuous else 0.0
+        log.info("💤 Economy: %d events in %.1f min vs ~%.0f in continuous mode (%.1f%% saved)",
+                 injected, elapsed / 60, continuous, percent, saved_events=saved)
+        return {"elapsed_s": elapsed, "injected_events": injected,
+                "continuous_events": continuous, "saved_events": saved, "saved_percent": percent}
+
+    def _refresh_screen(self):
+        """Pick up monitor layout changes once per mood, not per movement."""
+        if self.screen is not None:
+            self.screen.maybe_refresh()
+            self.bounds = self.screen.index.bounds
+
+    async def perform(self, movement, path=None, seconds=None):
+        """
+        Run one movement or break from the movements library, with the path
+        or break length planned by _plan(), or new ones. Runs that complete
+        teach the registry their duration and event count.
+        """
+        info = movements.REGISTRY[movement]
+        metrics.MOVEMENTS.labels(info.name).inc()
+        self.movement = info.name
+        injected = metrics.INJECTED_EVENTS.value
+        try:
+            if not info.needs_bounds:
+                seconds = info.draw_duration() if seconds is None else seconds
+                log.info("%s for %.2f seconds", info.label, seconds, movement=info.name)
+                if await self._wait_for_user(seconds):
+                    self._report_preemption(self.token.interrupted())
+                elif not self._preempted:
+                    info.record(seconds, 0)
+                return
+
+            log.info("Performing %s...", info.label, movement=info.name)
+            if path is None:
+                path = info.build(self.bounds, self.backend.position())
+            try:
+                elapsed = await self.replay(path, self.token, self.backend, info.name)
+            except trajectory.MovementInterrupted as e:
+                self._report_preemption(e)
+            else:
+                info.record(elapsed, metrics.INJECTED_EVENTS.value - injected)
+        finally:
+            self.movement = None
+            if self.event_budget is not None:
+                self._injections.append((self._loop.time(), metrics.INJECTED_EVENTS.value - injected))
+
+    def pause(self):
+        """Stop moving, preempting the current movement, until resume()."""
+        self._attach()
+        self.paused = True
+        self._resumed.clear()
+        self._interrupt()
+
+    def resume(self):
+        self._attach()
+        self.paused = False
+        self._resumed.set()
+
+    def force_mood(self, mood_name):
+        """
+        Switch to mood_name now and stay in it, or return to the transitions
+        with None. Raises KeyError for an unknown mood.
+        """
+        self._attach()
+        if mood_name is not None:
+            self.moods.configs[mood_name]
+        self.forced_mood = mood_name
+        if mood_name not in (None, self.mood):
+            self._interrupt()
+
+    def _interrupt(self):
+        """Preempt the running movement and wake any pause, for a control command."""
+        self._preempted = True
+        self.token.cancel()
+        self._wake.set()
+
+    async def _apply_controls(self):
+        """Hold while paused and re-arm the token a control command cancelled."""
+        if self.paused:
+            log.info("⏸️  Paused")
+            await self._resumed.wait()
+            log.info("▶️  Resumed")
+            # Whatever the user did while we were paused was no interruption
+            self._acknowledge_activity()
+        if self._preempted:
+            self._preempted = False
+            if not self.user_active.is_set():
+                self.token.reset()
+                self._wake.clear()
+
+    def _report_preemption(self, interrupted):
+        worst = trajectory.preemption_latency.worst
+        log.info("⏹️  Movement preempted in %.2f ms (worst so far %.2f ms)",
+                 interrupted.latency * 1000, worst * 1000, latency_ms=interrupted.latency * 1000)
+
+    async def _wait_for_user(self, timeout):
+        """
+        Wait up to timeout seconds, or less if a control command arrives;
+        True if the user moved in that time.
+        """
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return self.user_active.is_set()
+
+    async def _quiet_pause(self, seconds):
+        """
+        Wait until the user has left the mouse alone for `seconds`; False if
+        a control command arrived, which _apply_controls() has to see first.
+        """
+        self._acknowledge_activity()
+        while await self._wait_for_user(seconds):
+            log.info("User still moving, restarting %s second pause...", seconds)
+            self._acknowledge_activity()
+        return not (self.paused or self._preempted)
+
+    async def handle_movement_interruption(self):
+        """
+        Handle the sequence when external mouse movement is detected:
+        1. Stop until the mouse has been still for 4 seconds
+        2. Short fast jiggle
+        3. Wait for 3 quiet seconds
+        4. Short fast jiggle again
+        5. Wait for 2 quiet seconds
+        6. Resume
+        A pause or mood command in between ends the sequence early, so the
+        caller's next _apply_controls() can act on it.
+        """
+        metrics.INTERRUPTIONS.inc()
+        log.info("🖱️  External mouse movement detected! Responding...")
+
+        log.info("Pausing for 4 seconds...")
+        if not await self._quiet_pause(4):
+            return
+
+        log.info("First response jiggle...")
+        await self.perform(movements.short_fast_jiggle)
+
+        log.info("Waiting 3 seconds...")
+        if not await self._quiet_pause(3):
+            return
+
+        log.info("Second response jiggle...")
+        await self.perform(movements.short_fast_jiggle)
+
+        log.info("Final pause for 2 seconds...")
+        if not await self._quiet_pause(2):
+            return
+
+        self._acknowledge_activity()
+        log.info("Resuming normal mood behavior...")
+
+
+class _VirtualSelector(selectors.DefaultSelector):
+    """Selector that advances its loop's virtual clock instead of blocking."""
+
+    def __init__(self):
+        super().__init__()
+        self.loop = None
+
+    def select(self, timeout=None):
+        if timeout is None:
+            # Nothing scheduled: only real I/O can wake us up
+            return super().select(None)
+        events = super().select(0)
+        if not events and timeout > 0:
+            self.loop.advance(timeout)
+        return events
+
+
+class VirtualClockEventLoop(asyncio.SelectorEventLoop):
+    """
+    Event loop with a virtual clock for headless runs and tests.
+    Timers fire in order without any real waiting, so an hour of moods
+    completes as fast as the coroutines can execute.
+    """
+
+    def __init__(self, start=0.0):
+        selector = _VirtualSelector()
+        super().__init__(selector)
+        selector.loop = self
+        self._virtual_time = start
+
+    def time(self):
+        return self._virtual_time
+
+    def advance(self, seconds):
+        """Move the virtual clock forward."""
+        self._virtual_time += seconds
+
+    def jump_to(self, when):
+        """
+        Move the clock straight to `when` if no callback is ready and no
+        timer is due before then, since nothing else could run in between.
+        True if the clock moved; otherwise the caller should await as usual.
+        Lets replay skip a trip through the loop for every point.
+        """
+        if self._ready or (self._scheduled and self._scheduled[0].when() < when):
+            return False
+        self._virtual_time = max(self._virtual_time, when)
+        return True
+
+    def next_due(self):
+        """Earliest loop time at which another callback could run (inf if none)."""
+        if self._ready:
+            return self._virtual_time
+        if self._scheduled:
+            return self._scheduled[0].when()
+        return float("inf")
+
+
+def run_virtual(main):
+    """Run a coroutine to completion on a fresh VirtualClockEventLoop."""
+    loop = VirtualClockEventLoop()
+    try:
+        return loop.run_until_complete(main)
+    finally:
+        loop.close()
@@ -0,0 +1,325 @@
+"""
+Offline simulation of the mood scheduler.
+
+simulate() runs the real MoodScheduler on a VirtualClockEventLoop with a
+SimulatedBackend that moves nothing and keeps statistics instead, so a full
+day of moods, movements and breaks completes in about 15 s on one core,
+nearly all of it spent building and replaying the paths. Runs are
+deterministic for a given seed: every random draw goes through the seeded
+random and np.random states, and base paths are rebuilt in a fresh cache
+rather than loaded from disk.
+
+replay_virtual() stands in for trajectory.replay_async(): it hands the
+backend every point due before the loop's next callback in one call instead
+of awaiting each point's deadline.
+
+Usage:
+    mouse-mover --simulate 24 --seed 7
+"""
+import asyncio
+import collections
+import random
+import time
+
+from . import cursor
+from . import geometry
+from . import log
+from . import metrics
+from . import movements
+from . import pathcache
+from . import scheduler
+from ._lazy import lazy_import
+
+np = lazy_import("numpy")
+
+# Screen simulated when no bounds are given
+SCREEN_SIZE = (1920, 1080)
+
+
+class SimulatedBackend:
+    """
+    Pointer backend for virtual-clock runs. Remembers where the pointer
+    would be and counts injected events per minute of loop time, plus every
+    gap of at least `idle_gap` seconds between consecutive events.
+    """
+    name = "simulated"
+
+    def __init__(self, start=(0, 0), clock=None, idle_gap=1.0):
+        self.x, self.y = start
+        self.clock = clock  # loop.time() of the simulation, for single moves
+        self.idle_gap = idle_gap
+        self.events = 0
+        self.per_minute = np.zeros(60, dtype=np.int64)
+        self.gaps = []  # (loop time the gap started, seconds)
+        self.last_time = 0.0
+
+    def position(self):
+        return self.x, self.y
+
+    def move(self, x, y):
+        self.move_path(np.array([self.clock()]), np.array([x]), np.array([y]))
+
+    def move_path(self, times, xs, ys):
+        """Record points injected at the given loop times (ascending)."""
+        first, last = int(times[0] // 60), int(times[-1] // 60)
+        if last >= len(self.per_minute):
+            grown = np.zeros(last + 60, dtype=np.int64)
+            grown[:len(self.per_minute)] = self.per_minute
+            self.per_minute = grown
+        if first == last:
+            # Most movements fit within one minute
+            self.per_minute[first] += len(times)
+        else:
+            self.per_minute[first:last + 1] += np.bincount((times // 60).astype(np.int64) - first)
+
+        if times[0] - self.last_time >= self.idle_gap:
+            self.gaps.append((self.last_time, float(times[0] - self.last_time)))
+        gaps = times[1:] - times[:-1]
+        for i in np.flatnonzero(gaps >= self.idle_gap):
+            self.gaps.append((float(times[i]), float(gaps[i])))
+
+        self.events += len(times)
+        self.last_time = float(times[-1])
+        self.x, self.y = int(xs[-1]), int(ys[-1])
+
+    def finish(self, end):
+        """Close the trailing gap at the end of the run, `end` seconds."""
+        if end - self.last_time >= self.idle_gap:
+            self.gaps.append((self.last_time, end - self.last_time))
+        self.per_minute = self.per_minute[:max(1, int(np.ceil(end / 60)))]
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+async def replay_virtual(path, token=None, backend=None, label=None):
+    """
+    replay_async() for a VirtualClockEventLoop and a backend with
+    move_path(). Points are aligned to frames like replay_async() does (the
+    event cap never binds within one movement, so it is left out). Every
+    point due before the loop's next ready callback or
+    timer goes to the backend at once and the clock jumps to the last of
+    them; only such a callback can cancel the token, so a movement is
+    preempted on the same point replay_async() would stop at.
+    Returns the elapsed (virtual) time in seconds.
+    """
+    from . import trajectory
+    backend = backend or trajectory.get_backend()
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    if not len(path):
+        return 0.0
+
+    aligned = trajectory.align_to_frames(path, start)
+    times = aligned[:, 0] + start
+    xs = aligned[:, 1].astype(np.int64)
+    ys = aligned[:, 2].astype(np.int64)
+    count = len(times)
+    done = 0
+    try:
+        while done < count:
+            if token is not None and token.cancelled:
+                raise token.interrupted()
+            end = int(np.searchsorted(times, loop.next_due()))
+            if end > done:
+                loop.jump_to(times[end - 1])
+                backend.move_path(times[done:end], xs[done:end], ys[done:end])
+                metrics.INJECTED_EVENTS.inc(end - done)
+                for hook in trajectory.injection_hooks:
+                    hook(int(xs[end - 1]), int(ys[end - 1]))
+                done = end
+            else:
+                # Something else is due first and may cancel us; let it run
+                await asyncio.sleep(loop.next_due() - loop.time())
+    finally:
+        trajectory.emission.record(label, len(path), times[:done].tolist())
+
+    return loop.time() - start
+
+
+class _SimulatedScheduler(scheduler.MoodScheduler):
+    """
+    MoodScheduler that also totals loop time per mood, counts interruptions
+    and keeps how far each uninterrupted mood window was off its length.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.mood_seconds = collections.Counter()
+        self.interruptions = 0
+        self.window_errors = []
+
+    async def run_mood_cycle(self, mood_name, mood_config, duration_minutes=1):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        interruptions = self.interruptions
+        try:
+            await super().run_mood_cycle(mood_name, mood_config, duration_minutes)
+        finally:
+            # Also counts the mood cut off by the end of the simulation
+            self.mood_seconds[mood_name] += loop.time() - start
+        if self.interruptions == interruptions:
+            self.window_errors.append(loop.time() - start - duration_minutes * 60)
+
+    async def handle_movement_interruption(self):
+        self.interruptions += 1
+        await super().handle_movement_interruption()
+
+
+async def _simulate_user(mover, moves_per_hour):
+    """Report user movements at random, on average moves_per_hour times an hour."""
+    while True:
+        await asyncio.sleep(random.expovariate(moves_per_hour / 3600))
+        # Like a pointer event without coordinates: the tracker has to ask again
+        mover.backend.observe(None)
+        mover.notify_user_activity()
+
+
+def simulate(hours=24, seed=None, moods=None, transitions=None, bounds=None, margin=100,
+             user_moves_per_hour=0, idle_gap=1.0, quiet=True, event_budget=None, exclusions=None):
+    """
+    Run the mood scheduler for `hours` of virtual time and return summary
+    statistics (see summarize()). moods and transitions default to MOODS and
+    MOOD_TRANSITIONS; bounds default to SCREEN_SIZE less `margin`.
+    With user_moves_per_hour, simulated user movements trigger the
+    interruption sequence. event_budget caps pointer events per minute like
+    --event-budget. exclusions are screen rectangles to keep out of, like
+    --exclude. With quiet, the scheduler's log output is discarded.
+    """
+    if moods is None:
+        from .moods import MOODS as moods, MOOD_TRANSITIONS as transitions
+    if bounds is None:
+        width, height = SCREEN_SIZE
+        bounds = (margin, margin, width - margin - 1, height - margin - 1)
+    random.seed(seed)
+    np.random.seed(seed)
+    duration = hours * 3600
+
+    loop = scheduler.VirtualClockEventLoop()
+    start = ((bounds[0] + bounds[2]) // 2, (bounds[1] + bounds[3]) // 2)
+    backend = SimulatedBackend(start, clock=loop.time, idle_gap=idle_gap)
+    tracker = cursor.CursorTracker(backend, clock=loop.time)
+    mover = _SimulatedScheduler(moods, bounds, transitions=transitions, backend=tracker,
+                                replay=replay_virtual, event_budget=event_budget)
+
+    async def main():
+        user = None
+        if user_moves_per_hour:
+            user = asyncio.ensure_future(_simulate_user(mover, user_moves_per_hour))
+        try:
+            await asyncio.wait_for(mover.run(), duration)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            if user is not None:
+                user.cancel()
+
+    # Base paths drawn from a warm (or disk) cache would skip random draws
+    # and break reproducibility, so build them afresh for every run
+    cache, pathcache.default_cache = pathcache.default_cache, pathcache.TrajectoryCache()
+    # Likewise durations learned by an earlier run would change what fits
+    movements.REGISTRY.reset()
+    logger = log.get_logger()
+    level = logger.level
+    if quiet:
+        logger.level = log.ERROR + 1
+    zones = geometry.exclusions
+    if exclusions:
+        geometry.set_exclusions(exclusions)
+    wall = time.perf_counter()
+    try:
+        loop.run_until_complete(main())
+    finally:
+        # Let the writer pass over the run's records before output resumes
+        logger.flush()
+        logger.level = level
+        pathcache.default_cache = cache
+        geometry.exclusions = zones
+        loop.close()
+    backend.finish(duration)
+
+    summary = summarize(mover, backend, duration)
+    summary.update(seed=seed, wall_s=time.perf_counter() - wall)
+    return summary
+
+
+def summarize(mover, backend, duration):
+    """Mood share, events per minute and idle gaps of a finished simulation."""
+    moods = {name: mover.moods.configs[name]["name"] for name in mover.moods.names}
+    share = {moods[name]: seconds / duration for name, seconds in mover.mood_seconds.most_common()}
+    share["between moods"] = max(0.0, 1 - sum(share.values()))
+
+    per_minute = backend.per_minute
+    gaps = np.array([seconds for _, seconds in backend.gaps]) if backend.gaps else np.zeros(1)
+    errors = np.array(mover.window_errors)
+    longest_at, longest = max(backend.gaps, key=lambda gap: gap[1], default=(0.0, 0.0))
+    return {
+        "hours": duration / 3600,
+        "mood_share": share,
+        "events": backend.events,
+        "events_per_minute": {
+            "mean": float(per_minute.mean()),
+            "p50": float(np.percentile(per_minute, 50)),
+            "p95": float(np.percentile(per_minute, 95)),
+            "max": int(per_minute.max()),
+            "silent_minutes": int((per_minute == 0).sum()),
+        },
+        "idle_gaps": {
+            "min_s": backend.idle_gap,
+            "count": len(backend.gaps),
+            "total_s": float(gaps.sum()) if backend.gaps else 0.0,
+            "mean_s": float(gaps.mean()) if backend.gaps else 0.0,
+            "p95_s": float(np.percentile(gaps, 95)) if backend.gaps else 0.0,
+        },
+        "longest_gap_s": longest,
+        "longest_gap_at_s": longest_at,
+        "interruptions": mover.interruptions,
+        "position_reads": {
+            "local": mover.backend.local_reads,
+            "round_trips": mover.backend.round_trips,
+            "saved_per_hour": mover.backend.local_reads / (duration / 3600),
+        },
+        "mood_windows": {
+            "count": len(errors),
+            "mean_error_s": float(np.abs(errors).mean()) if len(errors) else 0.0,
+            "worst_overrun_s": float(max(errors.max(), 0.0)) if len(errors) else 0.0,
+            "worst_underrun_s": float(max(-errors.min(), 0.0)) if len(errors) else 0.0,
+        },
+    }
+
+
+def _clock(seconds):
+    """Loop time as h:mm:ss since the start of the simulation."""
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+def format_summary(summary):
+    """Human-readable report of a simulate() result."""
+    rate = summary["events_per_minute"]
+    gaps = summary["idle_gaps"]
+    windows = summary["mood_windows"]
+    reads = summary["position_reads"]
+    lines = [f"📊 Simulated {summary['hours']:.1f} h (seed {summary['seed']}) "
+             f"in {summary['wall_s']:.1f} s", "Mood share:"]
+    for mood, share in summary["mood_share"].items():
+        lines.append(f"  {mood:<20}{100 * share:6.1f}%")
+    lines += [
+        f"Events: {summary['events']:,} ({rate['mean']:.0f}/min mean, p50 {rate['p50']:.0f}, "
+        f"p95 {rate['p95']:.0f}, max {rate['max']}; {rate['silent_minutes']} silent minute(s))",
+        f"Idle gaps of {gaps['min_s']:g}s or more: {gaps['count']:,} totalling "
+        f"{gaps['total_s'] / 3600:.1f} h ({100 * gaps['total_s'] / (3600 * summary['hours']):.1f}%), "
+        f"mean {gaps['mean_s']:.1f} s, p95 {gaps['p95_s']:.1f} s",
+        f"Longest gap without movement: {summary['longest_gap_s']:.1f} s "
+        f"at {_clock(summary['longest_gap_at_s'])}",
+        f"User interruptions: {summary['interruptions']}",
+        f"Position reads: {reads['local']:,} from memory, {reads['round_trips']:,} round trip(s) "
+        f"({reads['saved_per_hour']:,.0f} round trips saved per hour)",
+        f"Mood windows: {windows['count']} uninterrupted, off by {windows['mean_error_s']:.2f} s mean, "
+        f"worst overrun {windows['worst_overrun_s']:.2f} s, underrun {windows['worst_underrun_s']:.2f} s",
+    ]
+    return "\n".join(lines)
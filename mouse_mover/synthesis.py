@@ -0,0 +1,214 @@
+"""
+Vectorized synthesis of human-like pointer motion.
+
+Instead of straight tweens between hand-picked waypoints, movements can ask
+for paths shaped like real reaching motion:
+
+- minimum-jerk timing: the bell-shaped speed profile of a human reach
+- Bezier curvature: a random sideways bow instead of a ruler-straight line
+- overshoot: some reaches land past the target and correct back, like the
+  micro-corrections people make
+- tremor: a faint 8-12 Hz physiological tremor, faded out at the endpoints
+
+plus WindMouse, the gravity-and-wind random walk, as an alternative shape.
+
+Everything works on batches: reach() and windmouse() build B paths in one
+set of NumPy operations and return a PathBatch of (B, N, 3) padded (t, x, y)
+arrays, which can be filtered by bounds before one is picked. reach_path()
+is the single-path convenience the movements use.
+
+Randomness comes from `rng`, a numpy Generator or RandomState; the default
+is the global np.random state, so np.random.seed() makes results repeatable.
+"""
+
+from . import geometry
+from . import trajectory
+from ._lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+def minimum_jerk(tau):
+    """Minimum-jerk position profile: 0 at tau=0 to 1 at tau=1."""
+    return tau ** 3 * (10 - 15 * tau + 6 * tau ** 2)
+
+
+class PathBatch:
+    """
+    B paths padded to a common length: paths[i, :lengths[i]] is path i as
+    (t, x, y) rows; the padding repeats its last point.
+    """
+
+    def __init__(self, paths, lengths):
+        self.paths = paths
+        self.lengths = lengths
+
+    def __len__(self):
+        return len(self.paths)
+
+    def path(self, i):
+        """Path i as a standalone (N, 3) array."""
+        return self.paths[i, :self.lengths[i]].copy()
+
+    def within(self, min_x, min_y, max_x, max_y):
+        """Mask of paths that stay inside the bounds (and on real monitors)."""
+        x = self.paths[..., 1]
+        y = self.paths[..., 2]
+        inside = (x >= min_x) & (x <= max_x) & (y >= min_y) & (y <= max_y)
+        screen = geometry.active
+        if screen is not None and len(screen) > 1:
+            cx, cy = screen.clamp_points(x.ravel(), y.ravel())
+            inside &= ((cx == x.ravel()) & (cy == y.ravel())).reshape(x.shape)
+        # Padding repeats the last point, so it never changes the answer
+        return inside.all(axis=1)
+
+    def select(self, mask):
+        """Batch of the paths where mask is True."""
+        return PathBatch(self.paths[mask], self.lengths[mask])
+
+
+def _broadcast(starts, ends, durations):
+    starts = np.asarray(starts, dtype=float).reshape(-1, 2)
+    ends = np.asarray(ends, dtype=float).reshape(-1, 2)
+    durations = np.asarray(durations, dtype=float).reshape(-1)
+    size = max(len(starts), len(ends), len(durations))
+    # broadcast_to() is slow next to a small batch; only shared values need it
+    if len(starts) != size:
+        starts = np.broadcast_to(starts, (size, 2))
+    if len(ends) != size:
+        ends = np.broadcast_to(ends, (size, 2))
+    if len(durations) != size:
+        durations = np.broadcast_to(durations, (size,))
+    return starts, ends, durations
+
+
+def _timeline(durations, rate):
+    """Per-path point counts and the (B, N) progress 0..1 of every point."""
+    steps = np.maximum(1, np.ceil(durations * rate)).astype(np.int64)
+    k = np.arange(1, steps.max() + 1)
+    tau = np.minimum(k / steps[:, None], 1.0)
+    return steps, tau
+
+
+def reach(starts, ends, durations, rate=None, curvature=0.2,
+          overshoot=0.3, tremor=0.8, rng=None):
+    """
+    Batch of reaching movements from starts to ends, one per row; any of the
+    three may be a single value shared by the batch. Sampled at `rate`
+    points per second, by default trajectory.frame_rate().
+    curvature: sideways bow as a fraction of the distance (normal spread)
+    overshoot: probability that a reach lands past the target and corrects
+    tremor: tremor amplitude in pixels
+    """
+    rng = np.random if rng is None else rng
+    starts, ends, durations = _broadcast(starts, ends, durations)
+    size = len(starts)
+    steps, tau = _timeline(durations, rate or trajectory.frame_rate())
+
+    delta = ends - starts
+    distance = np.hypot(delta[:, 0], delta[:, 1])
+    direction = delta / np.maximum(distance, 1e-9)[:, None]
+    normal = np.column_stack((-direction[:, 1], direction[:, 0]))
+
+    # Overshooting reaches aim past the target, then correct back to it
+    overshoots = rng.random(size) < overshoot
+    extra = np.where(overshoots, distance * rng.uniform(0.03, 0.1, size), 0.0)
+    aim = ends + direction * extra[:, None] + normal * (extra * rng.normal(0, 0.3, size))[:, None]
+    split = np.where(overshoots, rng.uniform(0.75, 0.88, size), 1.0)  # share of time for the main reach
+
+    # Main reach along a cubic Bezier whose control points bow sideways
+    travel = aim - starts
+    bow = (curvature * distance)[:, None]
+    c1 = starts + travel / 3 + normal * bow * rng.normal(0, 1, (size, 1))
+    c2 = starts + travel * 2 / 3 + normal * bow * rng.normal(0, 1, (size, 1))
+    s = minimum_jerk(np.clip(tau / split[:, None], 0, 1))[..., None]
+    # The Bezier in power form, evaluated with Horner's rule
+    a1 = 3 * (c1 - starts)
+    a2 = 3 * (c2 - 2 * c1 + starts)
+    a3 = aim - starts + 3 * (c1 - c2)
+    xy = ((a3[:, None] * s + a2[:, None]) * s + a1[:, None]) * s + starts[:, None]
+
+    # Correction from the aim point back onto the target
+    if overshoots.any():
+        remaining = np.maximum(1 - split, 1e-9)[:, None]
+        correction = minimum_jerk(np.clip((tau - split[:, None]) / remaining, 0, 1))
+        xy += correction[..., None] * (ends - aim)[:, None]
+
+    t = tau * durations[:, None]
+    if tremor:
+        # Independent x/y tremor, faded in and out so the endpoints stay exact
+        frequency = rng.uniform(8, 12, (size, 1, 2))
+        phase = rng.uniform(0, 2 * np.pi, (size, 1, 2))
+        envelope = np.sin(np.pi * tau)[..., None]
+        xy += tremor * envelope * np.sin(2 * np.pi * frequency * t[..., None] + phase)
+
+    return PathBatch(np.concatenate((t[..., None], xy), axis=2), steps)
+
+
+def windmouse(starts, ends, durations, rate=None, gravity=9.0, wind=3.0,
+              max_step=15.0, target_area=12.0, max_iterations=1000, rng=None):
+    """
+    Batch of WindMouse paths: a walker pulled towards the target by gravity
+    and pushed around by a random wind, stepped for the whole batch at
+    once, then resampled onto `rate` with minimum-jerk timing.
+    """
+    rng = np.random if rng is None else rng
+    starts, ends, durations = _broadcast(starts, ends, durations)
+    size = len(starts)
+    position = starts.copy()
+    velocity = np.zeros((size, 2))
+    gust = np.zeros((size, 2))
+    trail = [position.copy()]
+    arrived_at = np.full(size, -1)
+
+    for step in range(1, max_iterations + 1):
+        delta = ends - position
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        arriving = (distance < 1) & (arrived_at < 0)
+        arrived_at[arriving] = step - 1
+        moving = arrived_at < 0
+        if not moving.any():
+            break
+        far = (distance >= target_area)[:, None]
+        # Wind keeps changing far from the target and dies down close to it
+        strength = np.minimum(wind, distance)[:, None]
+        gust = np.where(far, gust / np.sqrt(3) + (2 * rng.random((size, 2)) - 1) * strength / np.sqrt(5),
+                        gust / np.sqrt(2))
+        velocity += gust + gravity * delta / np.maximum(distance, 1e-9)[:, None]
+        speed = np.hypot(velocity[:, 0], velocity[:, 1])
+        limit = np.where(far[:, 0], max_step, np.maximum(1.0, max_step / 3))
+        too_fast = speed > limit
+        scale = (limit / 2 + rng.random(size) * limit / 2) / np.maximum(speed, 1e-9)
+        velocity[too_fast] *= scale[too_fast, None]
+        position = np.where(moving[:, None], position + velocity, ends)
+        trail.append(position.copy())
+    arrived_at[arrived_at < 0] = len(trail) - 1
+    trail = np.stack(trail, axis=1)
+    trail[np.arange(size), arrived_at] = ends  # land exactly on the target
+
+    # Resample each walk onto the output rate, spending time like a human reach
+    steps, tau = _timeline(durations, rate or trajectory.frame_rate())
+    where = minimum_jerk(tau) * arrived_at[:, None]
+    low = np.floor(where).astype(np.int64)
+    high = np.minimum(low + 1, arrived_at[:, None])
+    frac = (where - low)[..., None]
+    rows = np.arange(size)[:, None]
+    xy = trail[rows, low] * (1 - frac) + trail[rows, high] * frac
+    t = tau * durations[:, None]
+    return PathBatch(np.concatenate((t[..., None], xy), axis=2), steps)
+
+
+def reach_path(start, end, duration, bounds, candidates=8, rng=None, **options):
+    """
+    One reach from start to end that stays inside bounds: up to
+    `candidates` reaches are generated and the first that fits is returned
+    (or the first one, to be clamped, if none does). Most single reaches
+    fit, so one is tried before the rest come in a batch. Options go to
+    reach().
+    """
+    first = reach(start, end, float(duration), rng=rng, **options)
+    if candidates <= 1 or first.within(*bounds)[0]:
+        return first.path(0)
+    batch = reach(start, end, np.full(candidates - 1, float(duration)), rng=rng, **options)
+    fits = np.flatnonzero(batch.within(*bounds))
+    return batch.path(fits[0]) if len(fits) else first.path(0)
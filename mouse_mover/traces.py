@@ -0,0 +1,315 @@
+"""
+Recorded human pointer traces in a compact, streamable binary format.
+
+A trace file (.mmtrace) is a header followed by independent chunks:
+
+    header: b"MMTR", version, recorded screen bounds (4 x int32)
+    chunk:  point count, time bytes, absolute x0/y0, t0 and span in ms,
+            then int16 dx[count], int16 dy[count] position deltas and one
+            varint per point with the milliseconds since the previous point
+
+Positions cost 4 bytes per point and timestamps usually 1, so an hour at
+100 Hz is about 1.8 MB. Files are memory-mapped and opening one only reads
+the chunk headers; chunks are decoded one at a time with vectorized NumPy,
+so replay streams through a file without ever loading it whole.
+
+Traces are rescaled from the screen they were recorded on to the current
+bounds as they stream. With a library set (set_library()), the
+recorded_trace movement replays a random few seconds of a random trace.
+
+Usage:
+    mouse-mover-traces record traces/desk.mmtrace --seconds 3600
+    mouse-mover-traces info traces/
+    mouse-mover-traces play traces/desk.mmtrace
+"""
+import argparse
+import glob
+import mmap
+import os
+import random
+import struct
+import sys
+
+from . import log
+from . import pacing
+from . import trajectory
+from ._lazy import lazy_import
+
+np = lazy_import("numpy")
+
+MAGIC = b"MMTR"
+VERSION = 1
+HEADER = struct.Struct("<4sB3xiiii")      # magic, version, recorded min_x, min_y, max_x, max_y
+CHUNK_HEADER = struct.Struct("<IIiiQI")   # count, time bytes, x0, y0, t0 ms, span ms
+INT16_MAX = 32767
+
+library = None  # TraceLibrary used by the recorded_trace movement
+
+
+def encode_varints(values):
+    """LEB128-encode non-negative integers."""
+    out = bytearray()
+    for value in values:
+        value = int(value)
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+
+def decode_varints(buffer):
+    """Decode LEB128 integers from a bytes-like object, vectorized."""
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    if not len(data):
+        return np.empty(0, dtype=np.int64)
+    last = (data & 0x80) == 0  # final byte of each value
+    starts = np.flatnonzero(np.concatenate(([True], last[:-1])))
+    value_of_byte = np.cumsum(np.concatenate(([0], last[:-1])))
+    shift = 7 * (np.arange(len(data)) - starts[value_of_byte])
+    parts = (data & 0x7F).astype(np.int64) << shift
+    return np.add.reduceat(parts, starts)
+
+
+class TraceWriter:
+    """Appends (t, x, y) points to a trace file, one chunk at a time."""
+
+    def __init__(self, filename, bounds, chunk_size=4096):
+        self.chunk_size = chunk_size
+        self._file = open(filename, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, *bounds))
+        self._points = []  # (t ms, x, y) of the open chunk
+
+    def add(self, t, x, y):
+        """Add a point `t` seconds into the recording; t must not decrease."""
+        if self._points:
+            _, last_x, last_y = self._points[-1]
+            # Deltas must fit in int16; a new chunk restarts from absolute values
+            if abs(x - last_x) > INT16_MAX or abs(y - last_y) > INT16_MAX:
+                self._flush()
+        self._points.append((int(round(t * 1000)), int(x), int(y)))
+        if len(self._points) >= self.chunk_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._points:
+            return
+        points = np.asarray(self._points, dtype=np.int64)
+        t0, x0, y0 = points[0]
+        dt = np.maximum(0, np.diff(points[:, 0], prepend=t0))
+        times = encode_varints(dt)
+        self._file.write(CHUNK_HEADER.pack(len(points), len(times), x0, y0, t0, points[-1, 0] - t0))
+        self._file.write(np.diff(points[:, 1], prepend=x0).astype("<i2").tobytes())
+        self._file.write(np.diff(points[:, 2], prepend=y0).astype("<i2").tobytes())
+        self._file.write(times)
+        self._points = []
+
+    def close(self):
+        self._flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TraceFile:
+    """Memory-mapped trace file; only chunk headers are read on open."""
+
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self._map)
+        if size < HEADER.size:
+            raise ValueError(f"{filename} is not a version {VERSION} trace file")
+        magic, version, *bounds = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{filename} is not a version {VERSION} trace file")
+        self.bounds = tuple(bounds)  # screen the trace was recorded on
+
+        self.chunks = []  # (offset, count, time bytes, x0, y0, t0 ms)
+        offset = HEADER.size
+        last_span = 0
+        while offset < size:
+            # A recording killed mid-flush leaves a partial chunk at the end
+            end = offset + CHUNK_HEADER.size
+            if end <= size:
+                count, time_bytes, x0, y0, t0, span = CHUNK_HEADER.unpack_from(self._map, offset)
+                end += 4 * count + time_bytes
+            if end > size:
+                log.warning("%s ends in a partial chunk, ignoring its last %d bytes", filename, size - offset)
+                break
+            self.chunks.append((offset + CHUNK_HEADER.size, count, time_bytes, x0, y0, t0))
+            last_span = span
+            offset = end
+        self.points = sum(chunk[1] for chunk in self.chunks)
+        self.duration = (self.chunks[-1][5] + last_span) / 1000 if self.chunks else 0.0
+
+    def chunk(self, index):
+        """Decode one chunk into a (t, x, y) array in recorded coordinates."""
+        offset, count, time_bytes, x0, y0, t0 = self.chunks[index]
+        dx = np.frombuffer(self._map, dtype="<i2", count=count, offset=offset)
+        dy = np.frombuffer(self._map, dtype="<i2", count=count, offset=offset + 2 * count)
+        dt = decode_varints(self._map[offset + 4 * count:offset + 4 * count + time_bytes])
+        if len(dt) != count:
+            raise ValueError(f"{self.filename}: chunk {index} has {len(dt)} timestamps for {count} points")
+        return np.column_stack(((t0 + np.cumsum(dt)) / 1000,
+                                x0 + np.cumsum(dx, dtype=np.int64),
+                                y0 + np.cumsum(dy, dtype=np.int64)))
+
+    def stream(self, bounds=None, first=0):
+        """Yield chunks from `first` on, rescaled to `bounds` if given."""
+        for index in range(first, len(self.chunks)):
+            chunk = self.chunk(index)
+            yield chunk if bounds is None else rescale(chunk, self.bounds, bounds)
+
+    def close(self):
+        self._map.close()
+
+
+def rescale(path, source, target):
+    """Map a path's x/y from the source bounds onto the target bounds in place."""
+    for column, (s0, s1, t0, t1) in ((1, (source[0], source[2], target[0], target[2])),
+                                     (2, (source[1], source[3], target[1], target[3]))):
+        path[:, column] -= s0
+        path[:, column] *= (t1 - t0) / max(1, s1 - s0)
+        path[:, column] += t0
+    return path
+
+
+class TraceLibrary:
+    """All .mmtrace files in a directory, opened lazily by header only."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.files = [TraceFile(name) for name in sorted(glob.glob(os.path.join(directory, "*.mmtrace")))]
+        # Single-point traces have nothing to replay and no weight to be drawn by
+        self.files = [trace for trace in self.files if trace.chunks and trace.duration > 0]
+        self.duration = sum(trace.duration for trace in self.files)
+
+    def segment(self, seconds, bounds, rng=random):
+        """
+        A random `seconds`-long stretch of some trace, rescaled to bounds,
+        with times starting at 0. Streams only the chunks it needs.
+        """
+        if not self.files:
+            raise ValueError(f"no traces in {self.directory}")
+        weights = [trace.duration for trace in self.files]
+        trace = rng.choices(self.files, weights)[0]
+        first = rng.randrange(len(trace.chunks))
+
+        parts = []
+        collected = 0.0
+        for chunk in trace.stream(bounds, first):
+            if not parts:
+                chunk = chunk[rng.randrange(len(chunk)):]  # start anywhere in the first chunk
+            parts.append(chunk)
+            collected = chunk[-1, 0] - parts[0][0, 0]
+            if collected >= seconds:
+                break
+        path = np.concatenate(parts)
+        path[:, 0] -= path[0, 0]
+        return path[path[:, 0] <= seconds]
+
+
+def set_library(directory):
+    """Load the trace library used by the recorded_trace movement (None to unset)."""
+    global library
+    library = TraceLibrary(os.path.expanduser(directory)) if directory else None
+    if library is not None:
+        log.info("Loaded %d trace(s), %.1f minutes", len(library.files), library.duration / 60)
+    return library
+
+
+def record(filename, seconds, bounds, rate=100, backend=None):
+    """
+    Record the pointer for `seconds` by sampling its position `rate` times a
+    second, storing a point only when it moved. Returns the point count.
+    """
+    backend = backend or trajectory.get_backend()
+    # The real pointer, not a cursor.CursorTracker's memory of it
+    read_position = getattr(backend, "sync", backend.position)
+    pacer = pacing.get_pacer()
+    interval = 1 / rate
+    count = 0
+    last = None
+    with TraceWriter(filename, bounds) as writer:
+        start = pacer.clock()
+        deadline = start
+        while True:
+            now = pacer.clock() - start
+            if now >= seconds:
+                break
+            position = read_position()
+            if position != last:
+                writer.add(now, *position)
+                last = position
+                count += 1
+            deadline += interval
+            pacer.sleep_until(deadline)
+    return count
+
+
+def play(filename, bounds, token=None, backend=None):
+    """Replay a whole trace file chunk by chunk; returns elapsed seconds."""
+    trace = TraceFile(filename)
+    elapsed = 0.0
+    try:
+        for chunk in trace.stream(bounds):
+            chunk[:, 0] -= elapsed  # chunk times continue the trace's timeline
+            trajectory.fit(chunk, *bounds)
+            elapsed += trajectory.replay(chunk, token, backend)
+    finally:
+        trace.close()
+    return elapsed
+
+
+def _screen_bounds(margin=0):
+    """Bounding box of this machine's monitors, shrunk by margin."""
+    from . import geometry
+    from screeninfo import get_monitors
+    if not margin:
+        return geometry.virtual_screen(get_monitors())
+    index = geometry.MonitorIndex(get_monitors(), margin)
+    geometry.set_active(index)
+    return index.bounds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="mouse-mover-traces", description="Record, inspect and replay pointer traces.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_parser = commands.add_parser("record", help="record the pointer into a trace file")
+    record_parser.add_argument("file")
+    record_parser.add_argument("--seconds", type=float, default=600)
+    record_parser.add_argument("--rate", type=float, default=100, help="position samples per second")
+    info_parser = commands.add_parser("info", help="describe trace files or a library directory")
+    info_parser.add_argument("paths", nargs="+")
+    play_parser = commands.add_parser("play", help="replay a trace file on this screen")
+    play_parser.add_argument("file")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        print(f"Recording the pointer for {args.seconds:.0f} seconds into {args.file}...")
+        count = record(args.file, args.seconds, _screen_bounds(), args.rate)
+        print(f"Recorded {count} points, {os.path.getsize(args.file) / 1024:.1f} KiB")
+    elif args.command == "info":
+        for path in args.paths:
+            names = sorted(glob.glob(os.path.join(path, "*.mmtrace"))) if os.path.isdir(path) else [path]
+            for name in names:
+                trace = TraceFile(name)
+                size = os.path.getsize(name)
+                print(f"{name}: {trace.duration / 60:.1f} min, {trace.points} points in "
+                      f"{len(trace.chunks)} chunks, {size / 1024:.1f} KiB "
+                      f"({size / max(1, trace.points):.2f} bytes/point), recorded on {trace.bounds}")
+                trace.close()
+    elif args.command == "play":
+        print(f"Replaying {args.file}... Press Ctrl+C to stop.")
+        play(args.file, _screen_bounds(margin=100))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
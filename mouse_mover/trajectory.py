@@ -0,0 +1,502 @@
+"""
+Precomputed trajectory engine.
+
+Movements describe their whole path up front as a list of waypoints, which
+PathBuilder turns into one (t, x, y) NumPy array. replay() then injects each
+point against an absolute deadline measured from the start of the movement,
+so per-point cost is a single injection and timing errors never accumulate.
+
+Deadlines are aligned to display frames: paths are sampled at frame_rate()
+and replay keeps one point per frame, so we never inject positions the
+screen would not show. With a max_error, frames are thinned further to
+those needed to keep the shown pointer within max_error pixels of the path
+(see thin()), so slow stretches cost few events and fast ones keep every
+frame. event_cap limits injected events per second across every replay in
+the process.
+"""
+import threading
+import time
+from collections import deque
+
+from . import backends
+from . import geometry
+from . import metrics
+from . import pacing
+from ._lazy import lazy_import
+
+np = lazy_import("numpy")
+
+SAMPLE_RATE = 60  # Frames per second when the display refresh rate is unknown
+
+# Frames per second points are emitted at, normally the monitor refresh rate
+# (see set_emission_rate())
+emission_rate = SAMPLE_RATE
+
+# Most pixels the shown pointer may lag the path by to save events; 0 emits
+# every frame (see set_max_error())
+max_error = 0.0
+
+# Callables run with (x, y) just before every injected point, e.g. so the
+# detection listener can recognise our own pointer events
+injection_hooks = []
+
+_backend = None  # Created on first use, see get_backend()
+
+
+class PathBuilder:
+    """
+    Collects straight-line moves and holds, then builds them into a path.
+    Each move is linearly interpolated like pyautogui's default tween, at
+    frame_rate() points per second unless `rate` says otherwise.
+    """
+
+    def __init__(self, start, rate=None):
+        self.start = (float(start[0]), float(start[1]))
+        self.rate = rate or frame_rate()
+        self._segments = []  # rows of (x, y, duration, hold_after)
+
+    def move_to(self, x, y, duration):
+        """Move to (x, y) over `duration` seconds."""
+        self._segments.append((x, y, max(0.0, duration), 0.0))
+        return self
+
+    def pause(self, seconds):
+        """Hold the current position for `seconds` before the next move."""
+        if self._segments:
+            x, y, duration, hold = self._segments[-1]
+            self._segments[-1] = (x, y, duration, hold + seconds)
+        else:
+            # Nothing to attach the hold to yet; stay on the start point
+            self._segments.append((self.start[0], self.start[1], 0.0, seconds))
+        return self
+
+    def build(self, min_x, min_y, max_x, max_y):
+        """
+        Return the (N, 3) array of (t, x, y) points, clamped to the bounds
+        and, with an active geometry index, onto the nearest real monitor.
+        """
+        return fit(self.points(), min_x, min_y, max_x, max_y)
+
+    def points(self):
+        """The (N, 3) array of (t, x, y) points, unrounded and unclamped."""
+        if not self._segments:
+            return np.empty((0, 3))
+
+        seg = np.asarray(self._segments, dtype=float)
+        x1, y1, duration, hold = seg.T
+        x0 = np.concatenate(([self.start[0]], x1[:-1]))
+        y0 = np.concatenate(([self.start[1]], y1[:-1]))
+
+        # Points per segment and where each segment starts on the timeline
+        steps = np.maximum(1, np.ceil(duration * self.rate)).astype(np.int64)
+        seg_start = np.concatenate(([0.0], np.cumsum(duration + hold)[:-1]))
+
+        # Expand every segment into its interpolated points in one go
+        idx = np.repeat(np.arange(len(seg)), steps)
+        first = np.repeat(np.cumsum(steps) - steps, steps)
+        frac = (np.arange(len(idx)) - first + 1) / steps[idx]
+
+        t = seg_start[idx] + frac * duration[idx]
+        x = x0[idx] + (x1 - x0)[idx] * frac
+        y = y0[idx] + (y1 - y0)[idx] * frac
+
+        path = np.column_stack((t, x, y))
+        if hold[-1] > 0:
+            # Keep a trailing hold as part of the movement's duration
+            end = seg_start[-1] + duration[-1] + hold[-1]
+            path = np.vstack((path, (end, x1[-1], y1[-1])))
+        return path
+
+
+def clamp(path, min_x, min_y, max_x, max_y):
+    """Round and clamp the x/y columns of a path to the given bounds in place."""
+    np.rint(path[:, 1:], out=path[:, 1:])
+    np.clip(path[:, 1], min_x, max_x, out=path[:, 1])
+    np.clip(path[:, 2], min_y, max_y, out=path[:, 2])
+    return path
+
+
+def fit(path, min_x, min_y, max_x, max_y):
+    """
+    clamp() a path, then onto the nearest real monitor if geometry knows
+    them, and around any exclusion zones.
+    """
+    return geometry.clamp_path(clamp(path, min_x, min_y, max_x, max_y), (min_x, min_y, max_x, max_y))
+
+
+def duration(path):
+    """Total duration of a path in seconds."""
+    return float(path[-1, 0]) if len(path) else 0.0
+
+
+class EventCap:
+    """
+    Global limit on injected events per second, shared by every replay.
+    Works on deadlines rather than wake-up times, so jitter never costs a
+    point: a deadline closer than 1/limit to the previous one is pushed back
+    to that spacing instead of dropped, which can only happen where one
+    movement ends and the next begins.
+    """
+
+    def __init__(self, limit=None):
+        self.limit = limit  # events per second; None for no cap
+        self._clock = None
+        self._last = float("-inf")
+
+    def slot(self, deadline, clock):
+        """Deadline to inject at for a point due at `deadline` on `clock`."""
+        if not self.limit:
+            return deadline
+        if clock != self._clock:
+            # Deadlines on another clock can't be compared with ours
+            self._clock, self._last = clock, float("-inf")
+        deadline = max(deadline, self._last + 1 / self.limit)
+        self._last = deadline
+        return deadline
+
+
+class EmissionStats:
+    """
+    Per-movement injection counts: path points in, events out (the rest
+    coalesced into frames or skipped as overdue) and the most events whose
+    deadlines fall within any one second.
+    """
+
+    def __init__(self):
+        self.movements = {}
+        self.last_deadlines = []  # deadlines of the most recent replay's events
+
+    def record(self, label, points, deadlines):
+        """Add one replay of `points` path points that injected at `deadlines`."""
+        label = label or "other"
+        self.last_deadlines = deadlines
+        stats = self.movements.setdefault(label, {"replays": 0, "points": 0, "events": 0,
+                                                  "peak_per_second": 0})
+        stats["replays"] += 1
+        stats["points"] += points
+        stats["events"] += len(deadlines)
+        if deadlines:
+            d = np.asarray(deadlines)
+            # Events in the one-second window starting at each event
+            peak = int((np.searchsorted(d, d + (1.0 - 1e-9)) - np.arange(len(d))).max())
+            if peak > stats["peak_per_second"]:
+                stats["peak_per_second"] = peak
+                metrics.PEAK_EVENT_RATE.labels(label).set(peak)
+        metrics.COALESCED_POINTS.inc(points - len(deadlines))
+
+
+event_cap = EventCap()
+emission = EmissionStats()
+
+
+def set_emission_rate(rate, cap=None):
+    """Emit at `rate` frames per second, with at most `cap` events per second (None: no cap)."""
+    global emission_rate
+    emission_rate = rate
+    event_cap.limit = cap
+
+
+def set_max_error(pixels):
+    """Thin emitted frames to those needed to stay within `pixels` of every path (0: every frame)."""
+    global max_error
+    max_error = pixels or 0.0
+
+
+def frame_rate():
+    """Frames per second that paths are sampled and replayed at."""
+    if event_cap.limit:
+        return min(emission_rate, event_cap.limit)
+    return emission_rate
+
+
+def align_to_frames(path, start, rate=None, error=None):
+    """
+    Copy of a path with every point moved to the first frame boundary after
+    its deadline (start + t, on a clock whose frames of 1/rate seconds
+    begin at 0) and only the last point of each frame kept: the display
+    shows one position per refresh, so the others would be wasted events.
+    The frames are then thinned to within `error` pixels (default
+    max_error). Times stay relative to start.
+    """
+    rate = rate or frame_rate()
+    if not len(path):
+        return np.array(path, dtype=float)
+    frame = np.floor((start + path[:, 0]) * rate) + 1
+    last = np.ones(len(path), dtype=bool)
+    last[:-1] = frame[1:] != frame[:-1]
+    aligned = path[last]
+    aligned[:, 0] = frame[last] / rate - start
+    return thin(aligned, max_error if error is None else error, rate)
+
+
+def thin(path, error, rate=None):
+    """
+    The points of a frame-aligned path needed to keep the pointer within
+    `error` pixels of every dropped point. The pointer stays where the
+    last event put it, so a point is only needed once the path has
+    travelled `error` pixels from the previous one: points are kept where
+    the distance travelled enters a new `error`-long stretch. This bounds
+    lag, so only speed decides what is dropped: stretches moving less than
+    `error` pixels a frame (drift, slow reaches, the ends of a reach) lose
+    points, and anything faster keeps every frame, however it curves. A
+    curvature term couldn't save more without breaking the bound, since the
+    pointer jumps between events rather than following a chord. The last
+    point, and the last point before a pause, are always kept so the
+    pointer rests exactly where the path does.
+    """
+    if not error or len(path) < 3:
+        return path
+    rate = rate or frame_rate()
+    step = np.hypot(np.diff(path[:, 1]), np.diff(path[:, 2]))
+    stretch = np.floor(np.concatenate(([0.0], np.cumsum(step))) / error)
+    keep = np.ones(len(path), dtype=bool)
+    keep[1:] = stretch[1:] != stretch[:-1]
+    keep[:-1] |= np.diff(path[:, 0]) > 1.5 / rate
+    keep[-1] = True
+    return path[keep]
+
+
+def replay_duration(path, start, rate=None):
+    """
+    Seconds replaying a path from loop time `start` takes: align_to_frames()
+    moves its last point up to a frame past the path's own duration.
+    """
+    if not len(path):
+        return 0.0
+    rate = rate or frame_rate()
+    return float(np.floor((start + path[-1, 0]) * rate) + 1) / rate - start
+
+
+def event_count(path):
+    """Events replaying a path injects, at the current frame rate and max_error."""
+    return len(align_to_frames(path, 0.0))
+
+
+def get_backend():
+    """The injection backend used when none is passed explicitly."""
+    global _backend
+    if _backend is None:
+        _backend = backends.default_backend()
+    return _backend
+
+
+def set_backend(backend):
+    """Replace the default injection backend, e.g. with a RecordingBackend."""
+    global _backend
+    _backend = backend
+
+
+def position():
+    """
+    Current mouse position as an (x, y) tuple; from memory when the backend
+    is a cursor.CursorTracker.
+    """
+    return get_backend().position()
+
+
+def sync_position():
+    """Where the pointer really is, asking the backend even behind a cursor.CursorTracker."""
+    backend = get_backend()
+    return backend.sync() if hasattr(backend, "sync") else backend.position()
+
+
+def inject(x, y, backend=None):
+    """Move the pointer to (x, y) immediately."""
+    backend = backend or get_backend()
+    for hook in injection_hooks:
+        hook(x, y)
+    backend.move(x, y)
+    backend.flush()
+
+
+class MovementInterrupted(Exception):
+    """Raised by replay when its cancel token fires mid-path."""
+
+    def __init__(self, latency):
+        super().__init__(f"movement preempted after {latency * 1000:.2f} ms")
+        self.latency = latency  # seconds from cancel() to giving up the pointer
+
+
+class CancelToken:
+    """
+    Cooperative cancellation flag checked between injected points.
+    cancel() is thread-safe, so the detection listener can fire it directly.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks = []
+        self.cancelled_at = None  # perf_counter() time of the first cancel()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        if self._event.is_set():
+            return
+        self.cancelled_at = time.perf_counter()
+        self._event.set()
+        for callback in list(self._callbacks):
+            callback()
+
+    def reset(self):
+        """Re-arm the token for the next movement."""
+        self.cancelled_at = None
+        self._event.clear()
+
+    def wait(self, timeout):
+        """Sleep up to timeout seconds, waking early on cancel(); True if cancelled."""
+        return self._event.wait(timeout)
+
+    def add_callback(self, callback):
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        self._callbacks.remove(callback)
+
+    def interrupted(self):
+        """Build the MovementInterrupted for this cancel and record its latency."""
+        latency = time.perf_counter() - self.cancelled_at
+        preemption_latency.record(latency)
+        metrics.PREEMPTION_LATENCY.observe(latency)
+        return MovementInterrupted(latency)
+
+
+class LatencyStats:
+    """Rolling window of latency samples with a percentile summary."""
+
+    def __init__(self, size=1000):
+        self.samples = deque(maxlen=size)
+        self.worst = 0.0  # worst latency ever seen, beyond the window too
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+        self.worst = max(self.worst, seconds)
+
+    def summary(self):
+        """Count, mean, p50, p99 and worst-case latency in milliseconds."""
+        if not self.samples:
+            return {"count": 0}
+        ms = np.asarray(self.samples) * 1000
+        return {
+            "count": len(ms),
+            "mean_ms": float(ms.mean()),
+            "p50_ms": float(np.percentile(ms, 50)),
+            "p99_ms": float(np.percentile(ms, 99)),
+            "worst_ms": self.worst * 1000,
+        }
+
+
+# Time from a cancel request to the replay loop giving up the pointer
+preemption_latency = LatencyStats()
+
+
+def _deadlines(path, start):
+    """Frame-aligned absolute deadlines and int coordinates of a path, as lists."""
+    aligned = align_to_frames(path, start)
+    return ((aligned[:, 0] + start).tolist(), aligned[:, 1].astype(np.int64).tolist(),
+            aligned[:, 2].astype(np.int64).tolist())
+
+
+def replay(path, token=None, backend=None, label=None):
+    """
+    Inject the path one point per frame (see align_to_frames()), each at
+    its absolute deadline, waiting with the default pacing.Pacer.
+    If we fall behind, overdue points are skipped and the latest due point is
+    injected instead, so a late wakeup never stretches the whole movement.
+    With a token, waits wake on cancel() and the token is checked before each
+    point, raising MovementInterrupted instead of injecting.
+    Each point goes to the backend and is flushed as its own frame.
+    Counts go to the emission stats under `label` (e.g. the movement name).
+    Returns the elapsed time in seconds.
+    """
+    backend = backend or get_backend()
+    pacer = pacing.get_pacer()
+    clock = pacer.clock
+    start = clock()
+    if not len(path):
+        return 0.0
+
+    deadlines, xs, ys = _deadlines(path, start)
+    count = len(deadlines)
+    if token is not None and token.cancelled:
+        raise token.interrupted()
+
+    i = 0
+    sent = []  # deadline of every injected point
+    try:
+        while i < count:
+            now = clock()
+            # Jump to the most recent point whose deadline has passed
+            while i + 1 < count and deadlines[i + 1] <= now:
+                i += 1
+            deadline = event_cap.slot(deadlines[i], clock)
+            if deadline > now and pacer.sleep_until(deadline, token):
+                raise token.interrupted()
+            if token is not None and token.cancelled:
+                raise token.interrupted()
+            inject(xs[i], ys[i], backend)
+            sent.append(deadline)
+            i += 1
+    finally:
+        metrics.INJECTED_EVENTS.inc(len(sent))
+        emission.record(label, len(path), sent)
+
+    return clock() - start
+
+
+async def replay_async(path, token=None, backend=None, label=None):
+    """
+    Coroutine version of replay() that awaits each deadline on the running
+    event loop's clock, so other coroutines run between points. Waits go
+    through the default pacing.Pacer; only its final spin holds the loop.
+    Returns the elapsed time in seconds.
+    """
+    import asyncio  # Only async callers pay for loading it
+    backend = backend or get_backend()
+    loop = asyncio.get_running_loop()
+    clock = loop.time
+    start = clock()
+    if not len(path):
+        return 0.0
+
+    deadlines, xs, ys = _deadlines(path, start)
+    count = len(deadlines)
+    if token is not None and token.cancelled:
+        raise token.interrupted()
+
+    # Future resolved from any thread by token.cancel(), to cut waits short
+    woken = loop.create_future()
+
+    def wake():
+        loop.call_soon_threadsafe(lambda: woken.done() or woken.set_result(None))
+
+    if token is not None:
+        token.add_callback(wake)
+    # Virtual clocks (scheduler.VirtualClockEventLoop) can skip the wait
+    # outright when nothing else is due first
+    jump_to = getattr(loop, "jump_to", None)
+    pacer = pacing.get_pacer()
+    i = 0
+    sent = []
+    try:
+        while i < count:
+            now = clock()
+            while i + 1 < count and deadlines[i + 1] <= now:
+                i += 1
+            deadline = event_cap.slot(deadlines[i], clock)
+            if deadline > now and (jump_to is None or not jump_to(deadline)):
+                await pacer.sleep_until_async(deadline, token, woken)
+            if token is not None and token.cancelled:
+                raise token.interrupted()
+            inject(xs[i], ys[i], backend)
+            sent.append(deadline)
+            i += 1
+    finally:
+        metrics.INJECTED_EVENTS.inc(len(sent))
+        emission.record(label, len(path), sent)
+        if token is not None:
+            token.remove_callback(wake)
+
+    return clock() - start
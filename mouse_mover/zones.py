@@ -0,0 +1,166 @@
+"""
+Exclusion zones: screen rectangles the pointer must stay out of.
+
+Taskbars, video-call controls or hot corners are configured as inclusive
+pixel rectangles. ExclusionZones files them into a uniform grid of square
+cells, each listing the few zones that overlap it, so checking a point only
+looks at its own cell whatever the number of zones. blocked() checks a whole
+path's coordinate arrays in one vectorized call; cells a zone covers
+entirely answer without looking at any rectangle. reroute() moves the
+points that fall in a zone just past the zone's nearest edge, so a path
+slides around it instead of crossing it.
+"""
+from ._lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+class ExclusionZones:
+    """
+    Grid index of exclusion rectangles (x0, y0, x1, y1), inclusive.
+    cell: grid cell size in pixels
+    """
+
+    def __init__(self, rects, cell=16):
+        rects = [tuple(int(v) for v in rect) for rect in rects]
+        for x0, y0, x1, y1 in rects:
+            if x1 < x0 or y1 < y0:
+                raise ValueError(f"exclusion zone {(x0, y0, x1, y1)} has no area")
+        self.rects = rects
+        self.cell = cell
+        if not rects:
+            return
+
+        zones = np.asarray(rects, dtype=np.int64)
+        # The grid only spans the zones' bounding box; points outside it are free
+        self.origin = (int(zones[:, 0].min()), int(zones[:, 1].min()))
+        first = (zones[:, :2] - self.origin) // cell
+        last = (zones[:, 2:] - self.origin) // cell
+        self.columns, self.rows = (int(v) + 1 for v in last.max(axis=0))
+        # Cells each zone covers entirely, from the first to past the last
+        full_first = -((self.origin - zones[:, :2]) // cell)
+        full_end = (zones[:, 2:] + 1 - self.origin) // cell
+
+        # A zone covering a whole cell, per cell (-1 for none), and the zones
+        # partly over each cell, added along every zone's border only
+        cover = np.full((self.rows, self.columns), -1, dtype=np.int64)
+        cells = {}
+        for i in range(len(rects)):
+            (c0, r0), (c1, r1) = first[i].tolist(), last[i].tolist()
+            (fc0, fr0), (fc1, fr1) = full_first[i].tolist(), full_end[i].tolist()
+            cover[fr0:fr1, fc0:fc1] = i
+            for row in range(r0, r1 + 1):
+                if fr0 <= row < fr1 and fc0 < fc1:
+                    columns = list(range(c0, fc0)) + list(range(fc1, c1 + 1))
+                else:
+                    columns = range(c0, c1 + 1)
+                for column in columns:
+                    cells.setdefault(row * self.columns + column, []).append(i)
+        self._cover = cover.ravel()
+        for cell_id in list(cells):
+            if self._cover[cell_id] >= 0:
+                del cells[cell_id]
+        self._partial = np.zeros(len(self._cover), dtype=bool)
+        self._partial[list(cells)] = True
+
+        # Rectangles to test per cell for scalar lookups, and the same lists
+        # padded with -1 into one table for batched ones (the padding indexes
+        # a never-matching last row of the coordinate columns)
+        self._cells = [(rects[i],) if i >= 0 else () for i in self._cover.tolist()]
+        depth = max((len(zone_ids) for zone_ids in cells.values()), default=1)
+        self._table = np.full((len(self._cover), depth), -1, dtype=np.int64)
+        for cell_id, zone_ids in cells.items():
+            self._cells[cell_id] = tuple(rects[i] for i in zone_ids)
+            self._table[cell_id, :len(zone_ids)] = zone_ids
+        self._zones = np.vstack((zones, (1, 1, 0, 0)))
+        self._x0, self._y0, self._x1, self._y1 = (np.ascontiguousarray(column) for column in self._zones.T)
+
+    def __len__(self):
+        return len(self.rects)
+
+    def zone_at(self, x, y):
+        """The zone containing (x, y), or None."""
+        if not self.rects:
+            return None
+        column = int(x - self.origin[0]) // self.cell
+        row = int(y - self.origin[1]) // self.cell
+        if not (0 <= column < self.columns and 0 <= row < self.rows):
+            return None
+        for zone in self._cells[row * self.columns + column]:
+            if zone[0] <= x <= zone[2] and zone[1] <= y <= zone[3]:
+                return zone
+        return None
+
+    def contains(self, x, y):
+        return self.zone_at(x, y) is not None
+
+    def zones_at(self, xs, ys):
+        """Index of a zone containing each point (-1 for none), for coordinate arrays."""
+        found = np.full(len(xs), -1, dtype=np.int64)
+        if not self.rects or not len(xs):
+            return found
+        columns = (np.asarray(xs, dtype=np.int64) - self.origin[0]) // self.cell
+        rows = (np.asarray(ys, dtype=np.int64) - self.origin[1]) // self.cell
+        on_grid = (columns >= 0) & (columns < self.columns) & (rows >= 0) & (rows < self.rows)
+        cell_ids = np.where(on_grid, rows * self.columns + columns, 0)
+        found[on_grid] = self._cover[cell_ids[on_grid]]
+
+        # Only points in partly covered cells are tested against rectangles,
+        # every candidate zone of their cell at once: shape (P, depth)
+        partial = np.flatnonzero(on_grid & self._partial[cell_ids])
+        if not len(partial):
+            return found
+        candidates = self._table[cell_ids[partial]]
+        px = np.asarray(xs)[partial, None]
+        py = np.asarray(ys)[partial, None]
+        inside = ((self._x0[candidates] <= px) & (px <= self._x1[candidates])
+                  & (self._y0[candidates] <= py) & (py <= self._y1[candidates]))
+        hit = inside.any(axis=1)
+        found[partial[hit]] = candidates[hit, inside[hit].argmax(axis=1)]
+        return found
+
+    def blocked(self, xs, ys):
+        """Boolean mask of the points inside any zone, for coordinate arrays."""
+        return self.zones_at(xs, ys) >= 0
+
+    def reroute(self, path, allowed=None, passes=4):
+        """
+        Move the points of a (t, x, y) path that fall in a zone one pixel past
+        the zone's nearest edge, in place. allowed(xs, ys) -> bool mask rules
+        out exits, e.g. off the monitors' safe areas; when a zone has no
+        allowed exit the nearest one is taken. Zones that touch or overlap
+        can take a few passes; returns how many points are still blocked.
+        """
+        if not self.rects or not len(path):
+            return 0
+        xs, ys = path[:, 1], path[:, 2]
+        moved = np.flatnonzero(self.zones_at(xs, ys) >= 0)
+        for _ in range(passes):
+            # Only points moved by the last pass can still be in a zone
+            zone_ids = self.zones_at(xs[moved], ys[moved])
+            moved = moved[zone_ids >= 0]
+            if not len(moved):
+                return 0
+            zone_ids = zone_ids[zone_ids >= 0]
+            px, py = xs[moved], ys[moved]
+            # Exits to the left, right, top and bottom: shape (4, B)
+            exit_x = np.stack((self._x0[zone_ids] - 1, self._x1[zone_ids] + 1, px, px)).astype(path.dtype)
+            exit_y = np.stack((py, py, self._y0[zone_ids] - 1, self._y1[zone_ids] + 1)).astype(path.dtype)
+            distance = np.abs(exit_x - px) + np.abs(exit_y - py)
+            ok = ~self.blocked(exit_x.ravel(), exit_y.ravel()).reshape(exit_x.shape)
+            if allowed is not None:
+                ok &= np.asarray(allowed(exit_x.ravel(), exit_y.ravel())).reshape(exit_x.shape)
+            # Prefer a free, allowed exit; otherwise move on and retry next pass
+            best = np.where(ok, distance, distance + 1e9).argmin(axis=0)
+            columns = np.arange(len(moved))
+            xs[moved] = exit_x[best, columns]
+            ys[moved] = exit_y[best, columns]
+        return int(self.blocked(xs[moved], ys[moved]).sum())
+
+    def free_point(self, sample, attempts=32):
+        """A point from sample() outside every zone, trying `attempts` times (else the last one)."""
+        for _ in range(attempts):
+            x, y = sample()
+            if not self.contains(x, y):
+                break
+        return x, y